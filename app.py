@@ -14,13 +14,12 @@ from dotenv import load_dotenv
 from core.assistant import Assistant
 from core.continuous_loop import ContinuousExecutionLoop
 from core.enhanced_planning import EnhancedPlanner
+from core.logging_config import configure_once
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging. The application entry point owns the logging
+# configuration; library modules only create their loggers.
+configure_once()
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -9,11 +9,6 @@ import logging
 from typing import Dict, Any
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 def get_config() -> Dict[str, Any]:
@@ -41,6 +36,7 @@ def get_config() -> Dict[str, Any]:
     # Get continuous execution configuration
     max_iterations = int(os.getenv("MAX_ITERATIONS", 100))
     iteration_delay = float(os.getenv("ITERATION_DELAY", 1.0))
+    history_db_path = os.getenv("HISTORY_DB_PATH", "execution_history.db")
     
     # Create configuration dictionary
     config = {
@@ -54,7 +50,8 @@ def get_config() -> Dict[str, Any]:
         },
         "continuous_execution": {
             "max_iterations": max_iterations,
-            "iteration_delay": iteration_delay
+            "iteration_delay": iteration_delay,
+            "history_db_path": history_db_path
         }
     }
     
@@ -11,23 +11,28 @@ This module handles:
 
 import os
 import json
+import asyncio
 import time
 import re
 import requests
 import logging
-from typing import Dict, List, Any, Optional, Union
+import threading
+from typing import Dict, List, Any, Optional, Union, Callable, Iterator, Tuple
 
 from tools import registry
+from .llm_manager import OpenAIProvider
 from .llm_tool_selector import LLMToolSelector
 from .simulated_flow import SimulatedFlowHandler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeout of streamed completions, so a stalled stream fails
+# and is retried instead of blocking the caller forever
+STREAM_TIMEOUT = (10, 60)
+
+# Retries of a streamed completion that fails before its first chunk
+STREAM_MAX_RETRIES = 3
+
 class Assistant:
     """
     Core assistant class that handles interactions with the OpenAI API
@@ -73,6 +78,18 @@ class Assistant:
         
         self.conversation_history = []
         self.tools = {}
+        
+        # Guard the history and tool executions when the assistant is shared
+        # between threads (tools such as code_executor redirect the
+        # process-wide sys.stdout, so only one may run at a time)
+        self._history_lock = threading.Lock()
+        self._tool_lock = threading.RLock()
+        
+        # Rendered system prompt, reused while the set of tools is unchanged
+        self._system_prompt_cache = None
+        
+        # Provider used for asynchronous API calls, created on first use
+        self._async_provider = None
 
         # Initialize tool registry
         self.tool_registry = tool_registry or registry
@@ -106,11 +123,28 @@ class Assistant:
             role: Role of the message sender (user, assistant, system)
             content: Content of the message
         """
-        self.conversation_history.append({"role": role, "content": content})
+        with self._history_lock:
+            self.conversation_history.append({"role": role, "content": content})
+    
+    def add_exchange_to_history(self, user_input: str, assistant_response: str):
+        """
+        Add a user message and the assistant's response to the conversation history.
+        
+        Both messages are appended together, so exchanges of concurrent
+        requests are not interleaved.
+        
+        Args:
+            user_input: User's input message
+            assistant_response: Assistant's response to the message
+        """
+        with self._history_lock:
+            self.conversation_history.append({"role": "user", "content": user_input})
+            self.conversation_history.append({"role": "assistant", "content": assistant_response})
     
     def clear_history(self):
         """Reset the conversation history."""
-        self.conversation_history = []
+        with self._history_lock:
+            self.conversation_history = []
     
     def create_messages(self, user_input: str, include_history: bool = True) -> List[Dict[str, str]]:
         """
@@ -123,18 +157,34 @@ class Assistant:
         Returns:
             List of message dictionaries for the API request
         """
-        # Update system prompt with available tools
-        tools_info = self._get_tools_info()
-        updated_system_prompt = self.system_prompt.strip() + "\n\nAvailable tools:\n" + tools_info
-        
-        messages = [{"role": "system", "content": updated_system_prompt}]
+        messages = [{"role": "system", "content": self._get_system_prompt()}]
         
-        if include_history and self.conversation_history:
-            messages.extend(self.conversation_history)
+        if include_history:
+            with self._history_lock:
+                messages.extend(self.conversation_history)
         
         messages.append({"role": "user", "content": user_input})
         return messages
     
+    def _get_system_prompt(self) -> str:
+        """
+        Get the system prompt including the available tools.
+        
+        The prompt is rendered once and reused until the registered tools
+        change, so every request starts with a byte-identical prefix that
+        provider-side prompt caching can reuse.
+        
+        Returns:
+            System prompt for the API request
+        """
+        cache_key = (self.system_prompt, tuple(self.tool_registry.tools), tuple(self.tools))
+        if self._system_prompt_cache is None or self._system_prompt_cache[0] != cache_key:
+            tools_info = self._get_tools_info()
+            updated_system_prompt = self.system_prompt.strip() + "\n\nAvailable tools:\n" + tools_info
+            self._system_prompt_cache = (cache_key, updated_system_prompt)
+        
+        return self._system_prompt_cache[1]
+    
     def _get_tools_info(self) -> str:
         """
         Get information about available tools for the system prompt.
@@ -206,6 +256,97 @@ class Assistant:
             # If all retries fail, raise the exception
             raise Exception(f"Failed to call OpenAI API after {max_retries} retries: {str(e)}")
     
+    async def acall_openai_api(self, messages: List[Dict[str, str]],
+                               temperature: float = 0.7,
+                               max_tokens: int = 1000) -> Dict[str, Any]:
+        """
+        Asynchronously make a call to the OpenAI API.
+        
+        The request is sent on the provider's shared httpx.AsyncClient, so many
+        calls can be awaited concurrently without a thread each; without httpx
+        the provider falls back to a worker thread. Failures are retried by
+        the provider.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            
+        Returns:
+            API response as a dictionary
+        """
+        if self._async_provider is None:
+            self._async_provider = OpenAIProvider(api_key=self.api_key, model=self.model, api_url=self.api_url)
+        return await self._async_provider.agenerate_completion(messages, temperature=temperature, max_tokens=max_tokens)
+    
+    def stream_openai_api(self, messages: List[Dict[str, str]],
+                          temperature: float = 0.7,
+                          max_tokens: int = 1000) -> Iterator[str]:
+        """
+        Make a streaming call to the OpenAI API.
+        
+        The HTTP response is closed as soon as the generator is closed, so
+        callers can stop consuming early to cancel the rest of the completion.
+        Failures before the first chunk are retried with exponential backoff,
+        like call_openai_api; once chunks have been yielded they are raised.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            
+        Yields:
+            Content chunks of the assistant's response as they arrive
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        
+        for retry_count in range(STREAM_MAX_RETRIES + 1):
+            if retry_count:
+                time.sleep(2 ** (retry_count - 1))  # Exponential backoff
+            
+            started = False
+            try:
+                response = requests.post(
+                    self.api_url,
+                    headers=self.headers,
+                    json=payload,
+                    stream=True,
+                    timeout=STREAM_TIMEOUT
+                )
+                with response:
+                    response.raise_for_status()
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line or not line.startswith("data: "):
+                            continue
+                        
+                        data = line[len("data: "):]
+                        if data == "[DONE]":
+                            break
+                        
+                        try:
+                            delta = json.loads(data)["choices"][0].get("delta", {})
+                        except (ValueError, KeyError, IndexError):
+                            continue
+                        
+                        content = delta.get("content")
+                        if content:
+                            started = True
+                            yield content
+                return
+            except requests.exceptions.RequestException as e:
+                # Chunks already yielded cannot be taken back, so only retry
+                # failures before the first one
+                if started:
+                    raise Exception(f"Failed to stream from OpenAI API: {str(e)}") from e
+                if retry_count == STREAM_MAX_RETRIES:
+                    raise Exception(f"Failed to call OpenAI API after {STREAM_MAX_RETRIES} retries: {str(e)}") from e
+    
     def extract_response_content(self, api_response: Dict[str, Any]) -> str:
         """
         Extract the assistant's response content from the API response.
@@ -284,132 +425,332 @@ class Assistant:
         Returns:
             Result of the tool execution
         """
-        # First, try to use the tool registry
-        tool = self.tool_registry.get_tool(tool_name)
-        if tool:
-            try:
-                logger.info(f"Executing tool from registry: {tool_name}")
-                return tool.execute(**args)
-            except Exception as e:
-                error_msg = f"Tool execution failed: {str(e)}"
-                logger.error(error_msg)
-                return {"error": error_msg, "status": "error"}
+        # Tools are not reentrant (see __init__), so run one at a time
+        with self._tool_lock:
+            # First, try to use the tool registry
+            tool = self.tool_registry.get_tool(tool_name)
+            if tool:
+                try:
+                    logger.info(f"Executing tool from registry: {tool_name}")
+                    return tool.execute(**args)
+                except Exception as e:
+                    error_msg = f"Tool execution failed: {str(e)}"
+                    logger.error(error_msg)
+                    return {"error": error_msg, "status": "error"}
+            
+            # Fall back to legacy tools
+            if tool_name in self.tools:
+                try:
+                    logger.info(f"Executing legacy tool: {tool_name}")
+                    return self.tools[tool_name](**args)
+                except Exception as e:
+                    error_msg = f"Legacy tool execution failed: {str(e)}"
+                    logger.error(error_msg)
+                    return {"error": error_msg, "status": "error"}
+            
+            # Tool not found
+            error_msg = f"Tool '{tool_name}' is not registered"
+            logger.error(error_msg)
+            return {"error": error_msg, "status": "error"}
+    
+    def _tool_schemas(self) -> List[Dict[str, Any]]:
+        """
+        Get the schemas of the registered tools for LLM tool selection.
         
-        # Fall back to legacy tools
-        if tool_name in self.tools:
-            try:
-                logger.info(f"Executing legacy tool: {tool_name}")
-                return self.tools[tool_name](**args)
-            except Exception as e:
-                error_msg = f"Legacy tool execution failed: {str(e)}"
-                logger.error(error_msg)
-                return {"error": error_msg, "status": "error"}
-        
-        # Tool not found
-        error_msg = f"Tool '{tool_name}' is not registered"
-        logger.error(error_msg)
-        return {"error": error_msg, "status": "error"}
+        Returns:
+            List of tool schemas
+        """
+        tool_schemas = []
+        for name, schema in self.tool_registry.list_tools().items():
+            tool_info = {
+                "name": name,
+                "description": schema.get("description", ""),
+                "parameters": schema.get("parameters", {}),
+                "request_type": schema.get("request_type", "command")
+            }
+            tool_schemas.append(tool_info)
+        return tool_schemas
     
-    def ask(self, user_input: str, include_history: bool = True) -> Dict[str, Any]:
+    def _run_selected_tool(self, user_input: str, include_history: bool, tool_name: str,
+                           tool_args: Dict[str, Any]) -> Tuple[List[Dict[str, str]], Any, str]:
         """
-        Process a user request and generate a response.
+        Execute a tool chosen by LLM tool selection.
         
         Args:
             user_input: User's input message
             include_history: Whether to include conversation history
+            tool_name: Name of the selected tool
+            tool_args: Arguments of the selected tool
             
         Returns:
-            Processed response with any actions or plans
+            Tuple of (messages for the response request, tool result, text of
+            the tool call and result to prefix the response with)
+        """
+        logger.info(f"🧠 LLM selected tool: {tool_name} with args {tool_args}")
+        
+        # Execute the tool
+        tool_result = self.execute_tool(tool_name, tool_args)
+        
+        # Format the tool call for inclusion in the response
+        tool_call_text = self.llm_tool_selector.format_tool_call(tool_name, tool_args)
+        
+        # Create a response that includes the tool call and result
+        if tool_result.get("status") == "success":
+            result_header = "\n\n**Tool Execution Successful**\n\n"
+        else:
+            result_header = "\n\n**Tool Execution Failed**\n\n"
+        
+        formatted_result = json.dumps(tool_result, indent=2)
+        tool_result_text = f"{result_header}```json\n{formatted_result}\n```\n\n"
+        
+        # Create a modified user input that includes the tool call
+        modified_user_input = f"{user_input}\n\n{tool_call_text}"
+        
+        # Create messages for the API request with the modified user input
+        messages = self.create_messages(modified_user_input, include_history)
+        
+        return messages, tool_result, f"{tool_call_text}{tool_result_text}"
+    
+    def _selected_tool_response(self, user_input: str, response_content: str, tool_name: str,
+                                tool_args: Dict[str, Any], tool_result: Any, tool_text: str,
+                                record_history: bool = True) -> Dict[str, Any]:
+        """
+        Build the processed response of a request handled by LLM tool selection.
+        
+        Args:
+            user_input: User's input message
+            response_content: Response incorporating the tool result
+            tool_name: Name of the selected tool
+            tool_args: Arguments of the selected tool
+            tool_result: Result of the tool execution
+            tool_text: Text of the tool call and result, from _run_selected_tool
+            record_history: Whether to add the exchange to the conversation history
+            
+        Returns:
+            Processed response
+        """
+        # Process the response
+        processed_response = self.process_response(response_content)
+        
+        # Add the tool result to the processed response
+        processed_response["tool_result"] = tool_result
+        processed_response["detected_tool"] = tool_name
+        processed_response["detected_args"] = tool_args
+        processed_response["llm_selected"] = True
+        
+        # Update the response to include the tool call and result
+        if "response" in processed_response:
+            processed_response["response"] = f"{tool_text}{processed_response['response']}"
+        else:
+            processed_response["response"] = tool_text
+        
+        # Add the user input and assistant response to conversation history
+        if record_history:
+            self.add_exchange_to_history(user_input, processed_response["response"])
+        
+        return processed_response
+    
+    def _simulated_response(self, user_input: str, record_history: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Handle the user input with the simulated flow.
+        
+        Args:
+            user_input: User's input message
+            record_history: Whether to add the exchange to the conversation history
+            
+        Returns:
+            Processed response if a simulated task handled the input, None otherwise
+        """
+        simulated_task = self.simulated_flow.detect_simulated_task(user_input)
+        if not simulated_task:
+            return None
+        
+        logger.info(f"Using simulated flow for task type: {simulated_task.get('type', 'unknown')}")
+        
+        # Generate a simulated response
+        simulated_response = self.simulated_flow.generate_simulated_response(simulated_task)
+        
+        # Create a processed response
+        processed_response = {
+            "type": "simulated",
+            "simulated_type": simulated_task.get("type", "unknown"),
+            "response": simulated_response,
+            "simulated_task": simulated_task
+        }
+        
+        # Add the user input and assistant response to conversation history
+        if record_history:
+            self.add_exchange_to_history(user_input, simulated_response)
+        
+        return processed_response
+    
+    def _auto_detect_response(self, user_input: str, include_history: bool = True,
+                              record_history: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Handle the user input with automatic tool selection or the simulated flow.
+        
+        Args:
+            user_input: User's input message
+            include_history: Whether to include conversation history
+            record_history: Whether to add the exchange to the conversation history
+            
+        Returns:
+            Processed response if a tool or simulated task handled the input, None otherwise
         """
         # Check if automatic tool detection is enabled
         if self.auto_detect_tools:
             # Use LLM-based tool selection if enabled
             if self.use_llm_tool_selection:
-                # Get available tools from the registry
-                tool_schemas = []
-                for name, schema in self.tool_registry.list_tools().items():
-                    tool_info = {
-                        "name": name,
-                        "description": schema.get("description", ""),
-                        "parameters": schema.get("parameters", {})
-                    }
-                    tool_schemas.append(tool_info)
-                
                 # Use LLM to select the appropriate tool
-                llm_selection = self.llm_tool_selector.select_tool(user_input, tool_schemas)
+                llm_selection = self.llm_tool_selector.select_tool(user_input, self._tool_schemas())
                 
                 if llm_selection:
                     tool_name, tool_args = llm_selection
-                    logger.info(f"🧠 LLM selected tool: {tool_name} with args {tool_args}")
-                    
-                    # Execute the tool
-                    tool_result = self.execute_tool(tool_name, tool_args)
-                    
-                    # Format the tool call for inclusion in the response
-                    tool_call_text = self.llm_tool_selector.format_tool_call(tool_name, tool_args)
-                    
-                    # Create a response that includes the tool call and result
-                    if tool_result.get("status") == "success":
-                        result_header = "\n\n**Tool Execution Successful**\n\n"
-                    else:
-                        result_header = "\n\n**Tool Execution Failed**\n\n"
-                    
-                    formatted_result = json.dumps(tool_result, indent=2)
-                    tool_result_text = f"{result_header}```json\n{formatted_result}\n```\n\n"
-                    
-                    # Create a modified user input that includes the tool call
-                    modified_user_input = f"{user_input}\n\n{tool_call_text}"
-                    
-                    # Create messages for the API request with the modified user input
-                    messages = self.create_messages(modified_user_input, include_history)
+                    messages, tool_result, tool_text = self._run_selected_tool(user_input, include_history, tool_name, tool_args)
                     
                     # Call the OpenAI API to get a response that incorporates the tool result
                     api_response = self.call_openai_api(messages)
                     response_content = self.extract_response_content(api_response)
                     
-                    # Process the response
-                    processed_response = self.process_response(response_content)
-                    
-                    # Add the tool result to the processed response
-                    processed_response["tool_result"] = tool_result
-                    processed_response["detected_tool"] = tool_name
-                    processed_response["detected_args"] = tool_args
-                    processed_response["llm_selected"] = True
-                    
-                    # Update the response to include the tool call and result
-                    if "response" in processed_response:
-                        processed_response["response"] = f"{tool_call_text}{tool_result_text}{processed_response['response']}"
-                    else:
-                        processed_response["response"] = f"{tool_call_text}{tool_result_text}"
-                    
-                    # Add the user input and assistant response to conversation history
-                    self.add_message_to_history("user", user_input)
-                    self.add_message_to_history("assistant", processed_response["response"])
-                    
-                    return processed_response
+                    return self._selected_tool_response(user_input, response_content, tool_name, tool_args, tool_result, tool_text,
+                                                        record_history)
             
             # If LLM tool selection is disabled or didn't select a tool, check for simulated tasks
             if self.use_simulated_fallback:
-                simulated_task = self.simulated_flow.detect_simulated_task(user_input)
-                if simulated_task:
-                    logger.info(f"Using simulated flow for task type: {simulated_task.get('type', 'unknown')}")
-                    
-                    # Generate a simulated response
-                    simulated_response = self.simulated_flow.generate_simulated_response(simulated_task)
-                    
-                    # Create a processed response
-                    processed_response = {
-                        "type": "simulated",
-                        "simulated_type": simulated_task.get("type", "unknown"),
-                        "response": simulated_response,
-                        "simulated_task": simulated_task
-                    }
+                return self._simulated_response(user_input, record_history)
+        
+        return None
+    
+    async def _aauto_detect_response(self, user_input: str, include_history: bool = True,
+                                     record_history: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Asynchronous variant of _auto_detect_response.
+        
+        The tool selection and response requests are awaited on the event
+        loop; only the blocking tool execution runs in a worker thread.
+        
+        Args:
+            user_input: User's input message
+            include_history: Whether to include conversation history
+            record_history: Whether to add the exchange to the conversation history
+            
+        Returns:
+            Processed response if a tool or simulated task handled the input, None otherwise
+        """
+        if self.auto_detect_tools:
+            if self.use_llm_tool_selection:
+                llm_selection = await self.llm_tool_selector.aselect_tool(user_input, self._tool_schemas())
+                
+                if llm_selection:
+                    tool_name, tool_args = llm_selection
+                    messages, tool_result, tool_text = await asyncio.to_thread(
+                        self._run_selected_tool, user_input, include_history, tool_name, tool_args
+                    )
                     
-                    # Add the user input and assistant response to conversation history
-                    self.add_message_to_history("user", user_input)
-                    self.add_message_to_history("assistant", simulated_response)
+                    api_response = await self.acall_openai_api(messages)
+                    response_content = self.extract_response_content(api_response)
                     
-                    return processed_response
+                    return self._selected_tool_response(user_input, response_content, tool_name, tool_args, tool_result, tool_text,
+                                                        record_history)
+            
+            if self.use_simulated_fallback:
+                return self._simulated_response(user_input, record_history)
+        
+        return None
+    
+    def _run_tool_call(self, processed_response: Dict[str, Any],
+                       messages: List[Dict[str, str]]) -> Optional[List[Dict[str, str]]]:
+        """
+        Execute the tool call of a processed response and add its result.
+        
+        The tool result is stored in the processed response and inserted into
+        the response text after the tool call.
+        
+        Args:
+            processed_response: Processed response of type "tool_call"
+            messages: Messages of the request that produced the response
+            
+        Returns:
+            Messages for a follow-up request if the tool needs one, None otherwise
+        """
+        tool_name = processed_response["tool"]
+        tool_args = processed_response["args"]
+        
+        # Execute the tool
+        tool_result = self.execute_tool(tool_name, tool_args)
+        processed_response["tool_result"] = tool_result
+        
+        # Append the tool result to the response
+        original_response = processed_response["original_response"]
+        tool_call_text = f"<<TOOL:{tool_name} {json.dumps(tool_args)}>>"
+        tool_result_text = f"\n\n**Tool Result:**\n\n```json\n{json.dumps(tool_result, indent=2)}\n```\n\n"
+        
+        # Replace the tool call with the tool call + result
+        updated_response = original_response.replace(
+            tool_call_text, 
+            f"{tool_call_text}{tool_result_text}"
+        )
+        
+        # Update the processed response
+        processed_response["response"] = updated_response
+        
+        # Add follow-up context if needed for certain tools
+        if tool_name == "browser_use" and tool_result.get("status") == "success":
+            # Continue the conversation with the fetched content
+            follow_up_prompt = f"I've fetched the content from {tool_args.get('url')}. Please continue with your analysis or summary based on this information."
+        elif tool_name == "code_executor" and tool_result.get("status") == "success":
+            # Explain the code execution results
+            follow_up_prompt = "I've executed the code. Please explain the results and what they mean."
+        else:
+            return None
+        
+        follow_up_messages = messages.copy()
+        follow_up_messages.append({"role": "assistant", "content": updated_response})
+        follow_up_messages.append({"role": "user", "content": follow_up_prompt})
+        return follow_up_messages
+    
+    def _add_follow_up(self, processed_response: Dict[str, Any], follow_up_content: str) -> None:
+        """
+        Append the response to a tool follow-up request.
+        
+        Args:
+            processed_response: Processed response updated by _run_tool_call
+            follow_up_content: Content of the follow-up response
+        """
+        processed_response["response"] = processed_response["response"] + "\n\n" + follow_up_content
+        processed_response["follow_up"] = follow_up_content
+    
+    def _handle_tool_call(self, processed_response: Dict[str, Any], messages: List[Dict[str, str]]) -> None:
+        """
+        Execute the tool call of a processed response, including any follow-up request.
+        
+        Args:
+            processed_response: Processed response of type "tool_call"
+            messages: Messages of the request that produced the response
+        """
+        follow_up_messages = self._run_tool_call(processed_response, messages)
+        if follow_up_messages is not None:
+            # Get a follow-up response
+            follow_up_api_response = self.call_openai_api(follow_up_messages)
+            self._add_follow_up(processed_response, self.extract_response_content(follow_up_api_response))
+    
+    def ask(self, user_input: str, include_history: bool = True, record_history: bool = True) -> Dict[str, Any]:
+        """
+        Process a user request and generate a response.
+        
+        Args:
+            user_input: User's input message
+            include_history: Whether to include conversation history
+            record_history: Whether to add the exchange to the conversation history;
+                callers running several requests at once can record them in order
+            
+        Returns:
+            Processed response with any actions or plans
+        """
+        # Check if automatic tool detection or the simulated flow can handle the input
+        auto_response = self._auto_detect_response(user_input, include_history, record_history)
+        if auto_response is not None:
+            return auto_response
         
         # If no automatic tool detection or no tool was detected, proceed with normal flow
         # Create messages for the API request
@@ -426,68 +767,106 @@ class Assistant:
         
         # If the response contains a tool call, execute it
         if processed_response["type"] == "tool_call":
-            tool_name = processed_response["tool"]
-            tool_args = processed_response["args"]
-            
-            # Execute the tool
-            tool_result = self.execute_tool(tool_name, tool_args)
-            processed_response["tool_result"] = tool_result
-            
-            # Append the tool result to the response
-            original_response = processed_response["original_response"]
-            tool_call_text = f"<<TOOL:{tool_name} {json.dumps(tool_args)}>>"
-            tool_result_text = f"\n\n**Tool Result:**\n\n```json\n{json.dumps(tool_result, indent=2)}\n```\n\n"
-            
-            # Replace the tool call with the tool call + result
-            updated_response = original_response.replace(
-                tool_call_text, 
-                f"{tool_call_text}{tool_result_text}"
-            )
-            
-            # Update the processed response
-            processed_response["response"] = updated_response
-            
-            # Add follow-up context if needed for certain tools
-            if tool_name == "browser_use" and tool_result.get("status") == "success":
-                # Create a follow-up message to continue the conversation with the content
-                follow_up_messages = messages.copy()
-                follow_up_messages.append({"role": "assistant", "content": updated_response})
-                follow_up_messages.append({
-                    "role": "user", 
-                    "content": f"I've fetched the content from {tool_args.get('url')}. Please continue with your analysis or summary based on this information."
-                })
-                
-                # Get a follow-up response
-                follow_up_api_response = self.call_openai_api(follow_up_messages)
-                follow_up_content = self.extract_response_content(follow_up_api_response)
-                
-                # Append the follow-up to the response
-                processed_response["response"] = updated_response + "\n\n" + follow_up_content
-                processed_response["follow_up"] = follow_up_content
+            self._handle_tool_call(processed_response, messages)
+        
+        # Add the user input and assistant response to conversation history,
+        # using the updated response if available
+        if record_history:
+            assistant_response = processed_response.get("response", response_content)
+            self.add_exchange_to_history(user_input, assistant_response)
+        
+        return processed_response
+    
+    async def aask(self, user_input: str, include_history: bool = True,
+                   record_history: bool = True) -> Dict[str, Any]:
+        """
+        Asynchronous variant of ask.
+        
+        API requests are awaited on the event loop (see acall_openai_api), so
+        awaiting several calls keeps them in flight together without a thread
+        each. Tool executions are blocking and run in a worker thread.
+        
+        Args:
+            user_input: User's input message
+            include_history: Whether to include conversation history
+            record_history: Whether to add the exchange to the conversation history;
+                callers running several requests at once can record them in order
             
-            elif tool_name == "code_executor" and tool_result.get("status") == "success":
-                # Create a follow-up message to explain the code execution results
-                follow_up_messages = messages.copy()
-                follow_up_messages.append({"role": "assistant", "content": updated_response})
-                follow_up_messages.append({
-                    "role": "user", 
-                    "content": "I've executed the code. Please explain the results and what they mean."
-                })
-                
-                # Get a follow-up response
-                follow_up_api_response = self.call_openai_api(follow_up_messages)
-                follow_up_content = self.extract_response_content(follow_up_api_response)
-                
-                # Append the follow-up to the response
-                processed_response["response"] = updated_response + "\n\n" + follow_up_content
-                processed_response["follow_up"] = follow_up_content
+        Returns:
+            Processed response with any actions or plans
+        """
+        auto_response = await self._aauto_detect_response(user_input, include_history, record_history)
+        if auto_response is not None:
+            return auto_response
+        
+        messages = self.create_messages(user_input, include_history)
+        api_response = await self.acall_openai_api(messages)
+        response_content = self.extract_response_content(api_response)
+        processed_response = self.process_response(response_content)
+        
+        # If the response contains a tool call, execute it
+        if processed_response["type"] == "tool_call":
+            follow_up_messages = await asyncio.to_thread(self._run_tool_call, processed_response, messages)
+            if follow_up_messages is not None:
+                follow_up_api_response = await self.acall_openai_api(follow_up_messages)
+                self._add_follow_up(processed_response, self.extract_response_content(follow_up_api_response))
         
         # Add the user input and assistant response to conversation history
-        self.add_message_to_history("user", user_input)
+        if record_history:
+            self.add_exchange_to_history(user_input, processed_response.get("response", response_content))
         
-        # For the assistant's message, use the updated response if available
-        assistant_response = processed_response.get("response", response_content)
-        self.add_message_to_history("assistant", assistant_response)
+        return processed_response
+    
+    def ask_stream(self, user_input: str, include_history: bool = True,
+                   stop_when: Optional[Callable[[str], bool]] = None,
+                   record_history: bool = True) -> Dict[str, Any]:
+        """
+        Process a user request, streaming the response from the API.
+        
+        Automatic tool selection and the simulated flow are applied first, as in
+        ask(). Otherwise the response is streamed and ``stop_when`` is called with
+        the text received so far after every chunk; when it returns True the
+        stream is cancelled and the partial response is returned.
+        
+        Args:
+            user_input: User's input message
+            include_history: Whether to include conversation history
+            stop_when: Optional predicate used to stop the stream early
+            record_history: Whether to add the exchange to the conversation history
+            
+        Returns:
+            Processed response with any actions or plans
+        """
+        auto_response = self._auto_detect_response(user_input, include_history, record_history)
+        if auto_response is not None:
+            return auto_response
+        
+        messages = self.create_messages(user_input, include_history)
+        
+        # Accumulate the streamed chunks, stopping early if requested
+        response_content = ""
+        stopped_early = False
+        stream = self.stream_openai_api(messages)
+        try:
+            for chunk in stream:
+                response_content += chunk
+                if stop_when and stop_when(response_content):
+                    stopped_early = True
+                    break
+        finally:
+            stream.close()
+        
+        # Process the response
+        processed_response = self.process_response(response_content)
+        processed_response["stopped_early"] = stopped_early
+        
+        # If the response contains a tool call, execute it
+        if processed_response["type"] == "tool_call":
+            self._handle_tool_call(processed_response, messages)
+        
+        # Add the user input and assistant response to conversation history
+        if record_history:
+            self.add_exchange_to_history(user_input, processed_response.get("response", response_content))
         
         return processed_response
     
@@ -6,20 +6,125 @@ to continue working on tasks until completion, with self-monitoring and
 recovery capabilities.
 """
 
+import re
+import sys
+import json
 import time
 import logging
+import threading
 import traceback
-from typing import Dict, Any, List, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Pattern, Tuple, Type, Union
 
 from .assistant import Assistant
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from .execution_history import (
+    DEFAULT_DB_PATH,
+    ExecutionHistory,
+    HistoryEntry,
+    compact_content,
+    ENTRY_PLAN,
+    ENTRY_PLANNING,
+    ENTRY_TOOL_CALL,
+    ENTRY_TOOL_RESULT,
+    ENTRY_EXECUTION,
+    ENTRY_REVIEW,
+    ENTRY_RECOVERY,
+    ENTRY_ERROR,
 )
+
 logger = logging.getLogger(__name__)
 
+# Completion indicators, matched case-insensitively in a single pass
+TASK_COMPLETION_PATTERN = re.compile(r"task completed|all steps completed", re.IGNORECASE)
+REVIEW_COMPLETION_PATTERN = re.compile(r"task is complete|requirements fulfilled", re.IGNORECASE)
+
+# Prompt templates for each step of the loop, filled with str.format_map
+PLANNING_PROMPT_TEMPLATE = """
+        I am working on this task: {task}
+        
+        Based on my current progress and the execution history, I need to:
+        1. Assess the current state of the task
+        2. Identify the next steps to take
+        3. Create a detailed plan for the next phase of execution
+        
+        Current iteration: {iteration}
+        """
+
+EXECUTION_PROMPT_TEMPLATE = """
+        I am working on this task: {task}
+        
+        I need to execute the next step in my plan. Based on my execution history,
+        I should determine the most appropriate action to take now.
+        
+        Current iteration: {iteration}
+        """
+
+REVIEW_PROMPT_TEMPLATE = """
+        I have been working on this task: {task}
+        
+        I need to review my work to determine if the task is truly complete.
+        I should check:
+        1. Have all requirements been fulfilled?
+        2. Is there any part of the task that remains incomplete?
+        3. Are there any errors or issues that need to be addressed?
+        4. Is there any way to improve the result?
+        
+        Current iteration: {iteration}
+        """
+
+RECOVERY_PROMPT_TEMPLATE = """
+        I encountered an error while working on this task: {task}
+        
+        I need to:
+        1. Analyze what went wrong
+        2. Determine how to recover
+        3. Adjust my approach to avoid similar errors
+        
+        Current iteration: {iteration}
+        Error count: {error_count}
+        """
+
+# Rules for errors whose recovery is known in advance, checked in order against
+# the exception type or the recorded error message before asking the LLM
+RECOVERY_RETRY = "retry-with-backoff"
+RECOVERY_RESET_PROGRESS = "reset-progress-timer"
+RECOVERY_RULES: List[Tuple[Union[Type[BaseException], Pattern], str]] = [
+    (TimeoutError, RECOVERY_RETRY),
+    (ConnectionError, RECOVERY_RETRY),
+    (re.compile(r"timed? ?out", re.IGNORECASE), RECOVERY_RETRY),
+    (re.compile(r"stalled"), RECOVERY_RESET_PROGRESS),
+]
+
+# Number of errors after which known errors are also sent to the LLM for recovery
+RULE_RECOVERY_LIMIT = 3
+
+# Upper bound in seconds for the backoff before retrying a known error
+MAX_RECOVERY_BACKOFF = 30.0
+
+# Characters of already-scanned text to rescan when streaming, so indicators
+# split across chunk boundaries are still found
+COMPLETION_SCAN_OVERLAP = len("all steps completed")
+
+# Delimiters of a tool call in a response, see Assistant.process_response
+TOOL_CALL_START = "<<TOOL:"
+TOOL_CALL_END = "}>>"
+
+def _has_open_tool_call(text: str) -> bool:
+    """
+    Check whether a partial response ends inside a tool call.
+    
+    Args:
+        text: Response text received so far
+        
+    Returns:
+        True if the last tool call is not closed yet, or the text ends with
+        the beginning of a tool call
+    """
+    start = text.rfind(TOOL_CALL_START)
+    if start >= 0 and text.find(TOOL_CALL_END, start) < 0:
+        return True
+    return any(text.endswith(TOOL_CALL_START[:i]) for i in range(1, len(TOOL_CALL_START)))
+
 class ContinuousExecutionLoop:
     """
     Implements a continuous execution loop for the Syntient AI Assistant.
@@ -36,7 +141,8 @@ class ContinuousExecutionLoop:
         assistant: Assistant,
         max_iterations: int = 100,
         iteration_delay: float = 1.0,
-        status_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        history_db_path: str = DEFAULT_DB_PATH
     ):
         """
         Initialize the continuous execution loop.
@@ -46,6 +152,8 @@ class ContinuousExecutionLoop:
             max_iterations: Maximum number of iterations before forced termination
             iteration_delay: Delay between iterations in seconds
             status_callback: Optional callback function for status updates
+            history_db_path: SQLite database file for the execution history
+                (default: execution_history.db; ":memory:" keeps it in memory)
         """
         self.assistant = assistant
         self.max_iterations = max_iterations
@@ -57,9 +165,14 @@ class ContinuousExecutionLoop:
         self.task_status = "idle"
         self.iteration_count = 0
         self.last_progress_time = time.time()
-        self.execution_history = []
+        self.execution_history = ExecutionHistory(history_db_path)
         self.error_count = 0
         
+        self.last_error: Optional[Exception] = None
+        
+        # Set when new work is available so the loop skips the iteration delay
+        self._wake = threading.Event()
+        
     def start(self, task: str) -> Dict[str, Any]:
         """
         Start the continuous execution loop for a given task.
@@ -74,22 +187,19 @@ class ContinuousExecutionLoop:
         self.task_status = "planning"
         self.iteration_count = 0
         self.last_progress_time = time.time()
-        self.execution_history = []
+        self.execution_history.clear()
         self.error_count = 0
+        self.last_error = None
         
-        logger.info(f"Starting continuous execution loop for task: {task}")
+        logger.info("Starting continuous execution loop for task: %s", task)
         
         # Generate initial plan
         try:
             plan = self.assistant.plan_execution(task)
-            self.execution_history.append({
-                "type": "plan",
-                "content": plan,
-                "timestamp": time.time()
-            })
-            logger.info(f"Initial plan generated with {len(plan)} steps")
+            self._record(ENTRY_PLAN, plan)
+            logger.info("Initial plan generated with %d steps", len(plan))
         except Exception as e:
-            logger.error(f"Error generating initial plan: {str(e)}")
+            logger.error("Error generating initial plan: %s", e)
             self.error_count += 1
             plan = ["Analyze the task", "Execute the task step by step"]
         
@@ -101,15 +211,19 @@ class ContinuousExecutionLoop:
                 
                 # Check if task is complete
                 if self.task_status == "completed":
-                    logger.info(f"Task completed after {self.iteration_count} iterations")
+                    logger.info("Task completed after %d iterations", self.iteration_count)
                     break
                     
-                # Prevent CPU overload
-                time.sleep(self.iteration_delay)
+                # Wait before the next iteration unless new work is signalled
+                self._wake.wait(timeout=self.iteration_delay)
+                self._wake.clear()
                 
             except Exception as e:
                 self.handle_error(e)
                 
+        # Make sure every recorded entry is persisted
+        self.execution_history.flush()
+        
         # Final status update
         final_status = {
             "task": self.current_task,
@@ -132,7 +246,7 @@ class ContinuousExecutionLoop:
             Result of the current iteration
         """
         self.iteration_count += 1
-        logger.info(f"Executing iteration {self.iteration_count}")
+        logger.info("Executing iteration %d", self.iteration_count)
         
         # Update status
         if self.status_callback:
@@ -145,52 +259,66 @@ class ContinuousExecutionLoop:
         
         # Determine next action based on current status
         if self.task_status == "planning":
-            return self.execute_planning_step()
+            result = self.execute_planning_step()
         elif self.task_status == "executing":
-            return self.execute_task_step()
+            result = self.execute_task_step()
         elif self.task_status == "reviewing":
-            return self.execute_review_step()
+            result = self.execute_review_step()
         elif self.task_status == "error_recovery":
-            return self.execute_recovery_step()
+            result = self.execute_recovery_step()
         else:
-            logger.warning(f"Unknown task status: {self.task_status}")
+            logger.warning("Unknown task status: %s", self.task_status)
             self.task_status = "planning"
-            return {"status": "reset_to_planning"}
+            result = {"status": "reset_to_planning"}
+        
+        # Write the entries recorded during this iteration in one batch
+        self.execution_history.flush()
+        
+        return result
     
-    def execute_planning_step(self) -> Dict[str, Any]:
+    def _record(self, entry_type: str, content: Any) -> None:
         """
-        Execute a planning step in the continuous loop.
+        Record an entry in the execution history.
         
-        Returns:
-            Result of the planning step
-        """
-        # Create a planning prompt
-        planning_prompt = f"""
-        I am working on this task: {self.current_task}
+        All history writes go through this method so entries always have the
+        same shape, keeping the history text fed into prompts deterministic.
+        Large text content (e.g. error tracebacks) is stored compressed.
         
-        Based on my current progress and the execution history, I need to:
-        1. Assess the current state of the task
-        2. Identify the next steps to take
-        3. Create a detailed plan for the next phase of execution
+        Args:
+            entry_type: Type of the entry (one of the ENTRY_* constants)
+            content: Content of the entry
+        """
+        self.execution_history.append(HistoryEntry(sys.intern(entry_type), compact_content(content), time.time()))
+    
+    def _build_planning_prompt(self) -> str:
+        """
+        Build the prompt used to (re)plan the next phase of execution.
         
-        Current iteration: {self.iteration_count}
+        Returns:
+            Planning prompt including recent execution history
         """
+        planning_prompt = PLANNING_PROMPT_TEMPLATE.format_map({"task": self.current_task, "iteration": self.iteration_count})
         
         # Add execution history context if available
-        if self.execution_history:
-            recent_history = self.execution_history[-3:] if len(self.execution_history) > 3 else self.execution_history
-            history_text = "\n".join([f"- {h['type']}: {h['content'][:200]}..." for h in recent_history])
+        recent_history = self.execution_history.recent(3)
+        if recent_history:
+            history_text = "\n".join([f"- {h.type}: {h.content[:200]}..." for h in recent_history])
             planning_prompt += f"\nRecent execution history:\n{history_text}\n"
         
+        return planning_prompt
+    
+    def execute_planning_step(self) -> Dict[str, Any]:
+        """
+        Execute a planning step in the continuous loop.
+        
+        Returns:
+            Result of the planning step
+        """
         # Get planning response
-        response = self.assistant.ask(planning_prompt)
+        response = self.assistant.ask(self._build_planning_prompt())
         
         # Record the planning step
-        self.execution_history.append({
-            "type": "planning",
-            "content": response.get("response", ""),
-            "timestamp": time.time()
-        })
+        self._record(ENTRY_PLANNING, response.get("response", ""))
         
         # Move to execution phase
         self.task_status = "executing"
@@ -209,51 +337,55 @@ class ContinuousExecutionLoop:
             Result of the task step
         """
         # Create an execution prompt
-        execution_prompt = f"""
-        I am working on this task: {self.current_task}
-        
-        I need to execute the next step in my plan. Based on my execution history,
-        I should determine the most appropriate action to take now.
-        
-        Current iteration: {self.iteration_count}
-        """
+        execution_prompt = EXECUTION_PROMPT_TEMPLATE.format_map({"task": self.current_task, "iteration": self.iteration_count})
         
         # Add execution history context
-        if self.execution_history:
-            recent_history = self.execution_history[-5:] if len(self.execution_history) > 5 else self.execution_history
-            history_text = "\n".join([f"- {h['type']}: {h['content'][:200]}..." for h in recent_history])
+        recent_history = self.execution_history.recent(5)
+        if recent_history:
+            history_text = "\n".join([f"- {h.type}: {h.content[:200]}..." for h in recent_history])
             execution_prompt += f"\nRecent execution history:\n{history_text}\n"
         
-        # Get execution response
-        response = self.assistant.ask(execution_prompt)
+        # Stream the execution response, stopping once a completion indicator
+        # shows up so the rest of the completion is not generated. The line of
+        # the indicator and any tool call still being written are read to
+        # their end first, so a tool call next to the indicator is kept.
+        scan_start = 0
+        completion_end = None
+        
+        def completion_detected(text: str) -> bool:
+            nonlocal scan_start, completion_end
+            if completion_end is None:
+                match = TASK_COMPLETION_PATTERN.search(text, scan_start)
+                scan_start = max(0, len(text) - COMPLETION_SCAN_OVERLAP)
+                if match is None:
+                    return False
+                completion_end = match.end()
+            return text.find("\n", completion_end) >= 0 and not _has_open_tool_call(text)
+        
+        response = self.assistant.ask_stream(execution_prompt, stop_when=completion_detected)
         
         # Check if the response contains a tool call
         if response.get("type") == "tool_call":
             # Record the tool call
-            self.execution_history.append({
-                "type": "tool_call",
-                "content": f"Tool: {response.get('tool', '')}, Args: {response.get('args', {})}",
-                "timestamp": time.time()
-            })
+            self._record(ENTRY_TOOL_CALL, f"Tool: {response.get('tool', '')}, Args: {json.dumps(response.get('args', {}), sort_keys=True)}")
             
             # Record the tool result if available
             if "tool_result" in response:
-                self.execution_history.append({
-                    "type": "tool_result",
-                    "content": str(response.get("tool_result", "")),
-                    "timestamp": time.time()
-                })
+                self._record(ENTRY_TOOL_RESULT, str(response.get("tool_result", "")))
+                
+                # The result can be acted on right away
+                self.wake()
         else:
             # Record the execution step
-            self.execution_history.append({
-                "type": "execution",
-                "content": response.get("response", ""),
-                "timestamp": time.time()
-            })
+            self._record(ENTRY_EXECUTION, response.get("response", ""))
         
         # Check for completion indicators in the response
-        response_text = response.get("response", "") if response.get("type") == "response" else str(response)
-        if "task completed" in response_text.lower() or "all steps completed" in response_text.lower():
+        # Only scan the textual parts of the response rather than the repr of
+        # the whole response dict
+        response_text = response.get("response") or response.get("tool_result") or ""
+        if not isinstance(response_text, str):
+            response_text = ""
+        if TASK_COMPLETION_PATTERN.search(response_text):
             self.task_status = "reviewing"
         else:
             # Continue execution
@@ -272,32 +404,17 @@ class ContinuousExecutionLoop:
             Result of the review step
         """
         # Create a review prompt
-        review_prompt = f"""
-        I have been working on this task: {self.current_task}
-        
-        I need to review my work to determine if the task is truly complete.
-        I should check:
-        1. Have all requirements been fulfilled?
-        2. Is there any part of the task that remains incomplete?
-        3. Are there any errors or issues that need to be addressed?
-        4. Is there any way to improve the result?
-        
-        Current iteration: {self.iteration_count}
-        """
+        review_prompt = REVIEW_PROMPT_TEMPLATE.format_map({"task": self.current_task, "iteration": self.iteration_count})
         
         # Get review response
         response = self.assistant.ask(review_prompt)
         
         # Record the review step
-        self.execution_history.append({
-            "type": "review",
-            "content": response.get("response", ""),
-            "timestamp": time.time()
-        })
+        self._record(ENTRY_REVIEW, response.get("response", ""))
         
         # Check for completion confirmation
         response_text = response.get("response", "")
-        if "task is complete" in response_text.lower() or "requirements fulfilled" in response_text.lower():
+        if REVIEW_COMPLETION_PATTERN.search(response_text):
             self.task_status = "completed"
             logger.info("Task marked as completed after review")
         else:
@@ -321,41 +438,98 @@ class ContinuousExecutionLoop:
             Result of the recovery step
         """
         # Create a recovery prompt
-        recovery_prompt = f"""
-        I encountered an error while working on this task: {self.current_task}
+        recovery_prompt = RECOVERY_PROMPT_TEMPLATE.format_map({
+            "task": self.current_task,
+            "iteration": self.iteration_count,
+            "error_count": self.error_count
+        })
         
-        I need to:
-        1. Analyze what went wrong
-        2. Determine how to recover
-        3. Adjust my approach to avoid similar errors
+        error_entry = self.execution_history.last_of_type(ENTRY_ERROR)
         
-        Current iteration: {self.iteration_count}
-        Error count: {self.error_count}
-        """
+        # Recover from known errors without an LLM round-trip
+        action = self._classify_error(str(error_entry.content) if error_entry else "")
+        if action and self.error_count <= RULE_RECOVERY_LIMIT:
+            return self._apply_recovery_rule(action)
         
         # Add recent error information if available
-        if self.execution_history and any(h["type"] == "error" for h in self.execution_history):
-            error_entries = [h for h in self.execution_history if h["type"] == "error"]
-            recent_error = error_entries[-1]["content"] if error_entries else "Unknown error"
+        if error_entry:
+            recent_error = error_entry.content
             recovery_prompt += f"\nMost recent error:\n{recent_error}\n"
         
-        # Get recovery response
-        response = self.assistant.ask(recovery_prompt)
+        # The replan only depends on the (frozen) error context, so request the
+        # recovery analysis and the new plan concurrently instead of spending a
+        # separate planning iteration on it. Neither request writes the shared
+        # conversation history; both exchanges are added below in a fixed order
+        planning_prompt = self._build_planning_prompt()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            response, planning_response = executor.map(
+                lambda prompt: self.assistant.ask(prompt, record_history=False),
+                [recovery_prompt, planning_prompt]
+            )
+        
+        self.assistant.add_exchange_to_history(recovery_prompt, response.get("response", ""))
+        self.assistant.add_exchange_to_history(planning_prompt, planning_response.get("response", ""))
+        
+        # Record the recovery and planning steps
+        self._record(ENTRY_RECOVERY, response.get("response", ""))
+        self._record(ENTRY_PLANNING, planning_response.get("response", ""))
+        
+        # Continue straight to the execution phase with the new plan
+        self.task_status = "executing"
+        self.last_progress_time = time.time()
         
-        # Record the recovery step
-        self.execution_history.append({
-            "type": "recovery",
-            "content": response.get("response", ""),
-            "timestamp": time.time()
-        })
+        return {
+            "status": "recovery_complete",
+            "recovery_plan": response.get("response", ""),
+            "plan": planning_response.get("response", "")
+        }
+    
+    def _classify_error(self, error_message: str) -> Optional[str]:
+        """
+        Match the most recent error against the known recovery rules.
         
-        # Return to planning phase
-        self.task_status = "planning"
+        Args:
+            error_message: Recorded message of the most recent error
+            
+        Returns:
+            Recovery action for the error, or None if the error is unknown
+        """
+        for matcher, action in RECOVERY_RULES:
+            if isinstance(matcher, type):
+                if isinstance(self.last_error, matcher):
+                    return action
+            elif matcher.search(error_message):
+                return action
+        
+        return None
+    
+    def _apply_recovery_rule(self, action: str) -> Dict[str, Any]:
+        """
+        Recover from a known error using a predefined action.
+        
+        Args:
+            action: Recovery action returned by _classify_error
+            
+        Returns:
+            Result of the recovery step
+        """
+        logger.info("Recovering from known error with action: %s", action)
+        
+        if action == RECOVERY_RETRY:
+            # Back off before retrying; wake() still interrupts the wait
+            backoff = min(2 ** (self.error_count - 1), MAX_RECOVERY_BACKOFF)
+            self._wake.wait(timeout=backoff)
+            self._wake.clear()
+        
+        self._record(ENTRY_RECOVERY, f"Known error, applied recovery action: {action}")
+        
+        # Retry the execution phase with the existing plan
+        self.task_status = "executing"
         self.last_progress_time = time.time()
         
         return {
             "status": "recovery_complete",
-            "recovery_plan": response.get("response", "")
+            "recovery_action": action
         }
     
     def handle_error(self, error: Exception) -> None:
@@ -366,15 +540,12 @@ class ContinuousExecutionLoop:
             error: The exception that was raised
         """
         self.error_count += 1
+        self.last_error = error
         error_message = f"{str(error)}\n{traceback.format_exc()}"
-        logger.error(f"Error in iteration {self.iteration_count}: {error_message}")
+        logger.error("Error in iteration %d: %s", self.iteration_count, error_message)
         
         # Record the error
-        self.execution_history.append({
-            "type": "error",
-            "content": error_message,
-            "timestamp": time.time()
-        })
+        self._record(ENTRY_ERROR, error_message)
         
         # Switch to error recovery mode
         self.task_status = "error_recovery"
@@ -390,6 +561,16 @@ class ContinuousExecutionLoop:
                 "timestamp": time.time()
             })
     
+    def wake(self) -> None:
+        """
+        Signal that new work is available.
+        
+        The loop starts its next iteration immediately instead of waiting for
+        the rest of the iteration delay. Safe to call from other threads, e.g.
+        from tool callbacks.
+        """
+        self._wake.set()
+    
     def should_continue(self) -> bool:
         """
         Determine if the execution loop should continue.
@@ -399,7 +580,7 @@ class ContinuousExecutionLoop:
         """
         # Check if maximum iterations reached
         if self.iteration_count >= self.max_iterations:
-            logger.warning(f"Maximum iterations ({self.max_iterations}) reached, stopping execution")
+            logger.warning("Maximum iterations (%d) reached, stopping execution", self.max_iterations)
             return False
         
         # Check if task is already completed
@@ -6,17 +6,137 @@ enabling it to break down complex tasks, create detailed execution plans, and
 make better decisions during task execution.
 """
 
+import re
+import copy
+import asyncio
+import json
 import time
 import logging
+from enum import IntEnum
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Union, Tuple
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from .prompt_cache import PromptCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize a plan history entry to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _loads(data: bytes) -> Any:
+    """Deserialize a plan history entry."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Politeness words ignored when computing task signatures; other words can
+# change what the task means, so they are all kept
+_SIGNATURE_FILLER_WORDS = frozenset({"please", "kindly"})
+
+# Maximum number of detailed plans requested concurrently
+MAX_PLANNING_WORKERS = 8
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Start of a numbered list item such as "1." or "12)"
+_NUMBERED_ITEM_RE = re.compile(r"^[^\S\n]*\d{1,2}[.)]", re.MULTILINE)
+
+# The line following the first mention of the "most promising" approach
+_MOST_PROMISING_RE = re.compile(r"most promising[^\n]*\n([^\n]*)", re.IGNORECASE)
+
+# Task-independent prompt instructions. They always come first and the
+# variable text is appended after the marker, so consecutive prompts share an
+# identical prefix that the provider can serve from its prompt cache.
+_PROMPT_MARKER = "\n---TASK---\n"
+
+_HIGH_LEVEL_PREFIX = """I need to create a hierarchical plan for the task below.
+
+Break this down into major components or phases. For each component:
+1. Provide a clear name and description
+2. Identify the key objectives and any dependencies on other components
+3. Provide a step-by-step plan of specific, actionable steps, identifying any
+   tools or resources needed and how to verify each step is completed correctly
+
+Respond with valid JSON only, no additional text, in this format:
+{"components": [{"name": "...", "description": "...", "steps": ["...", "..."]}]}
+""" + _PROMPT_MARKER
+
+_DETAILED_PREFIX = """I need to create a detailed plan for one component of an overall task,
+both given below.
+
+Please provide a step-by-step plan that:
+1. Breaks down the component into specific, actionable steps
+2. Identifies any tools or resources needed for each step
+3. Specifies how to verify each step is completed correctly
+4. Anticipates potential challenges and how to address them
+
+Format the response as a numbered list of steps.
+""" + _PROMPT_MARKER
+
+_ADAPT_PREFIX = """I've received feedback or new information about a task I'm working on. The
+task, the components of my current plan and the feedback are given below.
+
+Based on this, I need to adapt my plan. Please help me:
+1. Identify which components need to be modified
+2. Specify what changes are needed
+3. Determine if any new components should be added
+4. Assess if any components should be removed
+
+Provide specific recommendations for adapting the plan.
+""" + _PROMPT_MARKER
+
+_REASONING_PREFIX = """I need to reason about how to approach the problem below.
+
+Please help me think through:
+1. What are the key aspects or dimensions of this problem?
+2. What are different possible approaches to solving it?
+3. What are the trade-offs between these approaches?
+4. What information or resources would I need for each approach?
+5. Which approach seems most promising and why?
+
+Provide a structured analysis that demonstrates deep reasoning.
+""" + _PROMPT_MARKER
+
+class _Status(IntEnum):
+    """Execution status of a plan component."""
+    
+    PENDING = 0
+    IN_PROGRESS = 1
+    COMPLETED = 2
+    BLOCKED = 3
+    
+    @property
+    def label(self) -> str:
+        """Status name as exposed in summaries, e.g. "in_progress"."""
+        return self.name.lower()
+
+def task_signature(task: str) -> str:
+    """
+    Compute a normalized signature for a task description.
+    
+    The signature is the full sequence of the task's words in order, so tasks
+    that differ only in casing, punctuation, whitespace or politeness words
+    map to the same signature, while any other difference, including word
+    order, gives a different one.
+    
+    Args:
+        task: The task description
+        
+    Returns:
+        Signature string for the task
+    """
+    tokens = [token for token in _WORD_RE.findall(task.lower()) if token not in _SIGNATURE_FILLER_WORDS]
+    return " ".join(tokens)
+
 class EnhancedPlanner:
     """
     Enhanced planning and reasoning system for the Syntient AI Assistant.
@@ -28,19 +148,120 @@ class EnhancedPlanner:
     4. Reasoning about task dependencies and constraints
     """
     
-    def __init__(self, assistant):
+    def __init__(self, assistant, prompt_cache: Optional[PromptCache] = None):
         """
         Initialize the enhanced planner.
         
         Args:
             assistant: The Assistant instance to use for generating plans
+            prompt_cache: Optional cache for planning responses (default: a new
+                exact-match PromptCache)
         """
         self.assistant = assistant
+        self.prompt_cache = prompt_cache if prompt_cache is not None else PromptCache()
         self.current_plan = []
-        self.plan_history = []
+        # Serialized snapshots of past plans and adaptations, see get_history
+        self.plan_history: List[bytes] = []
         self.task_hierarchy = {}
         self.execution_status = {}
         
+        # Components still to be started, in plan order, and the one being worked on
+        self._pending_order = deque()
+        self._active_component = None
+        
+        # Plan summary, kept up to date as the execution status changes
+        self._summary_cache = {}
+        
+        # Sum of the progress of all components, for the overall average
+        self._progress_sum = 0.0
+        
+        # Hierarchical plans keyed by task signature, reused for identically worded tasks
+        self._template_cache: Dict[str, Dict[str, Any]] = {}
+        
+    def _append_history(self, entry: Dict[str, Any]) -> None:
+        """
+        Append a snapshot of a plan or adaptation to the plan history.
+        
+        Entries are stored serialized, so the history holds no references to
+        live plans and later changes to a plan do not alter its snapshot.
+        
+        Args:
+            entry: The plan or adaptation record
+        """
+        self.plan_history.append(_dumps(entry))
+    
+    def get_history(self, index: int) -> Dict[str, Any]:
+        """
+        Get an entry of the plan history.
+        
+        Args:
+            index: Index of the entry; negative indices count from the end
+            
+        Returns:
+            The deserialized plan or adaptation record
+        """
+        return _loads(self.plan_history[index])
+    
+    def _cached_ask(self, prompt: str, isolated: bool = False) -> Dict[str, Any]:
+        """
+        Ask the assistant, reusing cached responses for repeated prompts.
+        
+        Args:
+            prompt: The prompt to send to the assistant
+            isolated: Neither read nor write the assistant's conversation
+                history, for requests sent concurrently with others
+            
+        Returns:
+            The assistant's processed response
+        """
+        cached_response = self.prompt_cache.get(prompt)
+        if cached_response is not None:
+            logger.info("Using cached planning response")
+            return cached_response
+        
+        if isolated:
+            response = self.assistant.ask(prompt, include_history=False, record_history=False)
+        else:
+            response = self.assistant.ask(prompt)
+        self._cache_response(prompt, response)
+        return response
+    
+    async def _cached_ask_async(self, prompt: str, isolated: bool = False) -> Dict[str, Any]:
+        """
+        Asynchronous variant of _cached_ask.
+        
+        Args:
+            prompt: The prompt to send to the assistant
+            isolated: Neither read nor write the assistant's conversation
+                history, for requests sent concurrently with others
+            
+        Returns:
+            The assistant's processed response
+        """
+        cached_response = self.prompt_cache.get(prompt)
+        if cached_response is not None:
+            logger.info("Using cached planning response")
+            return cached_response
+        
+        if isolated:
+            response = await self.assistant.aask(prompt, include_history=False, record_history=False)
+        else:
+            response = await self.assistant.aask(prompt)
+        self._cache_response(prompt, response)
+        return response
+    
+    def _cache_response(self, prompt: str, response: Dict[str, Any]) -> None:
+        """
+        Cache the assistant's response to a prompt if it is worth reusing.
+        
+        Args:
+            prompt: The prompt sent to the assistant
+            response: The assistant's processed response
+        """
+        # Only cache successful text responses
+        if response.get("type") != "error" and response.get("response"):
+            self.prompt_cache.put(prompt, response)
+    
     def create_hierarchical_plan(self, task: str) -> Dict[str, Any]:
         """
         Create a hierarchical plan for a complex task.
@@ -51,36 +272,145 @@ class EnhancedPlanner:
         Returns:
             Dictionary containing the hierarchical plan
         """
-        logger.info(f"Creating hierarchical plan for task: {task}")
+        logger.info("Creating hierarchical plan for task: %s", task)
+        
+        # Reuse the plan of a structurally identical task if there is one
+        signature = task_signature(task)
+        hierarchical_plan = self._plan_from_template(task, signature)
+        if hierarchical_plan is not None:
+            return hierarchical_plan
+        
+        # Request the components and their detailed steps in a single call
+        plan_response = self._cached_ask(_HIGH_LEVEL_PREFIX + task)
+        components, detailed_plans = self._parse_plan_response(plan_response.get("response", ""))
+        
+        if detailed_plans is None:
+            # The detailed plan requests are independent, so they are sent
+            # concurrently without touching the conversation history, and
+            # collected and recorded in component order
+            prompts = [self._detailed_plan_prompt(component, task) for component in components]
+            responses = []
+            if prompts:
+                with ThreadPoolExecutor(max_workers=min(MAX_PLANNING_WORKERS, len(prompts))) as executor:
+                    responses = list(executor.map(lambda prompt: self._cached_ask(prompt, isolated=True), prompts))
+            detailed_plans = self._name_detailed_plans(components, self._record_detailed_plans(prompts, responses))
+        
+        return self._store_plan(task, signature, components, detailed_plans)
+    
+    async def create_hierarchical_plan_async(self, task: str) -> Dict[str, Any]:
+        """
+        Asynchronous variant of create_hierarchical_plan.
         
-        # First, create a high-level plan
-        high_level_prompt = f"""
-        I need to create a hierarchical plan for this task:
+        Detailed plans that have to be requested separately are awaited
+        together instead of occupying a worker thread each.
         
-        {task}
+        Args:
+            task: The task description
+            
+        Returns:
+            Dictionary containing the hierarchical plan
+        """
+        logger.info("Creating hierarchical plan for task: %s", task)
+        
+        # Reuse the plan of a structurally identical task if there is one
+        signature = task_signature(task)
+        hierarchical_plan = self._plan_from_template(task, signature)
+        if hierarchical_plan is not None:
+            return hierarchical_plan
+        
+        # Request the components and their detailed steps in a single call
+        plan_response = await self._cached_ask_async(_HIGH_LEVEL_PREFIX + task)
+        components, detailed_plans = self._parse_plan_response(plan_response.get("response", ""))
+        
+        if detailed_plans is None:
+            prompts = [self._detailed_plan_prompt(component, task) for component in components]
+            responses = await asyncio.gather(
+                *(self._cached_ask_async(prompt, isolated=True) for prompt in prompts)
+            )
+            detailed_plans = self._name_detailed_plans(components, self._record_detailed_plans(prompts, responses))
+        
+        return self._store_plan(task, signature, components, detailed_plans)
+    
+    def _plan_from_template(self, task: str, signature: str) -> Optional[Dict[str, Any]]:
+        """
+        Instantiate the cached plan template of a task signature, if any.
         
-        First, I'll break this down into major components or phases.
-        For each component:
-        1. Provide a clear name and description
-        2. Identify the key objectives
-        3. List any dependencies on other components
+        Args:
+            task: The task description
+            signature: The task's signature
+            
+        Returns:
+            The new current plan, or None if no template is cached
+        """
+        template = self._template_cache.get(signature)
+        if template is None:
+            return None
+        
+        logger.info("Reusing cached plan template for task signature: %s", signature)
+        hierarchical_plan = copy.deepcopy(template)
+        hierarchical_plan["task"] = task
+        hierarchical_plan["created_at"] = time.time()
         
-        Format the response as a numbered list of components.
+        self.current_plan = hierarchical_plan
+        self._append_history(hierarchical_plan)
+        self._initialize_execution_status(hierarchical_plan)
+        return hierarchical_plan
+    
+    def _parse_plan_response(self, plan_text: str) -> Tuple[List[str], Optional[Dict[str, List[str]]]]:
         """
+        Parse the response to the hierarchical planning prompt.
         
-        high_level_response = self.assistant.ask(high_level_prompt)
-        high_level_plan = high_level_response.get("response", "")
+        Args:
+            plan_text: The response text
+            
+        Returns:
+            Tuple of (components, detailed_plans). detailed_plans is None if the
+            response was not a valid JSON plan and the components were parsed
+            from a numbered list instead; their detailed plans must then be
+            requested separately.
+        """
+        parsed_components = self._parse_plan_json(plan_text)
+        if parsed_components is None:
+            logger.warning("Failed to parse plan JSON, falling back to per-component planning")
+            return self._parse_numbered_list(plan_text), None
         
-        # Parse the high-level plan into components
-        components = self._parse_numbered_list(high_level_plan)
+        components = []
+        detailed_plans = {}
+        for i, (name, description, steps) in enumerate(parsed_components):
+            components.append(f"{name}: {description}" if description else name)
+            detailed_plans[f"Component {i+1}: {name}"] = steps
+        return components, detailed_plans
+    
+    def _name_detailed_plans(self, components: List[str], component_plans: List[List[str]]) -> Dict[str, List[str]]:
+        """
+        Key separately requested detailed plans by component name.
         
-        # Create detailed plans for each component
+        Args:
+            components: The high-level plan components
+            component_plans: The detailed plan of each component, in the same order
+            
+        Returns:
+            Dictionary mapping component names to their detailed plans
+        """
         detailed_plans = {}
-        for i, component in enumerate(components):
+        for i, (component, detailed_plan) in enumerate(zip(components, component_plans)):
             component_name = f"Component {i+1}: {component.split(':', 1)[0].strip() if ':' in component else component}"
-            detailed_plan = self._create_detailed_plan(component, task)
             detailed_plans[component_name] = detailed_plan
+        return detailed_plans
+    
+    def _store_plan(self, task: str, signature: str, components: List[str], detailed_plans: Dict[str, List[str]]) -> Dict[str, Any]:
+        """
+        Make a newly created hierarchical plan the current plan.
         
+        Args:
+            task: The task description
+            signature: The task's signature
+            components: The high-level plan components
+            detailed_plans: Dictionary mapping component names to their detailed plans
+            
+        Returns:
+            The hierarchical plan
+        """
         # Create the hierarchical plan structure
         hierarchical_plan = {
             "task": task,
@@ -91,43 +421,101 @@ class EnhancedPlanner:
         
         # Store the plan
         self.current_plan = hierarchical_plan
-        self.plan_history.append(hierarchical_plan)
+        self._append_history(hierarchical_plan)
+        if signature and components:
+            self._template_cache[signature] = copy.deepcopy(hierarchical_plan)
         
         # Initialize execution status
         self._initialize_execution_status(hierarchical_plan)
         
         return hierarchical_plan
     
-    def _create_detailed_plan(self, component: str, task: str) -> List[str]:
+    def _parse_plan_json(self, text: str) -> Optional[List[Tuple[str, str, List[str]]]]:
         """
-        Create a detailed plan for a component.
+        Parse a hierarchical plan returned as JSON.
         
         Args:
-            component: The component description
-            task: The overall task description
+            text: Response text containing a JSON object with a "components" list
             
         Returns:
-            List of detailed steps for the component
+            List of (name, description, steps) tuples, or None if the text is not
+            a valid plan
         """
-        detailed_prompt = f"""
-        I'm working on this overall task:
-        
-        {task}
+        # Tolerate surrounding text such as markdown code fences
+        start = text.find("{")
+        end = text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+        
+        raw_components = data.get("components") if isinstance(data, dict) else None
+        if not isinstance(raw_components, list) or not raw_components:
+            return None
+        
+        components = []
+        for component in raw_components:
+            if not isinstance(component, dict) or not isinstance(component.get("steps"), list):
+                return None
+            
+            name = str(component.get("name", "")).strip()
+            if not name:
+                return None
+            
+            description = str(component.get("description", "")).strip()
+            steps = [str(step).strip() for step in component["steps"] if str(step).strip()]
+            components.append((name, description, steps))
         
-        I need to create a detailed plan for this component:
+        return components
+    
+    def _detailed_plan_prompt(self, component: str, task: str) -> str:
+        """
+        Build the prompt requesting the detailed plan of a component.
         
-        {component}
+        Args:
+            component: The component description
+            task: The overall task description
+            
+        Returns:
+            The detailed plan prompt
+        """
+        return f"{_DETAILED_PREFIX}Task:\n{task}\n\nComponent:\n{component}"
+    
+    def _record_detailed_plans(self, prompts: List[str], responses: List[Dict[str, Any]]) -> List[List[str]]:
+        """
+        Record concurrently requested detailed plans in component order.
         
-        Please provide a step-by-step plan that:
-        1. Breaks down the component into specific, actionable steps
-        2. Identifies any tools or resources needed for each step
-        3. Specifies how to verify each step is completed correctly
-        4. Anticipates potential challenges and how to address them
+        Args:
+            prompts: The detailed plan prompts, in component order
+            responses: The assistant's responses to the prompts
+            
+        Returns:
+            List of detailed steps for each component
+        """
+        component_plans = []
+        for prompt, response in zip(prompts, responses):
+            detailed_plan = response.get("response", "")
+            self.assistant.add_exchange_to_history(prompt, detailed_plan)
+            component_plans.append(self._parse_numbered_list(detailed_plan))
+        return component_plans
+    
+    def _create_detailed_plan(self, component: str, task: str) -> List[str]:
+        """
+        Create a detailed plan for a component.
         
-        Format the response as a numbered list of steps.
+        Args:
+            component: The component description
+            task: The overall task description
+            
+        Returns:
+            List of detailed steps for the component
         """
+        detailed_prompt = self._detailed_plan_prompt(component, task)
         
-        detailed_response = self.assistant.ask(detailed_prompt)
+        detailed_response = self._cached_ask(detailed_prompt)
         detailed_plan = detailed_response.get("response", "")
         
         # Parse the detailed plan into steps
@@ -145,33 +533,21 @@ class EnhancedPlanner:
         Returns:
             List of items extracted from the numbered list
         """
-        lines = text.strip().split('\n')
+        if not text or text.isspace():
+            return []
+        
+        # Split the text at every line that starts a numbered item; any text
+        # before the first item is kept as an item of its own
+        boundaries = [match.start() for match in _NUMBERED_ITEM_RE.finditer(text)]
+        if not boundaries or boundaries[0] != 0:
+            boundaries.insert(0, 0)
+        boundaries.append(len(text))
+        
         items = []
-        current_item = ""
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check if line starts with a number followed by a period or parenthesis
-            if (line[0].isdigit() and len(line) > 1 and 
-                (line[1] == '.' or line[1] == ')' or 
-                 (len(line) > 2 and line[1].isdigit() and line[2] in ['.', ')']))):
-                
-                # If we have a current item, add it to the list
-                if current_item:
-                    items.append(current_item)
-                
-                # Start a new item
-                current_item = line
-            else:
-                # Continue the current item
-                current_item += " " + line
-        
-        # Add the last item if there is one
-        if current_item:
-            items.append(current_item)
+        for start, end in zip(boundaries, boundaries[1:]):
+            item = " ".join(line.strip() for line in text[start:end].splitlines() if line.strip())
+            if item:
+                items.append(item)
         
         return items
     
@@ -195,10 +571,38 @@ class EnhancedPlanner:
                 "steps_completed": 0,
                 "total_steps": len(steps),
                 "current_step": 0,
-                "status": "pending"  # pending, in_progress, completed, blocked
+                "status": _Status.PENDING
             }
         
         self.execution_status = execution_status
+        self._pending_order = deque(execution_status["components"])
+        self._active_component = None
+        self._progress_sum = 0.0
+        
+        # Build the plan summary once; later updates only touch changed components
+        self._summary_cache = {
+            "task": plan.get("task", ""),
+            "overall_progress": 0.0,
+            "components": {},
+            "created_at": plan.get("created_at", 0)
+        }
+        for component_name in execution_status["components"]:
+            self._refresh_component_summary(component_name)
+    
+    def _refresh_component_summary(self, component_name: str) -> None:
+        """
+        Update the cached plan summary entry of a component.
+        
+        Args:
+            component_name: The component name
+        """
+        component_status = self.execution_status["components"][component_name]
+        self._summary_cache["components"][component_name] = {
+            "total_steps": component_status["total_steps"],
+            "completed_steps": component_status["steps_completed"],
+            "progress": component_status["progress"],
+            "status": component_status["status"].label
+        }
     
     def get_next_action(self) -> Tuple[str, Dict[str, Any]]:
         """
@@ -222,8 +626,10 @@ class EnhancedPlanner:
         
         if current_step_index >= component_status["total_steps"]:
             # Mark component as completed
-            component_status["status"] = "completed"
-            component_status["progress"] = 1.0
+            component_status["status"] = _Status.COMPLETED
+            self._set_component_progress(component_status, 1.0)
+            self._active_component = None
+            self._refresh_component_summary(next_component)
             self._update_overall_progress()
             return "component_completed", {"component": next_component}
         
@@ -243,16 +649,23 @@ class EnhancedPlanner:
         Returns:
             Name of the next component to work on, or None if all are completed
         """
-        # First, check for in-progress components
-        for component_name, status in self.execution_status["components"].items():
-            if status["status"] == "in_progress":
-                return component_name
-        
-        # Then, check for pending components
-        for component_name, status in self.execution_status["components"].items():
-            if status["status"] == "pending":
+        components = self.execution_status["components"]
+        
+        # First, keep working on the in-progress component
+        if self._active_component is not None:
+            if components[self._active_component]["status"] == _Status.IN_PROGRESS:
+                return self._active_component
+            self._active_component = None
+        
+        # Then, start the next pending component in plan order
+        while self._pending_order:
+            component_name = self._pending_order.popleft()
+            status = components[component_name]
+            if status["status"] == _Status.PENDING:
                 # Mark as in-progress
-                status["status"] = "in_progress"
+                status["status"] = _Status.IN_PROGRESS
+                self._active_component = component_name
+                self._refresh_component_summary(component_name)
                 return component_name
         
         # No pending or in-progress components found
@@ -268,7 +681,7 @@ class EnhancedPlanner:
             completed: Whether the step was completed successfully
         """
         if component not in self.execution_status["components"]:
-            logger.warning(f"Component {component} not found in execution status")
+            logger.warning("Component %s not found in execution status", component)
             return
         
         component_status = self.execution_status["components"][component]
@@ -282,22 +695,35 @@ class EnhancedPlanner:
             pass
         
         # Update progress
-        component_status["progress"] = component_status["steps_completed"] / component_status["total_steps"]
+        self._set_component_progress(component_status, component_status["steps_completed"] / component_status["total_steps"])
+        self._refresh_component_summary(component)
         
         # Update overall progress
         self._update_overall_progress()
     
+    def _set_component_progress(self, component_status: Dict[str, Any], progress: float) -> None:
+        """
+        Set the progress of a component, keeping the running progress total in sync.
+        
+        Args:
+            component_status: The component's execution status
+            progress: The new progress of the component
+        """
+        self._progress_sum += progress - component_status["progress"]
+        component_status["progress"] = progress
+    
     def _update_overall_progress(self) -> None:
         """
         Update the overall progress of the execution.
         """
         if not self.execution_status["components"]:
             self.execution_status["overall_progress"] = 0.0
+            self._summary_cache["overall_progress"] = 0.0
             return
         
-        # Calculate average progress across all components
-        total_progress = sum(comp["progress"] for comp in self.execution_status["components"].values())
-        self.execution_status["overall_progress"] = total_progress / len(self.execution_status["components"])
+        # Average progress across all components, from the running total
+        self.execution_status["overall_progress"] = self._progress_sum / len(self.execution_status["components"])
+        self._summary_cache["overall_progress"] = self.execution_status["overall_progress"]
     
     def adapt_plan(self, feedback: str) -> Dict[str, Any]:
         """
@@ -313,37 +739,18 @@ class EnhancedPlanner:
             logger.warning("No current plan to adapt")
             return {}
         
-        logger.info(f"Adapting plan based on feedback: {feedback}")
+        logger.info("Adapting plan based on feedback: %s", feedback)
         
         # Create an adaptation prompt
-        adaptation_prompt = f"""
-        I'm working on this task:
-        
-        {self.current_plan["task"]}
-        
-        My current plan has these components:
+        adaptation_prompt = (
+            f"{_ADAPT_PREFIX}Task:\n{self.current_plan['task']}\n\n"
+            f"Current components:\n{', '.join(self.current_plan['detailed_plans'].keys())}\n\n"
+            f"Feedback:\n{feedback}"
+        )
         
-        {', '.join(self.current_plan["detailed_plans"].keys())}
-        
-        I've received this feedback or new information:
-        
-        {feedback}
-        
-        Based on this, I need to adapt my plan. Please help me:
-        1. Identify which components need to be modified
-        2. Specify what changes are needed
-        3. Determine if any new components should be added
-        4. Assess if any components should be removed
-        
-        Provide specific recommendations for adapting the plan.
-        """
-        
-        adaptation_response = self.assistant.ask(adaptation_prompt)
+        adaptation_response = self._cached_ask(adaptation_prompt)
         adaptation_recommendations = adaptation_response.get("response", "")
         
-        # Store the original plan
-        original_plan = self.current_plan.copy()
-        
         # Apply the adaptations (simplified implementation)
         # In a real implementation, this would parse the recommendations and modify the plan accordingly
         
@@ -357,14 +764,19 @@ class EnhancedPlanner:
             "steps_completed": 0,
             "total_steps": len(adaptation_plan),
             "current_step": 0,
-            "status": "pending"
+            "status": _Status.PENDING
         }
+        self._pending_order.append(component_name)
+        self._refresh_component_summary(component_name)
+        
+        # The new component has no progress yet but lowers the overall average
+        self._update_overall_progress()
         
-        # Add to plan history
-        self.plan_history.append({
+        # Add to plan history as a diff against the previous plan
+        self._append_history({
             "type": "adaptation",
-            "original_plan": original_plan,
-            "adapted_plan": self.current_plan,
+            "added_component": component_name,
+            "steps": adaptation_plan,
             "feedback": feedback,
             "timestamp": time.time()
         })
@@ -381,37 +793,20 @@ class EnhancedPlanner:
         Returns:
             Dictionary containing reasoning results
         """
-        logger.info(f"Reasoning about approach for problem: {problem_description}")
+        logger.info("Reasoning about approach for problem: %s", problem_description)
         
         # Create a reasoning prompt
-        reasoning_prompt = f"""
-        I need to reason about how to approach this problem:
+        reasoning_prompt = _REASONING_PREFIX + problem_description
         
-        {problem_description}
-        
-        Please help me think through:
-        1. What are the key aspects or dimensions of this problem?
-        2. What are different possible approaches to solving it?
-        3. What are the trade-offs between these approaches?
-        4. What information or resources would I need for each approach?
-        5. Which approach seems most promising and why?
-        
-        Provide a structured analysis that demonstrates deep reasoning.
-        """
-        
-        reasoning_response = self.assistant.ask(reasoning_prompt)
+        reasoning_response = self._cached_ask(reasoning_prompt)
         reasoning_analysis = reasoning_response.get("response", "")
         
         # Extract the recommended approach (simplified implementation)
         # In a real implementation, this would parse the analysis more carefully
         
         # For now, just look for the "most promising" section
-        recommended_approach = "Unknown"
-        analysis_lines = reasoning_analysis.split('\n')
-        for i, line in enumerate(analysis_lines):
-            if "most promising" in line.lower() and i < len(analysis_lines) - 1:
-                recommended_approach = analysis_lines[i+1].strip()
-                break
+        match = _MOST_PROMISING_RE.search(reasoning_analysis)
+        recommended_approach = match.group(1).strip() if match else "Unknown"
         
         return {
             "problem": problem_description,
@@ -427,31 +822,29 @@ class EnhancedPlanner:
         Returns:
             Dictionary containing execution status
         """
-        return self.execution_status
+        if not self.execution_status:
+            return self.execution_status
+        
+        # Statuses are tracked as _Status internally and exposed as strings
+        return {
+            **self.execution_status,
+            "components": {
+                component_name: {**component_status, "status": component_status["status"].label}
+                for component_name, component_status in self.execution_status["components"].items()
+            }
+        }
     
     def get_plan_summary(self) -> Dict[str, Any]:
         """
         Get a summary of the current plan.
         
+        The summary is maintained incrementally as the execution status changes,
+        so this is a constant-time lookup. Callers should not modify it.
+        
         Returns:
             Dictionary containing plan summary
         """
         if not self.current_plan:
             return {"status": "no_plan"}
         
-        component_summaries = {}
-        for component_name, steps in self.current_plan["detailed_plans"].items():
-            component_status = self.execution_status["components"].get(component_name, {})
-            component_summaries[component_name] = {
-                "total_steps": len(steps),
-                "completed_steps": component_status.get("steps_completed", 0),
-                "progress": component_status.get("progress", 0.0),
-                "status": component_status.get("status", "unknown")
-            }
-        
-        return {
-            "task": self.current_plan.get("task", ""),
-            "overall_progress": self.execution_status.get("overall_progress", 0.0),
-            "components": component_summaries,
-            "created_at": self.current_plan.get("created_at", 0)
-        }
+        return self._summary_cache
@@ -7,24 +7,95 @@ the capabilities of the assistant, including tool usage.
 
 import logging
 import json
-from typing import Dict, Any, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 
 from core.assistant import Assistant
 from core.quantum_logic import quantum_logic
 from core.example_tasks import ExampleTasks
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Maximum number of example tasks executed concurrently by batch_execute
+MAX_BATCH_WORKERS = 8
+
+# Prompt templates for the specialized example tasks. The static instructions
+# come first and the task parameter last, so prompts of the same task share a
+# common prefix.
+_WEBSITE_SUMMARY_TEMPLATE = """To accomplish this task, you should:
+1. Use the browser_use tool to access the website
+2. Extract the main content
+3. Create a concise summary
+
+Make sure to use the browser_use tool with the URL parameter.
+
+Please summarize the content of this website: {url}
+"""
+
+_CODE_EXECUTION_TEMPLATE = """To accomplish this task, you should:
+1. Use the code_executor tool to run the code
+2. Analyze the results
+3. Provide an explanation
+
+Make sure to use the code_executor tool with the code parameter.
+
+Please execute this code and explain the results:
+
+```python
+{code}
+```
+"""
+
+_FILE_ANALYSIS_TEMPLATE = """To accomplish this task, you should:
+1. Use the file_parser tool to read the file
+2. Analyze the content
+3. Provide insights and summary
+
+Make sure to use the file_parser tool with the file_path parameter.
+
+Please analyze the content of this file: {file_path}
+"""
+
+_WEB_SEARCH_TEMPLATE = """To accomplish this task, you should:
+1. Use the web_search tool to find relevant information
+2. Analyze the search results
+3. Provide a comprehensive answer
+
+Make sure to use the web_search tool with the query parameter.
+
+Please search the web for information about: {query}
+"""
+
+_QUANTUM_DECISION_TEMPLATE = """To accomplish this task, you should:
+1. Consider each of the options
+2. Apply quantum-inspired decision making
+3. Provide a recommendation with probabilities
+
+Use quantum-inspired logic to handle uncertainty and provide a nuanced decision.
+
+Please help me make a decision between these options using quantum-inspired logic: {options}
+"""
+
+# Specialized example tasks: display name, parameter name and prompt template,
+# plus an optional formatter for the parameter value
+_TASK_SPECS: Dict[str, Dict[str, Any]] = {
+    "website_summary": {"name": "Website Summary", "param": "url", "template": _WEBSITE_SUMMARY_TEMPLATE},
+    "code_execution": {"name": "Code Execution", "param": "code", "template": _CODE_EXECUTION_TEMPLATE, "log_param": False},
+    "file_analysis": {"name": "File Analysis", "param": "file_path", "template": _FILE_ANALYSIS_TEMPLATE},
+    "web_search": {"name": "Web Search", "param": "query", "template": _WEB_SEARCH_TEMPLATE},
+    "quantum_decision": {"name": "Quantum Decision Making", "param": "options", "template": _QUANTUM_DECISION_TEMPLATE, "format": ", ".join}
+}
+
 class ExampleTaskHandler:
     """
     Handler for example tasks that demonstrate the capabilities of the assistant.
     """
     
+    # Executor shared by all handlers, created on first use
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    
     def __init__(self, assistant: Assistant):
         """
         Initialize the example task handler.
@@ -34,6 +105,70 @@ class ExampleTaskHandler:
         """
         self.assistant = assistant
     
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """
+        Get the executor shared by all handlers, creating it if needed.
+        
+        Returns:
+            The shared ThreadPoolExecutor
+        """
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(max_workers=MAX_BATCH_WORKERS, thread_name_prefix="example-task")
+        return cls._executor
+    
+    def batch_execute(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Execute several example tasks concurrently.
+        
+        The assistant serializes its tool executions and history updates, so
+        the tasks only overlap on their API requests.
+        
+        Args:
+            calls: List of (method_name, kwargs) pairs, e.g.
+                ("execute_web_search_task", {"query": "python"})
+            
+        Returns:
+            Results of the task executions, in the order of the calls
+        """
+        executor = self._get_executor()
+        futures = {}
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        
+        for index, (method_name, kwargs) in enumerate(calls):
+            method = getattr(self, method_name, None)
+            if not method_name.startswith("execute_") or not callable(method):
+                results[index] = {"error": f"Unknown task method '{method_name}'"}
+                continue
+            futures[executor.submit(method, **kwargs)] = index
+        
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.exception("Error executing batched task %s", calls[index][0])
+                results[index] = {"error": str(e)}
+        
+        return results
+    
+    def _ask(self, prompt: str, dry_run: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Send a task prompt to the assistant unless this is a dry run.
+        
+        Args:
+            prompt: The task prompt
+            dry_run: Skip the LLM call and return None
+            
+        Returns:
+            The assistant's response, or None for a dry run
+        """
+        if dry_run:
+            return None
+        return self.assistant.ask(prompt)
+    
     def execute_task(self, task_id: str, **kwargs) -> Dict[str, Any]:
         """
         Execute an example task.
@@ -53,7 +188,7 @@ class ExampleTaskHandler:
         prompt = ExampleTasks.get_task_prompt(task_id, **kwargs)
         
         # Execute the task
-        logger.info(f"Executing example task: {task_id}")
+        logger.info("Executing example task: %s", task_id)
         result = self.assistant.ask(prompt)
         
         return {
@@ -63,83 +198,69 @@ class ExampleTaskHandler:
             "result": result
         }
     
-    def execute_website_summary_task(self, url: str) -> Dict[str, Any]:
+    def _run_spec(self, task_id: str, value: Any, dry_run: bool = False, result_key: str = "result") -> Dict[str, Any]:
         """
-        Execute a website summary task.
-        
-        This task demonstrates the use of the browser_use tool.
+        Execute a specialized example task described in _TASK_SPECS.
         
         Args:
-            url: URL of the website to summarize
+            task_id: ID of the task in _TASK_SPECS
+            value: Value of the task's parameter
+            dry_run: Build the prompt without invoking the LLM
+            result_key: Key under which the assistant's response is returned
             
         Returns:
             Result of the task execution
         """
-        # Create a specialized prompt that encourages tool usage
-        prompt = f"""
-        Please summarize the content of this website: {url}
-        
-        To accomplish this task, you should:
-        1. Use the browser_use tool to access the website
-        2. Extract the main content
-        3. Create a concise summary
-        
-        Make sure to use the browser_use tool with the URL parameter.
-        """
+        spec = _TASK_SPECS[task_id]
+        param = spec["param"]
+        formatted = spec.get("format", str)(value)
+        prompt = spec["template"].format(**{param: formatted})
         
         # Execute the task
-        logger.info(f"Executing website summary task for URL: {url}")
-        result = self.assistant.ask(prompt)
+        if spec.get("log_param", True):
+            logger.info("Executing %s task for %s: %s", spec["name"], param, formatted)
+        else:
+            logger.info("Executing %s task", spec["name"])
         
         return {
-            "task_id": "website_summary",
-            "task_name": "Website Summary",
-            "url": url,
+            "task_id": task_id,
+            "task_name": spec["name"],
+            param: value,
             "prompt": prompt,
-            "result": result
+            result_key: self._ask(prompt, dry_run)
         }
     
-    def execute_code_execution_task(self, code: str) -> Dict[str, Any]:
+    def execute_website_summary_task(self, url: str, dry_run: bool = False) -> Dict[str, Any]:
         """
-        Execute a code execution task.
+        Execute a website summary task.
         
-        This task demonstrates the use of the code_executor tool.
+        This task demonstrates the use of the browser_use tool.
         
         Args:
-            code: Code to execute
+            url: URL of the website to summarize
+            dry_run: Build the prompt without invoking the LLM
             
         Returns:
             Result of the task execution
         """
-        # Create a specialized prompt that encourages tool usage
-        prompt = f"""
-        Please execute this code and explain the results:
-        
-        ```python
-        {code}
-        ```
-        
-        To accomplish this task, you should:
-        1. Use the code_executor tool to run the code
-        2. Analyze the results
-        3. Provide an explanation
-        
-        Make sure to use the code_executor tool with the code parameter.
+        return self._run_spec("website_summary", url, dry_run)
+    
+    def execute_code_execution_task(self, code: str, dry_run: bool = False) -> Dict[str, Any]:
         """
+        Execute a code execution task.
         
-        # Execute the task
-        logger.info(f"Executing code execution task")
-        result = self.assistant.ask(prompt)
+        This task demonstrates the use of the code_executor tool.
         
-        return {
-            "task_id": "code_execution",
-            "task_name": "Code Execution",
-            "code": code,
-            "prompt": prompt,
-            "result": result
-        }
+        Args:
+            code: Code to execute
+            dry_run: Build the prompt without invoking the LLM
+            
+        Returns:
+            Result of the task execution
+        """
+        return self._run_spec("code_execution", code, dry_run)
     
-    def execute_file_analysis_task(self, file_path: str) -> Dict[str, Any]:
+    def execute_file_analysis_task(self, file_path: str, dry_run: bool = False) -> Dict[str, Any]:
         """
         Execute a file analysis task.
         
@@ -147,35 +268,14 @@ class ExampleTaskHandler:
         
         Args:
             file_path: Path to the file to analyze
+            dry_run: Build the prompt without invoking the LLM
             
         Returns:
             Result of the task execution
         """
-        # Create a specialized prompt that encourages tool usage
-        prompt = f"""
-        Please analyze the content of this file: {file_path}
-        
-        To accomplish this task, you should:
-        1. Use the file_parser tool to read the file
-        2. Analyze the content
-        3. Provide insights and summary
-        
-        Make sure to use the file_parser tool with the file_path parameter.
-        """
-        
-        # Execute the task
-        logger.info(f"Executing file analysis task for file: {file_path}")
-        result = self.assistant.ask(prompt)
-        
-        return {
-            "task_id": "file_analysis",
-            "task_name": "File Analysis",
-            "file_path": file_path,
-            "prompt": prompt,
-            "result": result
-        }
+        return self._run_spec("file_analysis", file_path, dry_run)
     
-    def execute_web_search_task(self, query: str) -> Dict[str, Any]:
+    def execute_web_search_task(self, query: str, dry_run: bool = False) -> Dict[str, Any]:
         """
         Execute a web search task.
         
@@ -183,35 +283,14 @@ class ExampleTaskHandler:
         
         Args:
             query: Search query
+            dry_run: Build the prompt without invoking the LLM
             
         Returns:
             Result of the task execution
         """
-        # Create a specialized prompt that encourages tool usage
-        prompt = f"""
-        Please search the web for information about: {query}
-        
-        To accomplish this task, you should:
-        1. Use the web_search tool to find relevant information
-        2. Analyze the search results
-        3. Provide a comprehensive answer
-        
-        Make sure to use the web_search tool with the query parameter.
-        """
-        
-        # Execute the task
-        logger.info(f"Executing web search task for query: {query}")
-        result = self.assistant.ask(prompt)
-        
-        return {
-            "task_id": "web_search",
-            "task_name": "Web Search",
-            "query": query,
-            "prompt": prompt,
-            "result": result
-        }
+        return self._run_spec("web_search", query, dry_run)
     
-    def execute_quantum_decision_task(self, options: List[str]) -> Dict[str, Any]:
+    def execute_quantum_decision_task(self, options: List[str], include_assistant: bool = False) -> Dict[str, Any]:
         """
         Execute a quantum decision making task.
         
@@ -219,28 +298,16 @@ class ExampleTaskHandler:
         
         Args:
             options: List of decision options
+            include_assistant: Also ask the assistant for its own recommendation;
+                only the quantum result is computed otherwise
             
         Returns:
             Result of the task execution
         """
-        # Create a specialized prompt that encourages quantum logic usage
-        options_text = ", ".join(options)
-        prompt = f"""
-        Please help me make a decision between these options using quantum-inspired logic: {options_text}
+        # Execute the task with the assistant only when its answer is wanted
+        result = self._run_spec("quantum_decision", options, dry_run=not include_assistant, result_key="assistant_result")
         
-        To accomplish this task, you should:
-        1. Consider the options: {options_text}
-        2. Apply quantum-inspired decision making
-        3. Provide a recommendation with probabilities
-        
-        Use quantum-inspired logic to handle uncertainty and provide a nuanced decision.
-        """
-        
-        # Execute the task with the assistant
-        logger.info(f"Executing quantum decision task for options: {options_text}")
-        assistant_result = self.assistant.ask(prompt)
-        
-        # Also use the quantum logic directly for comparison
+        # Use the quantum logic directly
         decision_maker = quantum_logic.create_decision_maker(options)
         
         # Add some uncertainty
@@ -252,15 +319,9 @@ class ExampleTaskHandler:
         # Make a decision
         selected_option, option_index, probability = decision_maker.make_decision()
         
-        return {
-            "task_id": "quantum_decision",
-            "task_name": "Quantum Decision Making",
-            "options": options,
-            "prompt": prompt,
-            "assistant_result": assistant_result,
-            "quantum_result": {
-                "selected_option": selected_option,
-                "probability": probability,
-                "all_probabilities": quantum_probabilities
-            }
+        result["quantum_result"] = {
+            "selected_option": selected_option,
+            "probability": probability,
+            "all_probabilities": quantum_probabilities
         }
+        return result
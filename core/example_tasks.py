@@ -5,16 +5,86 @@ This module provides example tasks that demonstrate the capabilities
 of the assistant, including tool usage and quantum-inspired logic.
 """
 
+import re
 import logging
-from typing import Dict, Any, List, Optional
+import functools
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Union
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Available example tasks; read-only since they are shared by all callers
+_TASKS: Tuple[Mapping[str, str], ...] = (
+    MappingProxyType({
+        "id": "website_summary",
+        "name": "Website Summary",
+        "description": "Summarize the content of a website",
+        "prompt": "Summarize this website: https://example.com"
+    }),
+    MappingProxyType({
+        "id": "code_execution",
+        "name": "Code Execution",
+        "description": "Execute a Python code snippet",
+        "prompt": "Execute this Python code: print('Hello, world!')"
+    }),
+    MappingProxyType({
+        "id": "file_analysis",
+        "name": "File Analysis",
+        "description": "Analyze the content of a file",
+        "prompt": "Analyze this file: /path/to/example.txt"
+    }),
+    MappingProxyType({
+        "id": "web_search",
+        "name": "Web Search",
+        "description": "Search the web for information",
+        "prompt": "Search for information about quantum computing"
+    }),
+    MappingProxyType({
+        "id": "quantum_decision",
+        "name": "Quantum Decision Making",
+        "description": "Make a decision using quantum-inspired logic",
+        "prompt": "Help me decide between these options: Option A, Option B, Option C"
+    })
+)
+_TASKS_BY_ID: Dict[str, Mapping[str, str]] = {task["id"]: task for task in _TASKS}
+
+# Plain-dict view of the tasks for serialization, built once
+_TASK_LIST: List[Dict[str, str]] = [dict(task) for task in _TASKS]
+
+# Number of formatted prompts remembered by each get_*_task builder
+PROMPT_CACHE_SIZE = 128
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+# A compiled prompt is either the prompt itself, when it has no placeholders,
+# or a tuple of literal segments and (key,) substitution slots
+_CompiledPrompt = Union[str, Tuple[Union[str, Tuple[str]], ...]]
+
+def _compile_prompt(prompt: str) -> _CompiledPrompt:
+    """
+    Split a task prompt into literal segments and placeholder slots.
+    
+    Args:
+        prompt: The prompt, with placeholders written as {key}
+        
+    Returns:
+        The compiled prompt
+    """
+    parts = _PLACEHOLDER_RE.split(prompt)
+    if len(parts) == 1:
+        return prompt
+    
+    # re.split alternates literals and captured keys
+    return tuple(part if i % 2 == 0 else (part,) for i, part in enumerate(parts) if part)
+
+_COMPILED_PROMPTS: Dict[str, _CompiledPrompt] = {task["id"]: _compile_prompt(task["prompt"]) for task in _TASKS}
+
+@functools.lru_cache(maxsize=PROMPT_CACHE_SIZE)
+def _quantum_decision_prompt(options: Tuple[str, ...]) -> str:
+    """Format the quantum decision prompt; options are a tuple so they can be cached."""
+    options_text = ", ".join(options)
+    return f"Please help me make a decision between these options using quantum-inspired logic: {options_text}"
+
 class ExampleTasks:
     """
     Collection of example tasks that demonstrate the capabilities of the assistant.
@@ -25,44 +95,16 @@ class ExampleTasks:
         """
         Get a list of available example tasks.
         
+        The list is shared between callers and must not be modified; copy it
+        first if a mutable version is needed.
+        
         Returns:
             List of dictionaries containing task ID and description
         """
-        return [
-            {
-                "id": "website_summary",
-                "name": "Website Summary",
-                "description": "Summarize the content of a website",
-                "prompt": "Summarize this website: https://example.com"
-            },
-            {
-                "id": "code_execution",
-                "name": "Code Execution",
-                "description": "Execute a Python code snippet",
-                "prompt": "Execute this Python code: print('Hello, world!')"
-            },
-            {
-                "id": "file_analysis",
-                "name": "File Analysis",
-                "description": "Analyze the content of a file",
-                "prompt": "Analyze this file: /path/to/example.txt"
-            },
-            {
-                "id": "web_search",
-                "name": "Web Search",
-                "description": "Search the web for information",
-                "prompt": "Search for information about quantum computing"
-            },
-            {
-                "id": "quantum_decision",
-                "name": "Quantum Decision Making",
-                "description": "Make a decision using quantum-inspired logic",
-                "prompt": "Help me decide between these options: Option A, Option B, Option C"
-            }
-        ]
+        return _TASK_LIST
     
     @staticmethod
-    def get_task_by_id(task_id: str) -> Optional[Dict[str, str]]:
+    def get_task_by_id(task_id: str) -> Optional[Mapping[str, str]]:
         """
         Get an example task by ID.
         
@@ -70,13 +112,9 @@ class ExampleTasks:
             task_id: ID of the task to retrieve
             
         Returns:
-            Dictionary containing task details, or None if not found
+            Read-only mapping containing task details, or None if not found
         """
-        tasks = ExampleTasks.get_task_list()
-        for task in tasks:
-            if task["id"] == task_id:
-                return task
-        return None
+        return _TASKS_BY_ID.get(task_id)
     
     @staticmethod
     def get_task_prompt(task_id: str, **kwargs) -> str:
@@ -90,21 +128,23 @@ class ExampleTasks:
         Returns:
             Task prompt with parameters substituted
         """
-        task = ExampleTasks.get_task_by_id(task_id)
-        if not task:
+        compiled = _COMPILED_PROMPTS.get(task_id)
+        if compiled is None:
             raise ValueError(f"Task with ID '{task_id}' not found")
         
-        prompt = task["prompt"]
+        # Prompts without placeholders need no substitution
+        if isinstance(compiled, str):
+            return compiled
         
-        # Substitute parameters
-        for key, value in kwargs.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in prompt:
-                prompt = prompt.replace(placeholder, str(value))
-        
-        return prompt
+        # Substitute parameters in a single pass; unknown placeholders are kept
+        return "".join(
+            (str(kwargs[segment[0]]) if segment[0] in kwargs else "{" + segment[0] + "}")
+            if isinstance(segment, tuple) else segment
+            for segment in compiled
+        )
     
     @staticmethod
+    @functools.lru_cache(maxsize=PROMPT_CACHE_SIZE)
     def get_website_summary_task(url: str) -> str:
         """
         Get a task prompt for summarizing a website.
@@ -118,6 +158,7 @@ class ExampleTasks:
         return f"Please summarize the content of this website: {url}"
     
     @staticmethod
+    @functools.lru_cache(maxsize=PROMPT_CACHE_SIZE)
     def get_code_execution_task(code: str) -> str:
         """
         Get a task prompt for executing code.
@@ -131,6 +172,7 @@ class ExampleTasks:
         return f"Please execute this code and explain the results:\n\n```python\n{code}\n```"
     
     @staticmethod
+    @functools.lru_cache(maxsize=PROMPT_CACHE_SIZE)
     def get_file_analysis_task(file_path: str) -> str:
         """
         Get a task prompt for analyzing a file.
@@ -144,6 +186,7 @@ class ExampleTasks:
         return f"Please analyze the content of this file: {file_path}"
     
     @staticmethod
+    @functools.lru_cache(maxsize=PROMPT_CACHE_SIZE)
     def get_web_search_task(query: str) -> str:
         """
         Get a task prompt for searching the web.
@@ -167,5 +210,4 @@ class ExampleTasks:
         Returns:
             Task prompt for quantum-inspired decision making
         """
-        options_text = ", ".join(options)
-        return f"Please help me make a decision between these options using quantum-inspired logic: {options_text}"
+        return _quantum_decision_prompt(tuple(options))
@@ -4,75 +4,182 @@ Integration of example tasks with the web UI for the Syntient AI Assistant Platf
 This module provides routes and handlers for the example tasks in the web UI.
 """
 
+import sys
+import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from flask import Blueprint, request, jsonify
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from flask import Blueprint, Response, request, jsonify
 
-from core.assistant import Assistant
 from core.example_tasks import ExampleTasks
-from core.example_task_handler import ExampleTaskHandler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# The assistant and task handler pull in the tool stack, so they are only
+# imported when the routes are registered
+if TYPE_CHECKING:
+    from core.assistant import Assistant
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # Create a blueprint for example tasks
 example_tasks_bp = Blueprint('example_tasks', __name__)
 
-def register_example_tasks_routes(app, assistant: Assistant):
+def _dumps(payload: Any) -> bytes:
+    """
+    Serialize a response payload to JSON bytes.
+    
+    Uses orjson when it is installed and falls back to the standard library.
+    
+    Args:
+        payload: The payload to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response without going through jsonify.
+    
+    Args:
+        payload: The payload to serialize
+        status: HTTP status code
+        
+    Returns:
+        The Flask response
+    """
+    return Response(_dumps(payload), status=status, mimetype="application/json")
+
+def register_example_tasks_routes(app, assistant: "Assistant"):
     """
     Register routes for example tasks.
     
+    Registration is idempotent: if the routes are already registered on the
+    app, this is a no-op. The task handler is stored in
+    app.extensions['syntient']['example_task_handler'] for reuse by other routes.
+    
     Args:
         app: Flask application
         assistant: Assistant instance
     """
-    # Create an example task handler
+    if example_tasks_bp.name in app.blueprints:
+        return
+    
+    from core.example_task_handler import ExampleTaskHandler
+    
+    # Create an example task handler, shared through the app's extensions
     task_handler = ExampleTaskHandler(assistant)
+    app.extensions.setdefault('syntient', {})['example_task_handler'] = task_handler
+    
+    # The task catalogue is static, so its listing is serialized only once
+    list_body = _dumps({"tasks": ExampleTasks.get_task_list()})
+    list_etag = f'"{hashlib.sha1(list_body).hexdigest()}"'
     
     @example_tasks_bp.route('/list', methods=['GET'])
     def list_tasks():
         """List all available example tasks."""
-        tasks = ExampleTasks.get_task_list()
-        return jsonify({"tasks": tasks})
+        if list_etag in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers={"ETag": list_etag})
+        return Response(list_body, mimetype="application/json", headers={"ETag": list_etag})
+    
+    # Specialized handlers by task ID, with the default parameters of each task
+    task_dispatch = {
+        'website_summary': lambda params: task_handler.execute_website_summary_task(
+            params.get('url', 'https://example.com')
+        ),
+        'code_execution': lambda params: task_handler.execute_code_execution_task(
+            params.get('code', 'print("Hello, world!")')
+        ),
+        'file_analysis': lambda params: task_handler.execute_file_analysis_task(
+            params.get('file_path', '/path/to/example.txt')
+        ),
+        'web_search': lambda params: task_handler.execute_web_search_task(
+            params.get('query', 'quantum computing')
+        ),
+        'quantum_decision': lambda params: task_handler.execute_quantum_decision_task(
+            params.get('options', ['Option A', 'Option B', 'Option C']),
+            include_assistant=params.get('include_assistant', False)
+        )
+    }
+    
+    def validate_task(task_id: Any, params: Any) -> Optional[str]:
+        """Check a task request up front; returns an error message if it is invalid."""
+        if not task_id or not isinstance(task_id, str):
+            return "Task ID is required"
+        if task_id not in task_dispatch and ExampleTasks.get_task_by_id(task_id) is None:
+            return f"Task with ID '{task_id}' not found"
+        if not isinstance(params, dict):
+            return "Task params must be an object"
+        return None
+    
+    def run_task(task_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a single example task with its specialized handler, if any."""
+        # Interned IDs match the dispatch keys by identity
+        if isinstance(task_id, str):
+            task_id = sys.intern(task_id)
+        
+        handler = task_dispatch.get(task_id)
+        if handler is not None:
+            return handler(params)
+        return task_handler.execute_task(task_id, **params)
     
     @example_tasks_bp.route('/execute', methods=['POST'])
     def execute_task():
         """Execute an example task."""
-        data = request.json
-        if not data or 'task_id' not in data:
-            return jsonify({"error": "Task ID is required"}), 400
+        data = request.get_json(silent=True, cache=True)
+        if not isinstance(data, dict):
+            data = {}
         
-        task_id = data['task_id']
-        params = data.get('params', {})
+        task_id = data.get('task_id')
+        params = data.get('params') or {}
+        error = validate_task(task_id, params)
+        if error:
+            return jsonify({"error": error}), 400
         
         # Execute the task
         try:
-            if task_id == 'website_summary':
-                url = params.get('url', 'https://example.com')
-                result = task_handler.execute_website_summary_task(url)
-            elif task_id == 'code_execution':
-                code = params.get('code', 'print("Hello, world!")')
-                result = task_handler.execute_code_execution_task(code)
-            elif task_id == 'file_analysis':
-                file_path = params.get('file_path', '/path/to/example.txt')
-                result = task_handler.execute_file_analysis_task(file_path)
-            elif task_id == 'web_search':
-                query = params.get('query', 'quantum computing')
-                result = task_handler.execute_web_search_task(query)
-            elif task_id == 'quantum_decision':
-                options = params.get('options', ['Option A', 'Option B', 'Option C'])
-                result = task_handler.execute_quantum_decision_task(options)
-            else:
-                result = task_handler.execute_task(task_id, **params)
-            
-            return jsonify(result)
+            result = run_task(task_id, params)
         except Exception as e:
-            logger.error(f"Error executing task {task_id}: {str(e)}")
-            return jsonify({"error": str(e)}), 500
+            logger.exception("Error executing task %s", task_id)
+            return _json_response({"error": str(e)}, 500)
+        
+        return _json_response(result)
+    
+    @example_tasks_bp.route('/execute_batch', methods=['POST'])
+    def execute_task_batch():
+        """Execute several example tasks in one request."""
+        data = request.get_json(silent=True, cache=True)
+        tasks = data.get('tasks') if isinstance(data, dict) else None
+        if not isinstance(tasks, list):
+            return jsonify({"error": "A list of tasks is required"}), 400
+        
+        # A failing task only fails its own slot in the results
+        results = []
+        for item in tasks:
+            if not isinstance(item, dict):
+                item = {}
+            
+            task_id = item.get('task_id')
+            params = item.get('params') or {}
+            error = validate_task(task_id, params)
+            if error:
+                results.append({"error": error})
+                continue
+            
+            try:
+                results.append(run_task(task_id, params))
+            except Exception as e:
+                logger.exception("Error executing task %s", task_id)
+                results.append({"error": str(e)})
+        
+        return _json_response({"results": results})
     
     # Register the blueprint
     app.register_blueprint(example_tasks_bp, url_prefix='/api/example_tasks')
@@ -0,0 +1,302 @@
+"""
+Execution history storage for the Syntient AI Assistant Platform.
+
+This module provides the history entries recorded by the continuous execution
+loop and an SQLite-backed store for them, so long-running loops do not keep
+their whole history (including error tracebacks) in memory.
+"""
+
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Iterator
+
+# History entry types, interned once so entries share a single string object
+ENTRY_PLAN = sys.intern("plan")
+ENTRY_PLANNING = sys.intern("planning")
+ENTRY_TOOL_CALL = sys.intern("tool_call")
+ENTRY_TOOL_RESULT = sys.intern("tool_result")
+ENTRY_EXECUTION = sys.intern("execution")
+ENTRY_REVIEW = sys.intern("review")
+ENTRY_RECOVERY = sys.intern("recovery")
+ENTRY_ERROR = sys.intern("error")
+
+# Text content longer than this many characters is stored zlib-compressed
+COMPRESSION_THRESHOLD = 4096
+
+# Length of the plain-text preview kept alongside compressed content
+PREVIEW_LENGTH = 200
+
+# Database file of the continuous loop's history, so an interrupted run can
+# be inspected or resumed after a crash
+DEFAULT_DB_PATH = "execution_history.db"
+
+# Marker prefixed to compressed content in the database (never starts JSON)
+_COMPRESSED_MARKER = b"\x00z"
+
+
+class CompressedContent:
+    """
+    zlib-compressed text content of a large history entry.
+    
+    A short plain-text preview is kept alongside the compressed data so that
+    slicing the start of the content, as the loop does when building history
+    text for prompts, never needs to decompress it.
+    """
+    
+    __slots__ = ('data', 'preview')
+    
+    def __init__(self, data: bytes, preview: str):
+        """
+        Initialize compressed content.
+        
+        Args:
+            data: zlib-compressed UTF-8 text
+            preview: The first PREVIEW_LENGTH characters of the text
+        """
+        self.data = data
+        self.preview = preview
+    
+    @classmethod
+    def compress(cls, text: str) -> "CompressedContent":
+        """
+        Compress a text.
+        
+        Args:
+            text: The text to compress
+            
+        Returns:
+            CompressedContent holding the text
+        """
+        return cls(zlib.compress(text.encode("utf-8")), text[:PREVIEW_LENGTH])
+    
+    def __str__(self) -> str:
+        return zlib.decompress(self.data).decode("utf-8")
+    
+    def __getitem__(self, key):
+        # Serve prefix slices from the preview without decompressing
+        if (isinstance(key, slice) and key.start in (None, 0) and key.step in (None, 1)
+                and key.stop is not None and 0 <= key.stop <= len(self.preview)):
+            return self.preview[:key.stop]
+        return str(self)[key]
+    
+    def __repr__(self) -> str:
+        return f"CompressedContent(preview={self.preview!r}, size={len(self.data)})"
+
+
+def compact_content(content: Any) -> Any:
+    """
+    Compress text content that exceeds COMPRESSION_THRESHOLD.
+    
+    Args:
+        content: Entry content
+        
+    Returns:
+        CompressedContent for long text, the content unchanged otherwise
+    """
+    if isinstance(content, str) and len(content) > COMPRESSION_THRESHOLD:
+        return CompressedContent.compress(content)
+    return content
+
+
+class HistoryEntry:
+    """
+    A single entry in the execution history of the continuous loop.
+    
+    Entries use __slots__ to keep long-running loops with many history
+    entries compact in memory.
+    """
+    
+    __slots__ = ('type', 'content', 'timestamp')
+    
+    def __init__(self, type: str, content: Any, timestamp: Optional[float] = None):
+        """
+        Initialize a history entry.
+        
+        Args:
+            type: Type of the entry (plan, planning, tool_call, error, ...)
+            content: Content of the entry
+            timestamp: Time the entry was recorded (defaults to now)
+        """
+        self.type = type
+        self.content = content
+        self.timestamp = time.time() if timestamp is None else timestamp
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the entry to a dictionary.
+        
+        Returns:
+            Dictionary containing the entry's type, content and timestamp
+        """
+        return {
+            "type": self.type,
+            "content": str(self.content) if isinstance(self.content, CompressedContent) else self.content,
+            "timestamp": self.timestamp
+        }
+    
+    def __repr__(self) -> str:
+        return f"HistoryEntry(type={self.type!r}, timestamp={self.timestamp!r})"
+
+class ExecutionHistory:
+    """
+    SQLite-backed execution history of the continuous loop.
+    
+    New entries are buffered and written in batches with executemany. Reads
+    merge the database with the pending buffer, so callers always see every
+    recorded entry. File databases use WAL journaling, which keeps appends
+    cheap and lets an interrupted run be inspected or resumed later.
+    """
+    
+    def __init__(self, db_path: str = ":memory:", batch_size: int = 10):
+        """
+        Initialize the execution history store.
+        
+        Args:
+            db_path: Path of the SQLite database file (default: in-memory
+                database, which does not survive the process)
+            batch_size: Number of pending entries that triggers a flush
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._pending: List[HistoryEntry] = []
+        # Database rows of the pending entries, encoded when they are recorded
+        self._pending_rows: List[tuple] = []
+        self._lock = threading.Lock()
+        
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "id INTEGER PRIMARY KEY, type TEXT NOT NULL, content BLOB, preview TEXT, ts REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS history_type ON history (type)")
+        self._conn.commit()
+    
+    @staticmethod
+    def _encode(entry: HistoryEntry) -> tuple:
+        """Serialize an entry into a database row."""
+        content = entry.content
+        if isinstance(content, CompressedContent):
+            return (entry.type, _COMPRESSED_MARKER + content.data, content.preview, entry.timestamp)
+        return (entry.type, json.dumps(content).encode("utf-8"), None, entry.timestamp)
+    
+    @staticmethod
+    def _decode(row: tuple) -> HistoryEntry:
+        """Build a history entry from a database row."""
+        entry_type, content, preview, timestamp = row
+        if content.startswith(_COMPRESSED_MARKER):
+            content = CompressedContent(content[len(_COMPRESSED_MARKER):], preview)
+        else:
+            content = json.loads(content)
+        return HistoryEntry(sys.intern(entry_type), content, timestamp)
+    
+    def append(self, entry: HistoryEntry) -> None:
+        """
+        Record a history entry.
+        
+        The entry is serialized right away, so content that cannot be stored
+        fails here instead of making every later flush fail.
+        
+        Args:
+            entry: The entry to record
+            
+        Raises:
+            TypeError: If the content is not JSON-serializable
+        """
+        row = self._encode(entry)
+        with self._lock:
+            self._pending.append(entry)
+            self._pending_rows.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+    
+    def flush(self) -> None:
+        """Write all pending entries to the database."""
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        """Write pending entries; the caller must hold the lock."""
+        if not self._pending:
+            return
+        
+        self._conn.executemany(
+            "INSERT INTO history (type, content, preview, ts) VALUES (?, ?, ?, ?)",
+            self._pending_rows
+        )
+        self._conn.commit()
+        self._pending = []
+        self._pending_rows = []
+    
+    def recent(self, limit: int) -> List[HistoryEntry]:
+        """
+        Get the most recent entries, oldest first.
+        
+        Args:
+            limit: Maximum number of entries to return
+        
+        Returns:
+            List of up to ``limit`` most recent entries
+        """
+        with self._lock:
+            pending = self._pending[-limit:]
+            remaining = limit - len(pending)
+            stored = []
+            if remaining > 0:
+                rows = self._conn.execute(
+                    "SELECT type, content, preview, ts FROM history ORDER BY id DESC LIMIT ?",
+                    (remaining,)
+                ).fetchall()
+                stored = [self._decode(row) for row in reversed(rows)]
+            return stored + pending
+    
+    def last_of_type(self, entry_type: str) -> Optional[HistoryEntry]:
+        """
+        Get the most recent entry of a given type.
+        
+        Args:
+            entry_type: The entry type to look for
+        
+        Returns:
+            The most recent matching entry, or None if there is none
+        """
+        with self._lock:
+            for entry in reversed(self._pending):
+                if entry.type == entry_type:
+                    return entry
+            
+            row = self._conn.execute(
+                "SELECT type, content, preview, ts FROM history WHERE type = ? ORDER BY id DESC LIMIT 1",
+                (entry_type,)
+            ).fetchone()
+            return self._decode(row) if row else None
+    
+    def clear(self) -> None:
+        """Remove all entries from the history."""
+        with self._lock:
+            self._pending = []
+            self._pending_rows = []
+            self._conn.execute("DELETE FROM history")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Flush pending entries and close the database connection."""
+        self.flush()
+        self._conn.close()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+            return stored + len(self._pending)
+    
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute("SELECT type, content, preview, ts FROM history ORDER BY id").fetchall()
+        return (self._decode(row) for row in rows)
@@ -0,0 +1,323 @@
+"""
+LLM response caching for the Syntient AI Assistant Platform.
+
+This module caches completions of deterministic (temperature 0) LLM calls so
+that repeated requests are answered without a network round-trip. Responses
+are stored in a pluggable backend: in memory, on disk, or in Redis.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class MemoryBackend:
+    """
+    In-process LRU cache backend with per-entry expiry.
+    
+    Responses are stored serialized, like in the other backends, so callers
+    changing a response they stored or got back never alter the cached entry.
+    """
+    
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the memory backend.
+        
+        Args:
+            max_entries: Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            response, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+        return json.loads(response)
+    
+    def set(self, key: str, response: Dict[str, Any], ttl: float) -> None:
+        """
+        Cache a response.
+        
+        Args:
+            key: Cache key
+            response: Response to cache
+            ttl: Time-to-live in seconds
+        """
+        data = json.dumps(response)
+        with self._lock:
+            self._entries[key] = (data, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+class FileBackend:
+    """
+    Cache backend storing one JSON file per response in a directory.
+    """
+    
+    def __init__(self, directory: str):
+        """
+        Initialize the file backend.
+        
+        Args:
+            directory: Directory for the cache files (created if missing)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if entry.get("expires_at", 0) <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        
+        return entry.get("response")
+    
+    def set(self, key: str, response: Dict[str, Any], ttl: float) -> None:
+        """
+        Cache a response.
+        
+        Args:
+            key: Cache key
+            response: Response to cache
+            ttl: Time-to-live in seconds
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"response": response, "expires_at": time.time() + ttl}, f)
+        
+        # Replace atomically so concurrent readers never see a partial file
+        os.replace(tmp_path, path)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+class RedisBackend:
+    """
+    Cache backend storing responses in Redis, shared between processes.
+    """
+    
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "syntient:llm:", client=None):
+        """
+        Initialize the Redis backend.
+        
+        Args:
+            url: Redis connection URL (ignored if client is given)
+            prefix: Prefix for the cache keys
+            client: Optional existing Redis client
+        """
+        if client is None:
+            if redis is None:
+                raise ImportError("The redis package is required for RedisBackend")
+            client = redis.Redis.from_url(url)
+        
+        self.client = client
+        self.prefix = prefix
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The cached response, or None if missing
+        """
+        data = self.client.get(self.prefix + key)
+        if data is None:
+            return None
+        return json.loads(data)
+    
+    def set(self, key: str, response: Dict[str, Any], ttl: float) -> None:
+        """
+        Cache a response.
+        
+        Args:
+            key: Cache key
+            response: Response to cache
+            ttl: Time-to-live in seconds
+        """
+        self.client.set(self.prefix + key, json.dumps(response), ex=max(1, int(ttl)))
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+class LLMCache:
+    """
+    Cache for deterministic LLM completions.
+    
+    Only calls made at temperature 0 are cached, since sampled completions
+    are expected to differ between calls.
+    """
+    
+    def __init__(self, backend=None, ttl_seconds: float = 3600, enabled: bool = True):
+        """
+        Initialize the LLM cache.
+        
+        Args:
+            backend: Storage backend (default: a new MemoryBackend)
+            ttl_seconds: Time-to-live of cached responses in seconds
+            enabled: Whether caching is enabled
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl_seconds
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0}
+    
+    def cache_key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        tools: Optional[Any] = None,
+        **params
+    ) -> Optional[str]:
+        """
+        Compute the cache key of a completion request.
+        
+        Args:
+            model: Model identifier, including the provider
+            messages: List of message dictionaries
+            temperature: Sampling temperature
+            tools: Optional tool definitions sent with the request
+            **params: Any other request parameters that affect the response
+        
+        Returns:
+            Hex-encoded SHA-256 key, or None if the request is not cacheable
+        """
+        if not self.enabled or temperature > 0:
+            return None
+        
+        try:
+            serialized = json.dumps({
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "tools": tools,
+                "params": params
+            }, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            # Parameters that cannot be serialized cannot be keyed reliably
+            return None
+        
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from cache_key
+        
+        Returns:
+            The cached response, or None on a miss
+        """
+        if key is None:
+            return None
+        
+        try:
+            response = self.backend.get(key)
+        except Exception as e:
+            logger.warning("LLM cache lookup failed: %s", e)
+            response = None
+        
+        if response is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+            logger.debug("LLM cache hit (hit rate %.1f%%)", 100 * self.hit_rate)
+        return response
+    
+    def set(self, key: Optional[str], response: Dict[str, Any]) -> None:
+        """
+        Cache a response.
+        
+        Args:
+            key: Cache key from cache_key
+            response: Response to cache
+        """
+        if key is None:
+            return
+        
+        try:
+            self.backend.set(key, response, self.ttl)
+        except Exception as e:
+            logger.warning("LLM cache store failed: %s", e)
+    
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were answered from the cache."""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+    
+    def clear(self) -> None:
+        """Remove all cached responses and reset the statistics."""
+        self.backend.clear()
+        self.stats = {"hits": 0, "misses": 0}
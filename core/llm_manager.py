@@ -7,19 +7,295 @@ allowing easy switching between OpenAI, Claude, Mistral, Ollama, and others.
 
 import os
 import json
+import functools
 import time
+import random
+import asyncio
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Union
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Any, Optional, Union, Callable, Tuple, Iterator, AsyncIterator, Sequence
+
+from .llm_cache import LLMCache
+from .rate_limiter import RateLimiter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # HTTP/2 support for httpx
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Connection pool defaults for provider sessions
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 64
+
+# (connect, read) timeout in seconds for completion requests
+REQUEST_TIMEOUT = (5, 120)
+
+# Timeout in seconds of the request that pre-warms a provider connection
+PREWARM_TIMEOUT = 5
+
+# Number of retries for failed completion requests
+MAX_RETRIES = 3
+
+# Exponential backoff between retries: base delay and cap in seconds
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_CAP = 30.0
+
+# Client error status codes worth retrying (timeouts and rate limiting);
+# server errors are always retried
+_RETRYABLE_STATUS_CODES = frozenset({408, 429})
+
+# How long Ollama keeps a model loaded after a request that has a session_id
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Seconds for which the model list fetched from an Ollama server is reused
+OLLAMA_MODELS_TTL = 60
+
+# Timeout in seconds of the Ollama model list request
+OLLAMA_TAGS_TIMEOUT = 2
+
+# Consecutive model list failures after which the Ollama server is assumed
+# down, and the seconds for which the request is then skipped
+OLLAMA_TAGS_MAX_FAILURES = 3
+OLLAMA_TAGS_COOLDOWN = 30
+
+# Known models of the providers without a model list endpoint in use
+_OPENAI_MODELS = (
+    "gpt-3.5-turbo",
+    "gpt-3.5-turbo-16k",
+    "gpt-4",
+    "gpt-4-turbo",
+    "gpt-4-32k"
+)
+
+_ANTHROPIC_MODELS = (
+    "claude-3-opus-20240229",
+    "claude-3-sonnet-20240229",
+    "claude-3-haiku-20240307",
+    "claude-2.1",
+    "claude-2.0"
+)
+
+_MISTRAL_MODELS = (
+    "mistral-tiny",
+    "mistral-small",
+    "mistral-medium",
+    "mistral-large-latest"
+)
+
+# Models assumed to be available when an Ollama server cannot be reached
+_OLLAMA_DEFAULT_MODELS = (
+    "llama3",
+    "llama3:8b",
+    "llama3:70b",
+    "mistral",
+    "mixtral",
+    "phi3"
+)
+
+# Rough number of characters per token, used to estimate request sizes
+_CHARS_PER_TOKEN = 4
+
+# Default number of concurrent requests when a batch is fanned out
+DEFAULT_BATCH_CONCURRENCY = 8
+
+# Seconds between status checks of a provider-side batch job
+BATCH_POLL_INTERVAL = 30.0
+
+# Errors raised by the synchronous HTTP transports
+_TRANSPORT_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+# Request parameters handled by the providers rather than sent as-is
+_RESERVED_PARAMS = frozenset({"model", "session_id"})
+
+# Message roles accepted in the Anthropic messages list
+_ANTHROPIC_ROLES = frozenset({"user", "assistant"})
+
+# Ollama chat parameters that go at the top level of the request; any other
+# parameter is a model option
+_OLLAMA_TOP_LEVEL_PARAMS = frozenset({"format", "keep_alive", "tools", "think"})
+
+def _create_session(headers: Dict[str, str], pool_connections: int, pool_maxsize: int) -> requests.Session:
+    """
+    Create a pooled HTTP session for a provider.
+    
+    The session keeps connections alive between requests, so consecutive
+    completions reuse an open TCP/TLS connection instead of handshaking again.
+    
+    Args:
+        headers: Headers sent with every request
+        pool_connections: Number of connection pools to cache
+        pool_maxsize: Maximum number of connections kept per pool
+    
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers)
+    return session
+
+def _create_http2_client(
+    headers: Dict[str, str],
+    pool_connections: int,
+    pool_maxsize: int,
+    timeout: Tuple[float, float] = REQUEST_TIMEOUT
+) -> "httpx.Client":
+    """
+    Create a pooled HTTP/2 client for a provider.
+    
+    HTTP/2 multiplexes concurrent requests over a single connection, so
+    parallel completions need far fewer sockets and TLS handshakes.
+    
+    Args:
+        headers: Headers sent with every request
+        pool_connections: Maximum number of idle connections kept alive
+        pool_maxsize: Maximum number of connections
+        timeout: (connect, read) timeout in seconds
+    
+    Returns:
+        Configured httpx client
+    """
+    return httpx.Client(
+        headers=headers,
+        http2=True,
+        limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_connections),
+        timeout=httpx.Timeout(timeout[1], connect=timeout[0])
+    )
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Compute the delay before a retry.
+    
+    Uses capped exponential backoff with jitter so that clients failing at the
+    same time do not retry in lockstep. A Retry-After header from the server
+    takes precedence.
+    
+    Args:
+        attempt: Number of the retry, starting at 0
+        retry_after: Value of the Retry-After response header, if any
+    
+    Returns:
+        Delay in seconds
+    """
+    if retry_after:
+        try:
+            return min(RETRY_BACKOFF_CAP, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                return min(RETRY_BACKOFF_CAP, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                pass
+    
+    delay = RETRY_BACKOFF_BASE * (2 ** attempt) * (0.5 + random.random())
+    return min(RETRY_BACKOFF_CAP, delay)
+
+def _is_retryable_status(status_code: Optional[int]) -> bool:
+    """
+    Check whether a failed request with the given status code should be retried.
+    
+    Args:
+        status_code: HTTP status code, or None if no response was received
+    
+    Returns:
+        True for connection errors, rate limiting and server errors
+    """
+    return status_code is None or status_code in _RETRYABLE_STATUS_CODES or status_code >= 500
+
+def _dumps(payload: Any) -> bytes:
+    """
+    Serialize a request payload to JSON bytes.
+    
+    Uses orjson when it is installed and falls back to the standard library.
+    
+    Args:
+        payload: The payload to serialize
+    
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize a JSON response body or stream line.
+    
+    Args:
+        data: JSON text
+    
+    Returns:
+        The decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _as_list(value: Optional[Union[str, List[str]]]) -> List[str]:
+    """
+    Normalize a single value or a list of values to a list.
+    
+    Args:
+        value: None, a single value or a list of values
+    
+    Returns:
+        List of the non-empty values
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [item for item in value if item]
+
+async def _aiter_in_thread(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterator from async code, one item per worker thread call.
+    
+    Args:
+        iterator: Blocking iterator
+    
+    Yields:
+        The iterator's items
+    """
+    done = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+def _prewarm_connection(session: requests.Session, url: str) -> None:
+    """
+    Open a pooled connection to a URL so later requests skip the handshake.
+    
+    Args:
+        session: Session whose connection pool should be warmed
+        url: URL of the endpoint
+    """
+    try:
+        session.head(url, timeout=PREWARM_TIMEOUT)
+    except Exception as e:
+        logger.debug("Pre-warming connection to %s failed: %s", url, e)
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -34,84 +310,691 @@ class LLMProvider(ABC):
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        stream: bool = False,
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, str]]]:
         """
         Generate a completion from the LLM.
         
+        Passing a session_id keyword argument marks the call as part of a
+        conversation, letting providers that support prompt caching reuse the
+        processed prefix of earlier requests. Caching only applies to an
+        identical prefix, so stable content (system prompt, instructions,
+        earlier turns) should come first and new content last.
+        
         Args:
             messages: List of message dictionaries
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens in the response
+            stream: Return an iterator of {"delta": text} chunks as they are
+                generated instead of the complete result
+            **kwargs: Additional provider-specific parameters, including the
+                optional session_id
+        
+        Returns:
+            Dictionary containing the completion result, or an iterator of
+            text chunks if stream is True
+        """
+        pass
+    
+    def generate_batch(
+        self,
+        batch: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        requests_per_minute: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        native: bool = True,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate completions for a batch of independent conversations.
+        
+        Providers with a batch API use it when native is True; otherwise the
+        completions are requested concurrently, see agenerate_batch. This
+        method runs its own event loop, so async callers should await
+        agenerate_batch instead.
+        
+        Args:
+            batch: List of message lists, one per completion
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in each response
+            max_concurrency: Maximum number of requests in flight
+            requests_per_minute: Optional limit on the request rate
+            on_progress: Optional callback receiving (completed, total)
+            native: Use the provider's batch API if it has one
+            **kwargs: Additional provider-specific parameters
+        
+        Returns:
+            Completion results in batch order; failed entries are dictionaries
+            with an "error" key
+        """
+        async def run_batch():
+            try:
+                return await self.agenerate_batch(
+                    batch, temperature, max_tokens, max_concurrency, requests_per_minute, on_progress, **kwargs
+                )
+            finally:
+                # The async client is bound to this event loop
+                if isinstance(self, AsyncLLMProvider):
+                    await self.aclose()
+        
+        return asyncio.run(run_batch())
+    
+    async def agenerate_batch(
+        self,
+        batch: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        requests_per_minute: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate completions for a batch concurrently on the running event loop.
+        
+        Args:
+            batch: List of message lists, one per completion
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in each response
+            max_concurrency: Maximum number of requests in flight
+            requests_per_minute: Optional limit on the request rate
+            on_progress: Optional callback receiving (completed, total)
             **kwargs: Additional provider-specific parameters
+        
+        Returns:
+            Completion results in batch order; failed entries are dictionaries
+            with an "error" key
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        pacing_lock = asyncio.Lock()
+        interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        next_start = loop.time()
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        completed = 0
+        
+        async def run(index: int, messages: List[Dict[str, str]]) -> None:
+            nonlocal next_start, completed
+            async with semaphore:
+                # Space out request starts to stay under the rate limit
+                if interval:
+                    async with pacing_lock:
+                        delay = next_start - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        next_start = max(next_start, loop.time()) + interval
+                
+                try:
+                    if isinstance(self, AsyncLLMProvider):
+                        results[index] = await self.agenerate_completion(messages, temperature, max_tokens, **kwargs)
+                    else:
+                        results[index] = await asyncio.to_thread(
+                            self.generate_completion, messages, temperature, max_tokens, **kwargs
+                        )
+                except Exception as e:
+                    results[index] = {"error": str(e)}
             
+            completed += 1
+            if on_progress:
+                on_progress(completed, len(batch))
+        
+        await asyncio.gather(*(run(index, messages) for index, messages in enumerate(batch)))
+        return results
+    
+    @abstractmethod
+    def get_available_models(self) -> Sequence[str]:
+        """
+        Get a list of available models from this provider.
+        
         Returns:
-            Dictionary containing the completion result
+            Sequence of model identifiers
         """
         pass
     
     @abstractmethod
-    def get_available_models(self) -> List[str]:
+    def get_provider_name(self) -> str:
         """
-        Get a list of available models from this provider.
+        Get the name of this provider.
         
         Returns:
-            List of model identifiers
+            Provider name
         """
         pass
+
+class _HTTPProviderBase(LLMProvider):
+    """
+    Base class for LLM providers that call a JSON completion endpoint over HTTP.
+    
+    Providers describe their requests through _build_payload and
+    _to_openai_format and set up their endpoints with _init_endpoints.
+    _request_with_retry sends a payload with capped, jittered exponential
+    backoff, so generate_completion only has to chain the three.
+    
+    A provider can have several endpoints (API keys and/or URLs). Each
+    request goes to the endpoint with the fewest requests in flight, which
+    spreads load across the combined rate limits. The first endpoint is also
+    exposed as api_url, headers and session.
+    """
+    
+    # (connect, read) timeout in seconds of the provider's requests
+    timeout = REQUEST_TIMEOUT
+    
+    def _make_headers(self, api_key: Optional[str]) -> Dict[str, str]:
+        """
+        Build the request headers for an endpoint.
+        
+        Args:
+            api_key: API key of the endpoint, if any
+        
+        Returns:
+            Request headers
+        """
+        return {"Content-Type": "application/json"}
+    
+    def _init_endpoints(
+        self,
+        api_keys: List[Optional[str]],
+        api_urls: List[str],
+        pool_connections: int,
+        pool_maxsize: int,
+        http2: bool = False,
+        timeout: Tuple[float, float] = REQUEST_TIMEOUT
+    ) -> None:
+        """
+        Set up the provider's endpoints, each with its own pooled session.
+        
+        Keys and URLs are paired up in order; a single key or URL is shared
+        by all endpoints.
+        
+        Args:
+            api_keys: API keys, or [None] for providers without authentication
+            api_urls: Completion endpoint URLs
+            pool_connections: Number of connection pools to cache per endpoint
+            pool_maxsize: Maximum number of pooled connections per endpoint
+            http2: Send completions over HTTP/2 with httpx instead of requests
+                (needs the httpx and h2 packages)
+            timeout: (connect, read) timeout in seconds
+        
+        Raises:
+            ValueError: If both lists have several entries of different lengths
+        """
+        if len(api_keys) > 1 and len(api_urls) > 1 and len(api_keys) != len(api_urls):
+            raise ValueError("The number of API keys and endpoint URLs must match")
+        
+        if http2 and (httpx is None or not _HTTP2_AVAILABLE):
+            logger.warning("HTTP/2 needs the httpx and h2 packages; falling back to HTTP/1.1")
+            http2 = False
+        
+        self.timeout = timeout
+        self.max_async_connections = pool_maxsize
+        self.max_async_keepalive = pool_connections
+        
+        self._endpoints = []
+        for index in range(max(len(api_keys), len(api_urls))):
+            headers = self._make_headers(api_keys[index % len(api_keys)])
+            if http2:
+                transport = _create_http2_client(headers, pool_connections, pool_maxsize, timeout)
+            else:
+                transport = _create_session(headers, pool_connections, pool_maxsize)
+            self._endpoints.append((api_urls[index % len(api_urls)], headers, transport))
+        
+        self._inflight = [0] * len(self._endpoints)
+        self._endpoint_lock = threading.Lock()
+        
+        self.api_url, self.headers, transport = self._endpoints[0]
+        
+        # Batch jobs and model lists always go through a requests session
+        self.session = _create_session(self.headers, pool_connections, pool_maxsize) if http2 else transport
+    
+    def close(self) -> None:
+        """Close the pooled connections of all endpoints (see aclose for the async client)."""
+        transports = [transport for _, _, transport in self._endpoints]
+        if self.session not in transports:
+            transports.append(self.session)
+        for transport in transports:
+            transport.close()
+    
+    def _acquire_endpoint(self) -> int:
+        """
+        Pick the endpoint with the fewest requests in flight and reserve it.
+        
+        Returns:
+            Index of the endpoint; pass it to _release_endpoint when done
+        """
+        with self._endpoint_lock:
+            index = min(range(len(self._inflight)), key=self._inflight.__getitem__)
+            self._inflight[index] += 1
+            return index
+    
+    def _release_endpoint(self, index: int) -> None:
+        """
+        Release an endpoint reserved by _acquire_endpoint.
+        
+        Args:
+            index: Index of the endpoint
+        """
+        with self._endpoint_lock:
+            self._inflight[index] -= 1
+    
+    @abstractmethod
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Build the request payload for a completion.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional provider-specific parameters
+        
+        Returns:
+            Request payload
+        """
+        pass
+    
+    def _to_openai_format(self, raw_response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a decoded API response to OpenAI format.
+        
+        Args:
+            raw_response: Decoded API response
+        
+        Returns:
+            Response in OpenAI chat completion format
+        """
+        return raw_response
+    
+    def _parse_stream_line(self, line: str) -> Optional[str]:
+        """
+        Extract the text delta from a line of a streamed response.
+        
+        The default handles OpenAI-style server-sent events.
+        
+        Args:
+            line: Non-empty line of the response body
+        
+        Returns:
+            Text delta, or None if the line carries no text
+        """
+        if not line.startswith("data:"):
+            return None
+        
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            return None
+        
+        choices = _loads(data).get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content") or None
+    
+    def _check_retry(self, attempt: int, error: Exception, response: Optional[Any]) -> float:
+        """
+        Decide whether a failed request is retried.
+        
+        Connection errors, timeouts, rate limiting and server errors are
+        retried up to MAX_RETRIES times; other errors are raised immediately.
+        
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+            error: The request error
+            response: The error response, or None if none was received
+        
+        Returns:
+            Delay in seconds before the next attempt
+        
+        Raises:
+            Exception: If the request should not be retried
+        """
+        status_code = response.status_code if response is not None else None
+        if not _is_retryable_status(status_code):
+            raise Exception(f"Failed to call {self.get_provider_name()} API: {str(error)}") from error
+        if attempt == MAX_RETRIES:
+            raise Exception(f"Failed to call {self.get_provider_name()} API after {MAX_RETRIES} retries: {str(error)}") from error
+        
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        return _retry_delay(attempt, retry_after)
+    
+    def _post_with_retry(self, payload: Dict[str, Any], stream: bool = False) -> Tuple[Any, int]:
+        """
+        Post a payload to the completion endpoint, retrying transient failures.
+        
+        Args:
+            payload: Request payload
+            stream: Leave the response body unread so it can be streamed
+        
+        Returns:
+            Tuple of the successful response and the index of its endpoint,
+            which the caller must pass to _release_endpoint
+        """
+        # Serialize once for all attempts; the session sends the JSON content type
+        body = _dumps(payload)
+        for attempt in range(MAX_RETRIES + 1):
+            index = self._acquire_endpoint()
+            url, _, transport = self._endpoints[index]
+            response = None
+            try:
+                if isinstance(transport, requests.Session):
+                    response = transport.post(url, data=body, timeout=self.timeout, stream=stream)
+                else:
+                    # HTTP/2 client, see _create_http2_client
+                    response = transport.send(transport.build_request("POST", url, content=body), stream=stream)
+                response.raise_for_status()
+                return response, index
+            except _TRANSPORT_ERRORS as e:
+                if stream and response is not None:
+                    response.close()
+                self._release_endpoint(index)
+                time.sleep(self._check_retry(attempt, e, getattr(e, "response", None)))
+    
+    def _request_with_retry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Post a payload to the completion endpoint, retrying transient failures.
+        
+        Args:
+            payload: Request payload
+        
+        Returns:
+            Decoded API response
+        """
+        response, index = self._post_with_retry(payload)
+        try:
+            return _loads(response.content)
+        finally:
+            self._release_endpoint(index)
+    
+    def _stream_with_retry(self, payload: Dict[str, Any]) -> Iterator[Dict[str, str]]:
+        """
+        Post a payload with streaming enabled and yield text deltas as they arrive.
+        
+        Failures before the response starts are retried; errors while reading
+        the stream are raised, since chunks may already have been consumed.
+        
+        Args:
+            payload: Request payload
+        
+        Yields:
+            Dictionaries of the form {"delta": text}
+        """
+        response, index = self._post_with_retry(dict(payload, stream=True), stream=True)
+        try:
+            if isinstance(response, requests.Response):
+                lines = response.iter_lines(decode_unicode=True)
+            else:
+                lines = response.iter_lines()
+            
+            for line in lines:
+                delta = self._parse_stream_line(line) if line else None
+                if delta:
+                    yield {"delta": delta}
+        except _TRANSPORT_ERRORS as e:
+            raise Exception(f"Failed to stream from {self.get_provider_name()} API: {str(e)}") from e
+        finally:
+            response.close()
+            self._release_endpoint(index)
+
+class AsyncLLMProvider(_HTTPProviderBase):
+    """
+    Base class for HTTP providers that support asynchronous completions.
+    
+    agenerate_completion sends the request built by _build_payload on a
+    shared httpx.AsyncClient, so many completions can be awaited concurrently
+    on a single event loop. Without httpx the synchronous generate_completion
+    runs in a worker thread instead.
+    """
+    
+    # Connection limits of the async client
+    max_async_connections = DEFAULT_POOL_MAXSIZE
+    max_async_keepalive = DEFAULT_POOL_CONNECTIONS
+    
+    # Async clients by event loop, with the async generators that close them
+    # (see _close_with_loop); a client can only be used on its own loop
+    _aclients: Optional[Dict[asyncio.AbstractEventLoop, Tuple["httpx.AsyncClient", AsyncIterator[None]]]] = None
+    
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """
+        Get the async client for the running event loop, creating it if needed.
+        
+        Every event loop gets its own client, which is closed when the loop
+        finishes (see _close_with_loop), so loops started by successive
+        asyncio.run calls do not leave connections open behind them.
+        
+        Returns:
+            The provider's httpx.AsyncClient
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclients is None:
+            self._aclients = {}
+        
+        entry = self._aclients.get(loop)
+        if entry is not None:
+            return entry[0]
+        
+        # Forget the clients of loops that were closed without finishing them
+        for closed_loop in [other for other in self._aclients if other.is_closed()]:
+            del self._aclients[closed_loop]
+        
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_async_connections,
+                max_keepalive_connections=self.max_async_keepalive
+            ),
+            timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+            http2=_HTTP2_AVAILABLE
+        )
+        self._aclients[loop] = (client, self._close_with_loop(loop, client))
+        return client
+    
+    def _close_with_loop(self, loop: asyncio.AbstractEventLoop, client: "httpx.AsyncClient") -> AsyncIterator[None]:
+        """
+        Arrange for an async client to be closed when its event loop finishes.
+        
+        Event loops finalize their unfinished async generators on shutdown,
+        while they can still run coroutines: asyncio.run does so before closing
+        the loop. The returned generator is started on the loop and closes the
+        client when it is finalized.
+        
+        Args:
+            loop: The running event loop
+            client: The client created for the loop
+        
+        Returns:
+            The started async generator; the caller must keep a reference to it,
+            since the loop only tracks it weakly
+        """
+        async def close_on_shutdown():
+            try:
+                yield
+            finally:
+                if self._aclients and self._aclients.get(loop, (None,))[0] is client:
+                    del self._aclients[loop]
+                await client.aclose()
+        
+        guard = close_on_shutdown()
+        # Run the generator up to its yield right away; its first step
+        # registers it with the loop's async generator hooks
+        try:
+            guard.asend(None).send(None)
+        except StopIteration:
+            pass
+        return guard
+    
+    async def agenerate_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate a completion from the LLM.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional provider-specific parameters
+        
+        Returns:
+            Dictionary containing the completion result (in OpenAI format)
+        """
+        if httpx is None:
+            return await asyncio.to_thread(self.generate_completion, messages, temperature, max_tokens, **kwargs)
+        
+        body = _dumps(self._build_payload(messages, temperature, max_tokens, **kwargs))
+        client = self._get_async_client()
+        
+        for attempt in range(MAX_RETRIES + 1):
+            index = self._acquire_endpoint()
+            url, headers, _ = self._endpoints[index]
+            try:
+                response = await client.post(url, headers=headers, content=body)
+                response.raise_for_status()
+                return self._to_openai_format(_loads(response.content))
+            except httpx.HTTPError as e:
+                response = e.response if isinstance(e, httpx.HTTPStatusError) else None
+                delay = self._check_retry(attempt, e, response)
+            finally:
+                self._release_endpoint(index)
+            
+            await asyncio.sleep(delay)
     
-    @abstractmethod
-    def get_provider_name(self) -> str:
+    async def astream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, str]]:
         """
-        Get the name of this provider.
+        Asynchronously stream a completion from the LLM.
         
-        Returns:
-            Provider name
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional provider-specific parameters
+        
+        Yields:
+            Dictionaries of the form {"delta": text}
         """
-        pass
+        if httpx is None:
+            async for chunk in _aiter_in_thread(
+                self.generate_completion(messages, temperature, max_tokens, stream=True, **kwargs)
+            ):
+                yield chunk
+            return
+        
+        body = _dumps(dict(self._build_payload(messages, temperature, max_tokens, **kwargs), stream=True))
+        client = self._get_async_client()
+        
+        for attempt in range(MAX_RETRIES + 1):
+            index = self._acquire_endpoint()
+            url, headers, _ = self._endpoints[index]
+            started = False
+            try:
+                async with client.stream("POST", url, headers=headers, content=body) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        delta = self._parse_stream_line(line) if line else None
+                        if delta:
+                            started = True
+                            yield {"delta": delta}
+                return
+            except httpx.HTTPError as e:
+                # Chunks already yielded cannot be taken back, so only retry
+                # failures before the first one
+                if started:
+                    raise Exception(f"Failed to stream from {self.get_provider_name()} API: {str(e)}") from e
+                response = e.response if isinstance(e, httpx.HTTPStatusError) else None
+                delay = self._check_retry(attempt, e, response)
+            finally:
+                self._release_endpoint(index)
+            
+            await asyncio.sleep(delay)
+    
+    async def aclose(self) -> None:
+        """Close the async client of the running event loop, if one was created."""
+        entry = self._aclients.pop(asyncio.get_running_loop(), None) if self._aclients else None
+        if entry is not None:
+            # Finalizing the guard closes the client
+            await entry[1].aclose()
 
-class OpenAIProvider(LLMProvider):
+class OpenAIProvider(AsyncLLMProvider):
     """
     OpenAI API provider implementation.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: Optional[Union[str, List[str]]] = None, model: str = "gpt-3.5-turbo",
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 api_url: Optional[Union[str, List[str]]] = None, http2: bool = False,
+                 connect_timeout: float = REQUEST_TIMEOUT[0], read_timeout: float = REQUEST_TIMEOUT[1]):
         """
         Initialize the OpenAI provider.
         
         Args:
-            api_key: OpenAI API key (defaults to environment variable)
+            api_key: OpenAI API key, or a list of keys to balance requests
+                across (defaults to environment variable)
             model: Model to use for completions (default: gpt-3.5-turbo)
+            pool_connections: Number of connection pools to cache
+            pool_maxsize: Maximum number of pooled connections
+            api_url: Completion endpoint URL, or a list of URLs to balance
+                requests across (default: https://api.openai.com/v1/chat/completions)
+            http2: Send completions over HTTP/2 (needs the httpx and h2 packages)
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Timeout in seconds for the response to arrive
         """
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not self.api_key:
+        api_keys = _as_list(api_key) or _as_list(os.getenv("OPENAI_API_KEY"))
+        if not api_keys:
             raise ValueError("OpenAI API key is required. Set it in .env or pass to constructor.")
         
+        self.api_key = api_keys[0]
         self.model = model
-        self.api_url = "https://api.openai.com/v1/chat/completions"
-        self.headers = {
+        self.api_base = "https://api.openai.com/v1"
+        self._init_endpoints(api_keys, _as_list(api_url) or [f"{self.api_base}/chat/completions"], pool_connections, pool_maxsize, http2,
+                             timeout=(connect_timeout, read_timeout))
+    
+    def _make_headers(self, api_key: Optional[str]) -> Dict[str, str]:
+        """
+        Build the request headers for an endpoint.
+        
+        Args:
+            api_key: API key of the endpoint
+        
+        Returns:
+            Request headers
+        """
+        return {
             "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
+            "Authorization": f"Bearer {api_key}"
         }
     
-    def generate_completion(
+    def _build_payload(
         self,
         messages: List[Dict[str, str]],
-        temperature: float = 0.7,
-        max_tokens: int = 1000,
+        temperature: float,
+        max_tokens: int,
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Generate a completion from the OpenAI API.
+        Build the request payload for a completion.
         
         Args:
             messages: List of message dictionaries
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens in the response
-            **kwargs: Additional OpenAI-specific parameters
-            
+            **kwargs: Additional provider-specific parameters
+        
         Returns:
-            Dictionary containing the completion result
+            Request payload
         """
         payload = {
             "model": kwargs.get("model", self.model),
@@ -120,55 +1003,159 @@ class OpenAIProvider(LLMProvider):
             "max_tokens": max_tokens
         }
         
-        # Add any additional parameters
-        for key, value in kwargs.items():
-            if key not in ["model"]:  # Skip parameters that are already set
-                payload[key] = value
+        # Add any additional parameters (skipping those handled above)
+        if kwargs:
+            payload.update({key: value for key, value in kwargs.items() if key not in _RESERVED_PARAMS})
+        
+        # Route requests of the same conversation to the same prompt cache
+        if kwargs.get("session_id"):
+            payload["prompt_cache_key"] = kwargs["session_id"]
+        
+        return payload
+    
+    def generate_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        stream: bool = False,
+        **kwargs
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, str]]]:
+        """
+        Generate a completion from the OpenAI API.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            stream: Return an iterator of {"delta": text} chunks instead
+            **kwargs: Additional OpenAI-specific parameters
+        
+        Returns:
+            Dictionary containing the completion result, or an
+            iterator of text chunks if stream is True
+        """
+        payload = self._build_payload(messages, temperature, max_tokens, **kwargs)
+        if stream:
+            return self._stream_with_retry(payload)
+        return self._request_with_retry(payload)
+    
+    def generate_batch(
+        self,
+        batch: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        requests_per_minute: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        native: bool = True,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate completions for a batch using the OpenAI Batch API.
+        
+        The requests are uploaded as a JSONL file and processed as a batch
+        job at reduced cost. This blocks until the job finishes, which can
+        take up to the 24 hour completion window. With native=False the
+        completions are requested concurrently instead.
+        
+        Args:
+            batch: List of message lists, one per completion
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in each response
+            max_concurrency: Maximum number of requests in flight (native=False)
+            requests_per_minute: Optional limit on the request rate (native=False)
+            on_progress: Optional callback receiving (completed, total)
+            native: Use the Batch API
+            **kwargs: Additional OpenAI-specific parameters
+        
+        Returns:
+            Completion results in batch order; failed entries are dictionaries
+            with an "error" key
+        """
+        if not native or not batch:
+            return super().generate_batch(
+                batch, temperature, max_tokens, max_concurrency, requests_per_minute, on_progress, native=False, **kwargs
+            )
+        
+        lines = [
+            json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_payload(messages, temperature, max_tokens, **kwargs)
+            })
+            for index, messages in enumerate(batch)
+        ]
         
         try:
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
+            # Upload the requests; the multipart body sets its own content type
+            response = self.session.post(
+                f"{self.api_base}/files",
+                files={"file": ("batch.jsonl", "\n".join(lines).encode("utf-8"))},
+                data={"purpose": "batch"},
+                headers={"Content-Type": None},
+                timeout=self.timeout
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            # Implement retry logic
-            retry_count = 0
-            max_retries = 3
-            while retry_count < max_retries:
-                try:
-                    time.sleep(2 ** retry_count)  # Exponential backoff
-                    response = requests.post(
-                        self.api_url,
-                        headers=self.headers,
-                        json=payload
-                    )
-                    response.raise_for_status()
-                    return response.json()
-                except requests.exceptions.RequestException:
-                    retry_count += 1
             
-            # If all retries fail, raise the exception
-            raise Exception(f"Failed to call OpenAI API after {max_retries} retries: {str(e)}")
+            response = self.session.post(
+                f"{self.api_base}/batches",
+                json={
+                    "input_file_id": response.json()["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h"
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            batch_job = response.json()
+            
+            # Wait for the job to finish
+            while batch_job["status"] not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(BATCH_POLL_INTERVAL)
+                response = self.session.get(f"{self.api_base}/batches/{batch_job['id']}", timeout=self.timeout)
+                response.raise_for_status()
+                batch_job = response.json()
+                
+                if on_progress:
+                    counts = batch_job.get("request_counts") or {}
+                    on_progress(counts.get("completed", 0) + counts.get("failed", 0), len(batch))
+            
+            results = [{"error": f"No result returned (batch {batch_job['status']})"} for _ in batch]
+            
+            # Collect successful results and per-request errors
+            for file_key in ("output_file_id", "error_file_id"):
+                file_id = batch_job.get(file_key)
+                if not file_id:
+                    continue
+                
+                response = self.session.get(f"{self.api_base}/files/{file_id}/content", timeout=self.timeout)
+                response.raise_for_status()
+                
+                for line in response.text.splitlines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    result = item.get("response") or {}
+                    if result.get("status_code") == 200:
+                        results[int(item["custom_id"])] = result["body"]
+                    else:
+                        results[int(item["custom_id"])] = {"error": str(item.get("error") or result.get("body"))}
+            
+            return results
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Failed to run OpenAI batch: {str(e)}") from e
     
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Sequence[str]:
         """
         Get a list of available models from OpenAI.
         
         Returns:
-            List of model identifiers
+            Tuple of model identifiers
         """
         # This is a simplified implementation
-        # In a real implementation, this would call the OpenAI API to get the list of models
-        return [
-            "gpt-3.5-turbo",
-            "gpt-3.5-turbo-16k",
-            "gpt-4",
-            "gpt-4-turbo",
-            "gpt-4-32k"
-        ]
+        return _OPENAI_MODELS
     
     def get_provider_name(self) -> str:
         """
@@ -179,64 +1166,84 @@ class OpenAIProvider(LLMProvider):
         """
         return "OpenAI"
 
-class AnthropicProvider(LLMProvider):
+class AnthropicProvider(AsyncLLMProvider):
     """
     Anthropic Claude API provider implementation.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-opus-20240229"):
+    def __init__(self, api_key: Optional[Union[str, List[str]]] = None, model: str = "claude-3-opus-20240229",
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 api_url: Optional[Union[str, List[str]]] = None, http2: bool = False,
+                 connect_timeout: float = REQUEST_TIMEOUT[0], read_timeout: float = REQUEST_TIMEOUT[1]):
         """
         Initialize the Anthropic provider.
         
         Args:
-            api_key: Anthropic API key (defaults to environment variable)
+            api_key: Anthropic API key, or a list of keys to balance requests
+                across (defaults to environment variable)
             model: Model to use for completions (default: claude-3-opus-20240229)
+            pool_connections: Number of connection pools to cache
+            pool_maxsize: Maximum number of pooled connections
+            api_url: Completion endpoint URL, or a list of URLs to balance
+                requests across (default: https://api.anthropic.com/v1/messages)
+            http2: Send completions over HTTP/2 (needs the httpx and h2 packages)
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Timeout in seconds for the response to arrive
         """
-        self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
-        if not self.api_key:
+        api_keys = _as_list(api_key) or _as_list(os.getenv("ANTHROPIC_API_KEY"))
+        if not api_keys:
             raise ValueError("Anthropic API key is required. Set it in .env or pass to constructor.")
         
+        self.api_key = api_keys[0]
         self.model = model
-        self.api_url = "https://api.anthropic.com/v1/messages"
-        self.headers = {
+        self._init_endpoints(api_keys, _as_list(api_url) or ["https://api.anthropic.com/v1/messages"], pool_connections, pool_maxsize, http2,
+                             timeout=(connect_timeout, read_timeout))
+        self.batches_url = f"{self.api_url}/batches"
+    
+    def _make_headers(self, api_key: Optional[str]) -> Dict[str, str]:
+        """
+        Build the request headers for an endpoint.
+        
+        Args:
+            api_key: API key of the endpoint
+        
+        Returns:
+            Request headers
+        """
+        return {
             "Content-Type": "application/json",
-            "x-api-key": self.api_key,
+            "x-api-key": api_key,
             "anthropic-version": "2023-06-01"
         }
     
-    def generate_completion(
+    def _build_payload(
         self,
         messages: List[Dict[str, str]],
-        temperature: float = 0.7,
-        max_tokens: int = 1000,
+        temperature: float,
+        max_tokens: int,
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Generate a completion from the Anthropic Claude API.
+        Build the request payload for a completion.
         
         Args:
-            messages: List of message dictionaries (OpenAI format)
+            messages: List of message dictionaries
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens in the response
-            **kwargs: Additional Anthropic-specific parameters
-            
+            **kwargs: Additional provider-specific parameters
+        
         Returns:
-            Dictionary containing the completion result (converted to OpenAI format)
+            Request payload
         """
-        # Convert OpenAI format messages to Anthropic format
-        system_prompt = None
-        anthropic_messages = []
-        
-        for message in messages:
-            role = message["role"]
-            content = message["content"]
-            
-            if role == "system":
-                system_prompt = content
-            elif role == "user":
-                anthropic_messages.append({"role": "user", "content": content})
-            elif role == "assistant":
-                anthropic_messages.append({"role": "assistant", "content": content})
+        # Convert OpenAI format messages to Anthropic format: the (last) system
+        # prompt is sent separately, and user/assistant messages that only
+        # have a role and content are passed through without copying
+        system_prompt = next((message["content"] for message in reversed(messages) if message["role"] == "system"), None)
+        anthropic_messages = [
+            message if len(message) == 2 else {"role": message["role"], "content": message["content"]}
+            for message in messages
+            if message["role"] in _ANTHROPIC_ROLES
+        ]
         
         payload = {
             "model": kwargs.get("model", self.model),
@@ -249,96 +1256,186 @@ class AnthropicProvider(LLMProvider):
         if system_prompt:
             payload["system"] = system_prompt
         
-        # Add any additional parameters
-        for key, value in kwargs.items():
-            if key not in ["model"]:  # Skip parameters that are already set
-                payload[key] = value
+        # Add any additional parameters (skipping those handled above)
+        if kwargs:
+            payload.update({key: value for key, value in kwargs.items() if key not in _RESERVED_PARAMS})
         
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
+        # Mark the system prompt and the conversation so far as cacheable, so
+        # the next turn of the session reuses the processed prefix
+        if kwargs.get("session_id"):
+            if system_prompt:
+                payload["system"] = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+            if anthropic_messages and isinstance(anthropic_messages[-1]["content"], str):
+                last_message = anthropic_messages[-1]
+                anthropic_messages[-1] = {
+                    "role": last_message["role"],
+                    "content": [{"type": "text", "text": last_message["content"], "cache_control": {"type": "ephemeral"}}]
+                }
+        
+        return payload
+    
+    def _to_openai_format(self, anthropic_response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert an Anthropic Messages API response to OpenAI format.
+        
+        Args:
+            anthropic_response: Decoded API response
+        
+        Returns:
+            Response in OpenAI chat completion format
+        """
+        created = int(time.time())
+        openai_format_response = {
+            "id": anthropic_response.get("id", ""),
+            "object": "chat.completion",
+            "created": created,
+            "model": anthropic_response.get("model", self.model),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": anthropic_response.get("content", [{"text": ""}])[0]["text"]
+                    },
+                    "finish_reason": anthropic_response.get("stop_reason", "stop")
+                }
+            ],
+            "usage": anthropic_response.get("usage", {})
+        }
+        
+        return openai_format_response
+    
+    def _parse_stream_line(self, line: str) -> Optional[str]:
+        """
+        Extract the text delta from a line of a streamed Anthropic response.
+        
+        Args:
+            line: Non-empty line of the response body
+        
+        Returns:
+            Text delta, or None if the line carries no text
+        """
+        if not line.startswith("data:"):
+            return None
+        
+        event = _loads(line[5:])
+        if event.get("type") != "content_block_delta":
+            return None
+        return event.get("delta", {}).get("text") or None
+    
+    def generate_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        stream: bool = False,
+        **kwargs
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, str]]]:
+        """
+        Generate a completion from the Anthropic Claude API.
+        
+        Args:
+            messages: List of message dictionaries (OpenAI format)
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            stream: Return an iterator of {"delta": text} chunks instead
+            **kwargs: Additional Anthropic-specific parameters
+        
+        Returns:
+            Dictionary containing the completion result (converted to OpenAI format), or an
+            iterator of text chunks if stream is True
+        """
+        payload = self._build_payload(messages, temperature, max_tokens, **kwargs)
+        if stream:
+            return self._stream_with_retry(payload)
+        return self._to_openai_format(self._request_with_retry(payload))
+    
+    def generate_batch(
+        self,
+        batch: List[List[Dict[str, str]]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        requests_per_minute: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        native: bool = True,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate completions for a batch using the Anthropic Message Batches API.
+        
+        This blocks until the batch has been processed, which can take up to
+        24 hours. With native=False the completions are requested
+        concurrently instead.
+        
+        Args:
+            batch: List of message lists, one per completion
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in each response
+            max_concurrency: Maximum number of requests in flight (native=False)
+            requests_per_minute: Optional limit on the request rate (native=False)
+            on_progress: Optional callback receiving (completed, total)
+            native: Use the Message Batches API
+            **kwargs: Additional Anthropic-specific parameters
+        
+        Returns:
+            Completion results in batch order (converted to OpenAI format);
+            failed entries are dictionaries with an "error" key
+        """
+        if not native or not batch:
+            return super().generate_batch(
+                batch, temperature, max_tokens, max_concurrency, requests_per_minute, on_progress, native=False, **kwargs
             )
+        
+        batch_requests = [
+            {"custom_id": str(index), "params": self._build_payload(messages, temperature, max_tokens, **kwargs)}
+            for index, messages in enumerate(batch)
+        ]
+        
+        try:
+            response = self.session.post(self.batches_url, json={"requests": batch_requests}, timeout=self.timeout)
             response.raise_for_status()
+            batch_job = response.json()
             
-            # Convert Anthropic response to OpenAI format
-            anthropic_response = response.json()
-            openai_format_response = {
-                "id": anthropic_response.get("id", ""),
-                "object": "chat.completion",
-                "created": int(time.time()),
-                "model": anthropic_response.get("model", self.model),
-                "choices": [
-                    {
-                        "index": 0,
-                        "message": {
-                            "role": "assistant",
-                            "content": anthropic_response.get("content", [{"text": ""}])[0]["text"]
-                        },
-                        "finish_reason": anthropic_response.get("stop_reason", "stop")
-                    }
-                ],
-                "usage": anthropic_response.get("usage", {})
-            }
+            # Wait for the batch to finish
+            while batch_job.get("processing_status") != "ended":
+                time.sleep(BATCH_POLL_INTERVAL)
+                response = self.session.get(f"{self.batches_url}/{batch_job['id']}", timeout=self.timeout)
+                response.raise_for_status()
+                batch_job = response.json()
+                
+                if on_progress:
+                    counts = batch_job.get("request_counts") or {}
+                    on_progress(sum(counts.get(key, 0) for key in ("succeeded", "errored", "canceled", "expired")), len(batch))
             
-            return openai_format_response
-        except requests.exceptions.RequestException as e:
-            # Implement retry logic
-            retry_count = 0
-            max_retries = 3
-            while retry_count < max_retries:
-                try:
-                    time.sleep(2 ** retry_count)  # Exponential backoff
-                    response = requests.post(
-                        self.api_url,
-                        headers=self.headers,
-                        json=payload
-                    )
-                    response.raise_for_status()
-                    
-                    # Convert Anthropic response to OpenAI format
-                    anthropic_response = response.json()
-                    openai_format_response = {
-                        "id": anthropic_response.get("id", ""),
-                        "object": "chat.completion",
-                        "created": int(time.time()),
-                        "model": anthropic_response.get("model", self.model),
-                        "choices": [
-                            {
-                                "index": 0,
-                                "message": {
-                                    "role": "assistant",
-                                    "content": anthropic_response.get("content", [{"text": ""}])[0]["text"]
-                                },
-                                "finish_reason": anthropic_response.get("stop_reason", "stop")
-                            }
-                        ],
-                        "usage": anthropic_response.get("usage", {})
-                    }
-                    
-                    return openai_format_response
-                except requests.exceptions.RequestException:
-                    retry_count += 1
+            results = [{"error": "No result returned"} for _ in batch]
+            
+            response = self.session.get(batch_job["results_url"], timeout=self.timeout)
+            response.raise_for_status()
+            
+            for line in response.text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                result = item.get("result") or {}
+                if result.get("type") == "succeeded":
+                    results[int(item["custom_id"])] = self._to_openai_format(result["message"])
+                else:
+                    results[int(item["custom_id"])] = {"error": str(result.get("error") or result.get("type"))}
             
-            # If all retries fail, raise the exception
-            raise Exception(f"Failed to call Anthropic API after {max_retries} retries: {str(e)}")
+            return results
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Failed to run Anthropic batch: {str(e)}") from e
     
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Sequence[str]:
         """
         Get a list of available models from Anthropic.
         
         Returns:
-            List of model identifiers
+            Tuple of model identifiers
         """
         # This is a simplified implementation
-        return [
-            "claude-3-opus-20240229",
-            "claude-3-sonnet-20240229",
-            "claude-3-haiku-20240307",
-            "claude-2.1",
-            "claude-2.0"
-        ]
+        return _ANTHROPIC_MODELS
     
     def get_provider_name(self) -> str:
         """
@@ -349,140 +1446,265 @@ class AnthropicProvider(LLMProvider):
         """
         return "Anthropic Claude"
 
-class MistralProvider(LLMProvider):
+class MistralProvider(AsyncLLMProvider):
     """
     Mistral AI provider implementation.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "mistral-large-latest"):
+    def __init__(self, api_key: Optional[Union[str, List[str]]] = None, model: str = "mistral-large-latest",
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 api_url: Optional[Union[str, List[str]]] = None, http2: bool = False,
+                 connect_timeout: float = REQUEST_TIMEOUT[0], read_timeout: float = REQUEST_TIMEOUT[1]):
         """
         Initialize the Mistral provider.
         
         Args:
-            api_key: Mistral API key (defaults to environment variable)
-            model: Model to use for completions (default: mistral-large-latest)
+            api_key: Mistral API key, or a list of keys to balance requests
+                across (defaults to environment variable)
+            model: Model to use for completions (default: mistral-large-latest)
+            pool_connections: Number of connection pools to cache
+            pool_maxsize: Maximum number of pooled connections
+            api_url: Completion endpoint URL, or a list of URLs to balance
+                requests across (default: https://api.mistral.ai/v1/chat/completions)
+            http2: Send completions over HTTP/2 (needs the httpx and h2 packages)
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Timeout in seconds for the response to arrive
+        """
+        api_keys = _as_list(api_key) or _as_list(os.getenv("MISTRAL_API_KEY"))
+        if not api_keys:
+            raise ValueError("Mistral API key is required. Set it in .env or pass to constructor.")
+        
+        self.api_key = api_keys[0]
+        self.model = model
+        self._init_endpoints(api_keys, _as_list(api_url) or ["https://api.mistral.ai/v1/chat/completions"], pool_connections, pool_maxsize, http2,
+                             timeout=(connect_timeout, read_timeout))
+    
+    def _make_headers(self, api_key: Optional[str]) -> Dict[str, str]:
+        """
+        Build the request headers for an endpoint.
+        
+        Args:
+            api_key: API key of the endpoint
+        
+        Returns:
+            Request headers
+        """
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        }
+    
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Build the request payload for a completion.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional provider-specific parameters
+        
+        Returns:
+            Request payload
+        """
+        payload = {
+            "model": kwargs.get("model", self.model),
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        
+        # Add any additional parameters (skipping those handled above)
+        if kwargs:
+            payload.update({key: value for key, value in kwargs.items() if key not in _RESERVED_PARAMS})
+        
+        return payload
+    
+    def generate_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        stream: bool = False,
+        **kwargs
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, str]]]:
+        """
+        Generate a completion from the Mistral API.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            stream: Return an iterator of {"delta": text} chunks instead
+            **kwargs: Additional Mistral-specific parameters
+        
+        Returns:
+            Dictionary containing the completion result, or an
+            iterator of text chunks if stream is True
+        """
+        payload = self._build_payload(messages, temperature, max_tokens, **kwargs)
+        if stream:
+            return self._stream_with_retry(payload)
+        return self._request_with_retry(payload)
+    
+    def get_available_models(self) -> Sequence[str]:
+        """
+        Get a list of available models from Mistral.
+        
+        Returns:
+            Tuple of model identifiers
+        """
+        # This is a simplified implementation
+        return _MISTRAL_MODELS
+    
+    def get_provider_name(self) -> str:
+        """
+        Get the name of this provider.
+        
+        Returns:
+            Provider name
+        """
+        return "Mistral AI"
+
+class OllamaProvider(AsyncLLMProvider):
+    """
+    Ollama local LLM provider implementation.
+    """
+    
+    def __init__(self, base_url: Union[str, List[str]] = "http://localhost:11434", model: str = "llama3",
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 connect_timeout: float = REQUEST_TIMEOUT[0], read_timeout: float = REQUEST_TIMEOUT[1]):
+        """
+        Initialize the Ollama provider.
+        
+        Args:
+            base_url: Base URL for the Ollama API, or a list of URLs of Ollama
+                servers to balance requests across (default: http://localhost:11434)
+            model: Model to use for completions (default: llama3)
+            pool_connections: Number of connection pools to cache
+            pool_maxsize: Maximum number of pooled connections
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Timeout in seconds for the response to arrive
         """
-        self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
-        if not self.api_key:
-            raise ValueError("Mistral API key is required. Set it in .env or pass to constructor.")
-        
+        base_urls = _as_list(base_url)
+        self.base_url = base_urls[0]
         self.model = model
-        self.api_url = "https://api.mistral.ai/v1/chat/completions"
-        self.headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
+        self._models_cache: Optional[Tuple[float, Tuple[str, ...]]] = None
+        self._tags_failures = 0
+        self._tags_cooldown_until = 0.0
+        self._init_endpoints([None], [f"{url}/api/chat" for url in base_urls], pool_connections, pool_maxsize,
+                             timeout=(connect_timeout, read_timeout))
     
-    def generate_completion(
+    def _build_payload(
         self,
         messages: List[Dict[str, str]],
-        temperature: float = 0.7,
-        max_tokens: int = 1000,
+        temperature: float,
+        max_tokens: int,
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Generate a completion from the Mistral API.
+        Build the request payload for a completion.
         
         Args:
             messages: List of message dictionaries
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens in the response
-            **kwargs: Additional Mistral-specific parameters
-            
+            **kwargs: Additional provider-specific parameters
+        
         Returns:
-            Dictionary containing the completion result
+            Request payload
         """
+        options = {
+            "temperature": temperature,
+            "num_predict": max_tokens
+        }
         payload = {
             "model": kwargs.get("model", self.model),
             "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens
+            "stream": False,
+            "options": options
         }
         
-        # Add any additional parameters
+        # Add any additional parameters, as options unless they are top-level
         for key, value in kwargs.items():
-            if key not in ["model"]:  # Skip parameters that are already set
+            if key in _OLLAMA_TOP_LEVEL_PARAMS:
                 payload[key] = value
+            elif key not in _RESERVED_PARAMS and key not in options:
+                options[key] = value
         
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            # Implement retry logic
-            retry_count = 0
-            max_retries = 3
-            while retry_count < max_retries:
-                try:
-                    time.sleep(2 ** retry_count)  # Exponential backoff
-                    response = requests.post(
-                        self.api_url,
-                        headers=self.headers,
-                        json=payload
-                    )
-                    response.raise_for_status()
-                    return response.json()
-                except requests.exceptions.RequestException:
-                    retry_count += 1
-            
-            # If all retries fail, raise the exception
-            raise Exception(f"Failed to call Mistral API after {max_retries} retries: {str(e)}")
-    
-    def get_available_models(self) -> List[str]:
-        """
-        Get a list of available models from Mistral.
+        # Ollama has no prompt cache key; keeping the model loaded between the
+        # turns of a session lets it reuse its context instead
+        if kwargs.get("session_id"):
+            payload.setdefault("keep_alive", OLLAMA_KEEP_ALIVE)
         
-        Returns:
-            List of model identifiers
-        """
-        # This is a simplified implementation
-        return [
-            "mistral-tiny",
-            "mistral-small",
-            "mistral-medium",
-            "mistral-large-latest"
-        ]
+        return payload
     
-    def get_provider_name(self) -> str:
+    def _to_openai_format(self, ollama_response: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get the name of this provider.
+        Convert an Ollama chat response to OpenAI format.
+        
+        Args:
+            ollama_response: Decoded API response
         
         Returns:
-            Provider name
+            Response in OpenAI chat completion format
         """
-        return "Mistral AI"
-
-class OllamaProvider(LLMProvider):
-    """
-    Ollama local LLM provider implementation.
-    """
+        created = int(time.time())
+        prompt_tokens = ollama_response.get("prompt_eval_count", 0)
+        completion_tokens = ollama_response.get("eval_count", 0)
+        openai_format_response = {
+            "id": f"ollama-{created}",
+            "object": "chat.completion",
+            "created": created,
+            "model": ollama_response.get("model", self.model),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": ollama_response.get("message", {}).get("content", "")
+                    },
+                    "finish_reason": "stop"
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+        
+        return openai_format_response
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3"):
+    def _parse_stream_line(self, line: str) -> Optional[str]:
         """
-        Initialize the Ollama provider.
+        Extract the text delta from a line of a streamed Ollama response.
+        
+        Ollama streams newline-delimited JSON objects rather than server-sent
+        events.
         
         Args:
-            base_url: Base URL for the Ollama API (default: http://localhost:11434)
-            model: Model to use for completions (default: llama3)
+            line: Non-empty line of the response body
+        
+        Returns:
+            Text delta, or None if the line carries no text
         """
-        self.base_url = base_url
-        self.model = model
-        self.api_url = f"{base_url}/api/chat"
-        self.headers = {
-            "Content-Type": "application/json"
-        }
+        return _loads(line).get("message", {}).get("content") or None
     
     def generate_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        stream: bool = False,
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, str]]]:
         """
         Generate a completion from the Ollama API.
         
@@ -490,128 +1712,61 @@ class OllamaProvider(LLMProvider):
             messages: List of message dictionaries
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens in the response
+            stream: Return an iterator of {"delta": text} chunks instead
             **kwargs: Additional Ollama-specific parameters
-            
+        
         Returns:
-            Dictionary containing the completion result (converted to OpenAI format)
+            Dictionary containing the completion result (converted to OpenAI format), or an
+            iterator of text chunks if stream is True
         """
-        payload = {
-            "model": kwargs.get("model", self.model),
-            "messages": messages,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens
-            }
-        }
-        
-        # Add any additional options
-        for key, value in kwargs.items():
-            if key not in ["model"] and key not in payload["options"]:
-                payload["options"][key] = value
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
-            )
-            response.raise_for_status()
-            
-            # Convert Ollama response to OpenAI format
-            ollama_response = response.json()
-            openai_format_response = {
-                "id": f"ollama-{int(time.time())}",
-                "object": "chat.completion",
-                "created": int(time.time()),
-                "model": ollama_response.get("model", self.model),
-                "choices": [
-                    {
-                        "index": 0,
-                        "message": {
-                            "role": "assistant",
-                            "content": ollama_response.get("message", {}).get("content", "")
-                        },
-                        "finish_reason": "stop"
-                    }
-                ],
-                "usage": {
-                    "prompt_tokens": ollama_response.get("prompt_eval_count", 0),
-                    "completion_tokens": ollama_response.get("eval_count", 0),
-                    "total_tokens": ollama_response.get("prompt_eval_count", 0) + ollama_response.get("eval_count", 0)
-                }
-            }
-            
-            return openai_format_response
-        except requests.exceptions.RequestException as e:
-            # Implement retry logic
-            retry_count = 0
-            max_retries = 3
-            while retry_count < max_retries:
-                try:
-                    time.sleep(2 ** retry_count)  # Exponential backoff
-                    response = requests.post(
-                        self.api_url,
-                        headers=self.headers,
-                        json=payload
-                    )
-                    response.raise_for_status()
-                    
-                    # Convert Ollama response to OpenAI format
-                    ollama_response = response.json()
-                    openai_format_response = {
-                        "id": f"ollama-{int(time.time())}",
-                        "object": "chat.completion",
-                        "created": int(time.time()),
-                        "model": ollama_response.get("model", self.model),
-                        "choices": [
-                            {
-                                "index": 0,
-                                "message": {
-                                    "role": "assistant",
-                                    "content": ollama_response.get("message", {}).get("content", "")
-                                },
-                                "finish_reason": "stop"
-                            }
-                        ],
-                        "usage": {
-                            "prompt_tokens": ollama_response.get("prompt_eval_count", 0),
-                            "completion_tokens": ollama_response.get("eval_count", 0),
-                            "total_tokens": ollama_response.get("prompt_eval_count", 0) + ollama_response.get("eval_count", 0)
-                        }
-                    }
-                    
-                    return openai_format_response
-                except requests.exceptions.RequestException:
-                    retry_count += 1
-            
-            # If all retries fail, raise the exception
-            raise Exception(f"Failed to call Ollama API after {max_retries} retries: {str(e)}")
+        payload = self._build_payload(messages, temperature, max_tokens, **kwargs)
+        if stream:
+            return self._stream_with_retry(payload)
+        return self._to_openai_format(self._request_with_retry(payload))
     
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Sequence[str]:
         """
         Get a list of available models from Ollama.
         
+        The list is fetched from the server at most once per OLLAMA_MODELS_TTL
+        seconds. After OLLAMA_TAGS_MAX_FAILURES consecutive failures the
+        server is not asked again for OLLAMA_TAGS_COOLDOWN seconds.
+        
         Returns:
-            List of model identifiers
+            Tuple of model identifiers
         """
+        now = time.time()
+        if self._models_cache is not None and now - self._models_cache[0] <= OLLAMA_MODELS_TTL:
+            return self._models_cache[1]
+        
+        # Skip the request while the server is known to be down
+        if now < self._tags_cooldown_until:
+            return _OLLAMA_DEFAULT_MODELS
+        
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=OLLAMA_TAGS_TIMEOUT)
             response.raise_for_status()
             models_data = response.json()
             
             # Extract model names
-            models = [model["name"] for model in models_data.get("models", [])]
-            return models
-        except:
+            models = tuple(model["name"] for model in models_data.get("models", []))
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._tags_failures += 1
+            if self._tags_failures >= OLLAMA_TAGS_MAX_FAILURES:
+                self._tags_cooldown_until = now + OLLAMA_TAGS_COOLDOWN
+                logger.warning(
+                    "Failed to list Ollama models %d times (%s); retrying in %d seconds",
+                    self._tags_failures, e, OLLAMA_TAGS_COOLDOWN
+                )
+            else:
+                logger.warning("Failed to list Ollama models: %s", e)
+            
             # Return default models if API call fails
-            return [
-                "llama3",
-                "llama3:8b",
-                "llama3:70b",
-                "mistral",
-                "mixtral",
-                "phi3"
-            ]
+            return _OLLAMA_DEFAULT_MODELS
+        
+        self._tags_failures = 0
+        self._models_cache = (now, models)
+        return models
     
     def get_provider_name(self) -> str:
         """
@@ -622,6 +1777,47 @@ class OllamaProvider(LLMProvider):
         """
         return "Ollama"
 
+class PoolConfig:
+    """
+    Connection pool and timeout settings of a provider.
+    """
+    
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_POOL_MAXSIZE,
+        max_keepalive: int = DEFAULT_POOL_CONNECTIONS,
+        connect_timeout: float = REQUEST_TIMEOUT[0],
+        read_timeout: float = REQUEST_TIMEOUT[1]
+    ):
+        """
+        Initialize the pool configuration.
+        
+        Args:
+            max_connections: Maximum number of pooled connections
+            max_keepalive: Number of connection pools (sync) or idle
+                connections (async and HTTP/2) kept alive
+            connect_timeout: Connection timeout in seconds
+            read_timeout: Timeout in seconds for the response to arrive
+        """
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+    
+    def provider_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the provider constructor arguments for this configuration.
+        
+        Returns:
+            Keyword arguments for a built-in provider's __init__
+        """
+        return {
+            "pool_connections": self.max_keepalive,
+            "pool_maxsize": self.max_connections,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout
+        }
+
 class LLMManager:
     """
     Manager for LLM providers.
@@ -630,40 +1826,108 @@ class LLMManager:
     and allows easy switching between them.
     """
     
-    def __init__(self, default_provider: str = "openai"):
+    def __init__(
+        self,
+        default_provider: str = "openai",
+        cache: Optional[LLMCache] = None,
+        prewarm: bool = False,
+        rate_limits: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        pool_config: Optional[Dict[str, PoolConfig]] = None
+    ):
         """
         Initialize the LLM manager.
         
         Args:
             default_provider: Default provider to use (default: openai)
+            cache: Optional cache for deterministic completions (default: a new
+                in-memory LLMCache)
+            prewarm: Open a connection to each registered provider in the
+                background so the first completion skips the TLS handshake
+            rate_limits: Optional client-side quotas as (requests per minute,
+                tokens per minute), keyed by provider name or by
+                "provider:model" for a model-specific quota. Either value may
+                be None. Requests over quota wait instead of being sent.
+            pool_config: Optional connection pool settings of the built-in
+                providers, keyed by provider name
         """
         self.providers = {}
         self.default_provider = default_provider
+        self.cache = cache if cache is not None else LLMCache()
+        self.prewarm = prewarm
+        self._limiters = {
+            key: RateLimiter(requests_per_minute, tokens_per_minute)
+            for key, (requests_per_minute, tokens_per_minute) in (rate_limits or {}).items()
+        }
+        
+        # Providers registered by factory, created on first use
+        self._provider_factories: Dict[str, Callable[[], LLMProvider]] = {}
+        self._providers_lock = threading.RLock()
+        self.pool_config = pool_config or {}
         
         # Register built-in providers
         self._register_built_in_providers()
     
     def _register_built_in_providers(self):
         """Register the built-in providers."""
-        try:
-            self.register_provider("openai", OpenAIProvider())
-        except Exception as e:
-            logger.warning(f"Failed to register OpenAI provider: {str(e)}")
+        built_in_providers = {
+            "openai": OpenAIProvider,
+            "anthropic": AnthropicProvider,
+            "mistral": MistralProvider,
+            "ollama": OllamaProvider
+        }
         
-        try:
-            self.register_provider("anthropic", AnthropicProvider())
-        except Exception as e:
-            logger.warning(f"Failed to register Anthropic provider: {str(e)}")
+        for name, provider_class in built_in_providers.items():
+            config = self.pool_config.get(name)
+            if config is not None:
+                provider_class = functools.partial(provider_class, **config.provider_kwargs())
+            self.register_provider_factory(name, provider_class)
+    
+    def register_provider_factory(self, name: str, factory: Callable[[], LLMProvider]):
+        """
+        Register an LLM provider that is only created when first used.
         
-        try:
-            self.register_provider("mistral", MistralProvider())
-        except Exception as e:
-            logger.warning(f"Failed to register Mistral provider: {str(e)}")
+        Args:
+            name: Name of the provider
+            factory: Callable returning the provider instance
+        """
+        with self._providers_lock:
+            self.providers.pop(name, None)
+            self._provider_factories[name] = factory
+    
+    def _create_provider(self, name: str) -> Optional[LLMProvider]:
+        """
+        Create a provider registered by factory.
         
-        try:
-            self.register_provider("ollama", OllamaProvider())
-        except Exception as e:
-            logger.warning(f"Failed to register Ollama provider: {str(e)}")
+        A provider that fails to initialize (e.g. for a missing API key) is
+        dropped, as if it had never been registered.
+        
+        Args:
+            name: Name of the provider
+        
+        Returns:
+            Provider instance, or None if there is no factory or it failed
+        """
+        with self._providers_lock:
+            if name in self.providers:
+                return self.providers[name]
+            
+            factory = self._provider_factories.pop(name, None)
+            if factory is None:
+                return None
+            
+            try:
+                provider = factory()
+            except Exception as e:
+                logger.warning(f"Failed to register {name} provider: {str(e)}")
+                return None
+            
+            self.register_provider(name, provider)
+            return provider
+    
+    def _create_all_providers(self):
+        """Create every provider that is still pending."""
+        for name in list(self._provider_factories):
+            self._create_provider(name)
     
     def register_provider(self, name: str, provider: LLMProvider):
         """
@@ -673,8 +1937,23 @@ class LLMManager:
             name: Name of the provider
             provider: Provider instance
         """
-        self.providers[name] = provider
+        with self._providers_lock:
+            self._provider_factories.pop(name, None)
+            self.providers[name] = provider
         logger.info(f"Registered LLM provider: {name}")
+        
+        if self.prewarm:
+            endpoints = getattr(provider, "_endpoints", None)
+            if endpoints is None and getattr(provider, "session", None) is not None and getattr(provider, "api_url", None):
+                endpoints = [(provider.api_url, None, provider.session)]
+            
+            for url, _, session in endpoints or ():
+                threading.Thread(
+                    target=_prewarm_connection,
+                    args=(session, url),
+                    name=f"llm-prewarm-{name}",
+                    daemon=True
+                ).start()
     
     def get_provider(self, name: Optional[str] = None) -> LLMProvider:
         """
@@ -682,19 +1961,20 @@ class LLMManager:
         
         Args:
             name: Name of the provider (defaults to default_provider)
-            
+        
         Returns:
             Provider instance
-            
+        
         Raises:
             ValueError: If the provider is not found
         """
         provider_name = name or self.default_provider
         
-        if provider_name not in self.providers:
+        provider = self.providers.get(provider_name) or self._create_provider(provider_name)
+        if provider is None:
             raise ValueError(f"Provider '{provider_name}' not found")
         
-        return self.providers[provider_name]
+        return provider
     
     def set_default_provider(self, name: str):
         """
@@ -702,12 +1982,11 @@ class LLMManager:
         
         Args:
             name: Name of the provider
-            
+        
         Raises:
             ValueError: If the provider is not found
         """
-        if name not in self.providers:
-            raise ValueError(f"Provider '{name}' not found")
+        self.get_provider(name)
         
         self.default_provider = name
         logger.info(f"Set default LLM provider to: {name}")
@@ -719,22 +1998,24 @@ class LLMManager:
         Returns:
             Dictionary mapping provider names to their display names
         """
+        self._create_all_providers()
         return {name: provider.get_provider_name() for name, provider in self.providers.items()}
     
-    def get_available_models(self, provider_name: Optional[str] = None) -> Dict[str, List[str]]:
+    def get_available_models(self, provider_name: Optional[str] = None) -> Dict[str, Sequence[str]]:
         """
         Get available models from providers.
         
         Args:
             provider_name: Optional name of a specific provider
-            
+        
         Returns:
-            Dictionary mapping provider names to lists of available models
+            Dictionary mapping provider names to sequences of available models
         """
         if provider_name:
             provider = self.get_provider(provider_name)
             return {provider_name: provider.get_available_models()}
         
+        self._create_all_providers()
         return {name: provider.get_available_models() for name, provider in self.providers.items()}
     
     def generate_completion(
@@ -743,8 +2024,9 @@ class LLMManager:
         provider_name: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 1000,
+        stream: bool = False,
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, str]]]:
         """
         Generate a completion using the specified provider.
         
@@ -753,20 +2035,242 @@ class LLMManager:
             provider_name: Name of the provider to use (defaults to default_provider)
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens in the response
+            stream: Return an iterator of {"delta": text} chunks instead;
+                streamed completions are not cached
             **kwargs: Additional provider-specific parameters
-            
+        
         Returns:
-            Dictionary containing the completion result
+            Dictionary containing the completion result, or an iterator of
+            text chunks if stream is True
         """
         provider = self.get_provider(provider_name)
         
+        limiter = self._get_limiter(provider_name, provider, kwargs)
+        
+        if stream:
+            if limiter is not None:
+                limiter.acquire(self._estimate_tokens(messages, max_tokens))
+            
+            logger.info(f"Streaming completion using provider: {provider.get_provider_name()}")
+            return provider.generate_completion(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **kwargs
+            )
+        
+        cache_key = self._cache_key(provider_name, provider, messages, temperature, max_tokens, kwargs)
+        cached_response = self.cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+        
+        if limiter is not None:
+            limiter.acquire(self._estimate_tokens(messages, max_tokens))
+        
         logger.info(f"Generating completion using provider: {provider.get_provider_name()}")
-        return provider.generate_completion(
+        response = provider.generate_completion(
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             **kwargs
         )
+        
+        self.cache.set(cache_key, response)
+        return response
+    
+    def _get_limiter(
+        self,
+        provider_name: Optional[str],
+        provider: LLMProvider,
+        kwargs: Dict[str, Any]
+    ) -> Optional[RateLimiter]:
+        """
+        Get the rate limiter that applies to a request.
+        
+        Args:
+            provider_name: Name of the requested provider (None for the default)
+            provider: The provider instance
+            kwargs: Additional provider-specific parameters
+        
+        Returns:
+            The model-specific limiter, else the provider's, else None
+        """
+        if not self._limiters:
+            return None
+        
+        name = provider_name or self.default_provider
+        model = kwargs.get("model", getattr(provider, "model", ""))
+        return self._limiters.get(f"{name}:{model}") or self._limiters.get(name)
+    
+    @staticmethod
+    def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """
+        Estimate the number of tokens a request counts against the quota.
+        
+        Args:
+            messages: List of message dictionaries
+            max_tokens: Maximum tokens in the response
+        
+        Returns:
+            Approximate prompt tokens plus max_tokens
+        """
+        characters = sum(len(str(message.get("content") or "")) for message in messages)
+        return characters // _CHARS_PER_TOKEN + max_tokens
+    
+    def _cache_key(
+        self,
+        provider_name: Optional[str],
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Compute the response cache key of a completion request.
+        
+        Args:
+            provider_name: Name of the requested provider (None for the default)
+            provider: The provider instance
+            messages: List of message dictionaries
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            kwargs: Additional provider-specific parameters
+        
+        Returns:
+            Cache key, or None if the request is not cacheable
+        """
+        params = dict(kwargs)
+        params.pop("session_id", None)
+        model = params.pop("model", getattr(provider, "model", ""))
+        tools = params.pop("tools", None)
+        return self.cache.cache_key(
+            f"{provider_name or self.default_provider}:{model}",
+            messages,
+            temperature,
+            tools,
+            max_tokens=max_tokens,
+            **params
+        )
+    
+    async def agenerate_completion(
+        self,
+        messages: List[Dict[str, str]],
+        provider_name: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously generate a completion using the specified provider.
+        
+        Providers without async support are run in a worker thread.
+        
+        Args:
+            messages: List of message dictionaries
+            provider_name: Name of the provider to use (defaults to default_provider)
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional provider-specific parameters
+        
+        Returns:
+            Dictionary containing the completion result
+        """
+        provider = self.get_provider(provider_name)
+        
+        cache_key = self._cache_key(provider_name, provider, messages, temperature, max_tokens, kwargs)
+        cached_response = self.cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+        
+        limiter = self._get_limiter(provider_name, provider, kwargs)
+        if limiter is not None:
+            await limiter.aacquire(self._estimate_tokens(messages, max_tokens))
+        
+        logger.info(f"Generating async completion using provider: {provider.get_provider_name()}")
+        if isinstance(provider, AsyncLLMProvider):
+            response = await provider.agenerate_completion(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        else:
+            response = await asyncio.to_thread(
+                provider.generate_completion,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        
+        self.cache.set(cache_key, response)
+        return response
+    
+    async def astream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        provider_name: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Asynchronously stream a completion using the specified provider.
+        
+        Args:
+            messages: List of message dictionaries
+            provider_name: Name of the provider to use (defaults to default_provider)
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in the response
+            **kwargs: Additional provider-specific parameters
+        
+        Yields:
+            Dictionaries of the form {"delta": text}
+        """
+        provider = self.get_provider(provider_name)
+        
+        limiter = self._get_limiter(provider_name, provider, kwargs)
+        if limiter is not None:
+            await limiter.aacquire(self._estimate_tokens(messages, max_tokens))
+        
+        logger.info(f"Streaming async completion using provider: {provider.get_provider_name()}")
+        if isinstance(provider, AsyncLLMProvider):
+            chunks = provider.astream_completion(messages, temperature, max_tokens, **kwargs)
+        else:
+            chunks = _aiter_in_thread(provider.generate_completion(messages, temperature, max_tokens, stream=True, **kwargs))
+        
+        async for chunk in chunks:
+            yield chunk
+    
+    def generate_batch(
+        self,
+        batch: List[List[Dict[str, str]]],
+        provider_name: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate completions for a batch using the specified provider.
+        
+        Args:
+            batch: List of message lists, one per completion
+            provider_name: Name of the provider to use (defaults to default_provider)
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens in each response
+            **kwargs: Batch options (max_concurrency, requests_per_minute,
+                on_progress, native) and provider-specific parameters
+        
+        Returns:
+            Completion results in batch order; failed entries are dictionaries
+            with an "error" key
+        """
+        provider = self.get_provider(provider_name)
+        
+        logger.info(f"Generating batch of {len(batch)} completions using provider: {provider.get_provider_name()}")
+        return provider.generate_batch(batch, temperature=temperature, max_tokens=max_tokens, **kwargs)
     
     def extract_response_content(self, api_response: Dict[str, Any]) -> str:
         """
@@ -777,14 +2281,64 @@ class LLMManager:
         
         Args:
             api_response: Response from the LLM API
-            
+        
         Returns:
             Assistant's response as a string
         """
         try:
             return api_response["choices"][0]["message"]["content"]
         except (KeyError, IndexError) as e:
-            raise Exception(f"Failed to extract response content: {str(e)}")
+            raise Exception(f"Failed to extract response content: {str(e)}") from e
+    
+    def extract_response_contents(self, api_responses: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Extract the assistant's response content from a list of API responses.
+        
+        Unlike extract_response_content this does not raise: responses without
+        content, such as the {"error": ...} entries returned by
+        generate_batch, give None.
+        
+        Args:
+            api_responses: Responses from the LLM API, e.g. from generate_batch
+        
+        Returns:
+            Assistant's responses in the same order, None where unavailable
+        """
+        # Fast path for the common case where every response succeeded
+        try:
+            return [api_response["choices"][0]["message"]["content"] for api_response in api_responses]
+        except (KeyError, IndexError, TypeError):
+            pass
+        
+        contents = []
+        for api_response in api_responses:
+            try:
+                contents.append(api_response["choices"][0]["message"]["content"])
+            except (KeyError, IndexError, TypeError):
+                contents.append(None)
+        return contents
+
+# Shared instance, created on first use
+_llm_manager: Optional[LLMManager] = None
+_llm_manager_lock = threading.Lock()
+
+def get_llm_manager() -> LLMManager:
+    """
+    Get the shared LLM manager, creating it on first use.
+    
+    Returns:
+        The shared LLMManager instance
+    """
+    global _llm_manager
+    if _llm_manager is None:
+        with _llm_manager_lock:
+            if _llm_manager is None:
+                _llm_manager = LLMManager()
+    return _llm_manager
 
-# Create a singleton instance
-llm_manager = LLMManager()
+def __getattr__(name: str) -> Any:
+    # Keep "from core.llm_manager import llm_manager" working without
+    # creating the manager at import time
+    if name == "llm_manager":
+        return get_llm_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,17 +6,36 @@ tool based on user input, replacing the regex-based TaskDetector approach.
 """
 
 import json
+import asyncio
+import hashlib
 import logging
-import requests
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, Callable
+
+from .prompt_cache import PromptCache
+from .llm_manager import OpenAIProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Deterministic responses, so the same input gets the same selection
+SELECTION_TEMPERATURE = 0.0
+
+# A selection is a short JSON object, so a small output budget suffices
+SELECTION_MAX_TOKENS = 128
+
+# Constrain the output to a JSON object
+SELECTION_RESPONSE_FORMAT = {"type": "json_object"}
+
+# (connect, read) timeout in seconds for tool selection requests
+SELECTION_TIMEOUT = (5, 30)
+
+# Maximum number of concurrent selections in aselect_tools
+DEFAULT_SELECT_CONCURRENCY = 64
+
 class LLMToolSelector:
     """
     Uses the LLM to select the appropriate tool based on user input.
@@ -26,26 +45,222 @@ class LLMToolSelector:
     to use for a given user input.
     """
     
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-3.5-turbo",
+        tool_cache: Optional[PromptCache] = None,
+        semantic_cache: bool = False,
+        similarity_threshold: float = 0.92,
+        embedding_model: str = "text-embedding-3-small",
+        http2: bool = False
+    ):
         """
         Initialize the LLM tool selector.
         
         Args:
             api_key: OpenAI API key
-            model: Model to use for completions (default: gpt-3.5-turbo)
+            model: Model to use for completions (default: gpt-3.5-turbo; smaller
+                models such as gpt-4o-mini are faster and cheaper)
+            tool_cache: Optional cache for tool selections, keyed on the user
+                input (overrides semantic_cache and similarity_threshold)
+            semantic_cache: Also reuse the selection of a similar earlier
+                input, compared by OpenAI embeddings (default: exact matches only)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embedding_model: Model used to embed user inputs for the semantic cache
+            http2: Send requests over HTTP/2 (needs the httpx and h2 packages)
         """
         self.api_key = api_key
         self.model = model
+        self.embedding_model = embedding_model
+        self.http2 = http2
         self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.embeddings_url = "https://api.openai.com/v1/embeddings"
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {api_key}"
         }
+        
+        if tool_cache is None:
+            tool_cache = PromptCache(
+                similarity_threshold=similarity_threshold,
+                embedding_function=self._embed if semantic_cache else None
+            )
+        self.tool_cache = tool_cache
+        
+        # Rendered system prompt, reused while the available tools are unchanged
+        self._system_prompt_cache: Optional[Tuple[Tuple[Tuple[str, str], ...], str]] = None
+        
+        # Pooled connections to the OpenAI API, created on first use
+        self._provider: Optional[OpenAIProvider] = None
+    
+    @staticmethod
+    def _catalog_fingerprint(available_tools: List[Dict[str, Any]]) -> str:
+        """
+        Compute a fingerprint of the set of available tools.
+        
+        Cached selections are only reused while the same tools are available.
+        
+        Args:
+            available_tools: List of available tools with their schemas
+            
+        Returns:
+            Hex-encoded SHA-1 of the sorted tool names
+        """
+        names = "\n".join(sorted(tool["name"] for tool in available_tools))
+        return hashlib.sha1(names.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _is_informational(tool_name: str, available_tools: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether a tool only retrieves information.
+        
+        Tools without a request_type are treated as commands, whose selections
+        are never cached since repeating them has side effects.
+        
+        Args:
+            tool_name: The name of the tool
+            available_tools: List of available tools with their schemas
+            
+        Returns:
+            True if the tool is informational
+        """
+        for tool in available_tools:
+            if tool["name"] == tool_name:
+                return tool.get("request_type", "command") == "informational"
+        return False
+    
+    def _get_cached_selection(self, user_input: str, fingerprint: str, available_tools: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached tool selection for a user input.
+        
+        Args:
+            user_input: The user's input message
+            fingerprint: Fingerprint of the available tools
+            available_tools: List of available tools with their schemas
+            
+        Returns:
+            The cached selection, or None on a cache miss
+        """
+        try:
+            cached = self.tool_cache.get(user_input)
+        except Exception as e:
+            logger.warning("Tool selection cache lookup failed: %s", e)
+            return None
+        
+        if cached is None or cached.get("catalog") != fingerprint:
+            return None
+        
+        # The tool may have been reclassified since the selection was cached
+        if cached["tool_name"] is not None and not self._is_informational(cached["tool_name"], available_tools):
+            return None
+        return cached
+    
+    @staticmethod
+    def _log_api_error(error: Exception) -> None:
+        """
+        Log a failed tool selection request, with its HTTP status if known.
+        
+        Args:
+            error: The error raised by the request
+        """
+        # Find the status code of the underlying request error, if any
+        status_code, cause = None, error
+        while cause is not None and status_code is None:
+            status_code = getattr(getattr(cause, "response", None), "status_code", None)
+            cause = cause.__cause__
+        
+        if status_code is None:
+            logger.error("Error calling OpenAI API: %s", error)
+        else:
+            logger.error("Error calling OpenAI API (HTTP %s): %s", status_code, error)
+    
+    def _use_cached_selection(self, cached: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Turn a cached selection into the result of a tool selection.
+        
+        Args:
+            cached: The cached selection
+            
+        Returns:
+            Tuple of (tool_name, tool_args) if a tool was selected, None otherwise
+        """
+        if cached["tool_name"] is None:
+            logger.info("Using cached tool selection: no tool needed")
+            return None
+        logger.info("Using cached tool selection: %s", cached["tool_name"])
+        return cached["tool_name"], dict(cached["parameters"])
+    
+    async def _run_cache_call(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a cache lookup or store from a coroutine.
+        
+        With a semantic cache, these compute embeddings over the network, so
+        they run in a worker thread instead of blocking the event loop.
+        
+        Args:
+            func: The cache method to call
+            *args: Arguments for the method
+            
+        Returns:
+            The result of the method
+        """
+        if self.tool_cache.embedding_function is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+    
+    def _cache_selection(self, user_input: str, fingerprint: str, tool_name: Optional[str], parameters: Dict[str, Any]) -> None:
+        """
+        Cache the tool selection for a user input.
+        
+        Args:
+            user_input: The user's input message
+            fingerprint: Fingerprint of the available tools
+            tool_name: Name of the selected tool, or None if no tool is needed
+            parameters: Parameters of the selected tool
+        """
+        try:
+            self.tool_cache.put(user_input, {"catalog": fingerprint, "tool_name": tool_name, "parameters": parameters})
+        except Exception as e:
+            logger.warning("Tool selection cache store failed: %s", e)
     
     def select_tool(self, user_input: str, available_tools: List[Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any]]]:
         """
         Select the appropriate tool for the user input.
         
+        Args:
+            user_input: The user's input message
+            available_tools: List of available tools with their schemas; a tool's
+                optional "request_type" ("informational" or "command", the
+                default) decides whether its selection may be cached
+            
+        Returns:
+            Tuple of (tool_name, tool_args) if a tool is selected, None otherwise
+        """
+        # Reuse the selection made for the same (or a similar) input
+        fingerprint = self._catalog_fingerprint(available_tools)
+        cached = self._get_cached_selection(user_input, fingerprint, available_tools)
+        if cached is not None:
+            return self._use_cached_selection(cached)
+        
+        messages = self._build_messages(user_input, available_tools)
+        
+        # Call the OpenAI API
+        try:
+            response = self._call_openai_api(messages)
+        except Exception as e:
+            self._log_api_error(e)
+            return None
+        
+        return self._select_from_response(user_input, fingerprint, response, available_tools)
+    
+    async def aselect_tool(self, user_input: str, available_tools: List[Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Asynchronously select the appropriate tool for the user input.
+        
+        The API call does not block the event loop, so selections for many
+        concurrent conversations can be in flight at once.
+        
         Args:
             user_input: The user's input message
             available_tools: List of available tools with their schemas
@@ -53,24 +268,185 @@ class LLMToolSelector:
         Returns:
             Tuple of (tool_name, tool_args) if a tool is selected, None otherwise
         """
-        # Create a prompt for the LLM to select a tool
+        fingerprint = self._catalog_fingerprint(available_tools)
+        cached = await self._run_cache_call(self._get_cached_selection, user_input, fingerprint, available_tools)
+        if cached is not None:
+            return self._use_cached_selection(cached)
+        
+        messages = self._build_messages(user_input, available_tools)
+        
+        # Call the OpenAI API
+        try:
+            response = await self._get_provider().agenerate_completion(
+                messages,
+                temperature=SELECTION_TEMPERATURE,
+                max_tokens=SELECTION_MAX_TOKENS,
+                response_format=SELECTION_RESPONSE_FORMAT
+            )
+            content = response["choices"][0]["message"]["content"]
+        except Exception as e:
+            self._log_api_error(e)
+            return None
+        
+        return await self._run_cache_call(self._select_from_response, user_input, fingerprint, content, available_tools)
+    
+    async def aselect_tools(
+        self,
+        inputs: List[str],
+        available_tools: List[Dict[str, Any]],
+        max_concurrency: int = DEFAULT_SELECT_CONCURRENCY
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Asynchronously select the appropriate tools for many user inputs.
+        
+        Unlike select_tools_batch, results arrive within normal request
+        latency, at the regular API price.
+        
+        Args:
+            inputs: The user input messages
+            available_tools: List of available tools with their schemas
+            max_concurrency: Maximum number of selections in flight
+            
+        Returns:
+            One entry per input, in order: a (tool_name, tool_args) tuple if a
+            tool is selected, None otherwise
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def select(user_input: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+            async with semaphore:
+                return await self.aselect_tool(user_input, available_tools)
+        
+        return list(await asyncio.gather(*(select(user_input) for user_input in inputs)))
+    
+    def select_tools_batch(
+        self,
+        inputs: List[str],
+        available_tools: List[Dict[str, Any]],
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Select the appropriate tools for many user inputs at once.
+        
+        Inputs that are not answered from the cache are submitted as a single
+        job to the OpenAI Batch API, at reduced cost. This blocks until the
+        job finishes and is meant for offline use (evaluations, backfills,
+        classifying logged messages), not interactive requests.
+        
+        Args:
+            inputs: The user input messages
+            available_tools: List of available tools with their schemas
+            on_progress: Optional callback receiving (completed, total) while
+                the batch job runs
+            
+        Returns:
+            One entry per input, in order: a (tool_name, tool_args) tuple if a
+            tool is selected, None otherwise
+        """
+        fingerprint = self._catalog_fingerprint(available_tools)
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(inputs)
+        
+        pending = []
+        for index, user_input in enumerate(inputs):
+            cached = self._get_cached_selection(user_input, fingerprint, available_tools)
+            if cached is None:
+                pending.append(index)
+            else:
+                results[index] = self._use_cached_selection(cached)
+        
+        if not pending:
+            return results
+        
+        batch = [self._build_messages(inputs[index], available_tools) for index in pending]
+        try:
+            responses = self._get_provider().generate_batch(
+                batch,
+                temperature=SELECTION_TEMPERATURE,
+                max_tokens=SELECTION_MAX_TOKENS,
+                on_progress=on_progress,
+                response_format=SELECTION_RESPONSE_FORMAT
+            )
+        except Exception as e:
+            logger.error("Error running OpenAI batch: %s", e)
+            return results
+        
+        for index, response in zip(pending, responses):
+            if "error" in response:
+                logger.warning("Tool selection failed for batch input %d: %s", index, response["error"])
+                continue
+            content = response["choices"][0]["message"]["content"]
+            results[index] = self._select_from_response(inputs[index], fingerprint, content, available_tools)
+        
+        return results
+    
+    def _get_provider(self) -> OpenAIProvider:
+        """
+        Get the OpenAI provider used for API calls, creating it on first use.
+        
+        The provider keeps its connections alive, so consecutive selections
+        reuse an open TCP/TLS connection instead of handshaking again.
+            
+        Returns:
+            The OpenAI provider
+        """
+        if self._provider is None:
+            self._provider = OpenAIProvider(
+                api_key=self.api_key,
+                model=self.model,
+                api_url=self.api_url,
+                http2=self.http2,
+                connect_timeout=SELECTION_TIMEOUT[0],
+                read_timeout=SELECTION_TIMEOUT[1]
+            )
+        return self._provider
+    
+    def close(self) -> None:
+        """Close the pooled connections to the OpenAI API."""
+        if self._provider is not None:
+            self._provider.close()
+            self._provider = None
+    
+    async def aclose(self) -> None:
+        """Close the pooled connections to the OpenAI API, including async ones."""
+        if self._provider is not None:
+            await self._provider.aclose()
+            self.close()
+    
+    def __enter__(self) -> "LLMToolSelector":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _build_system_prompt(self, available_tools: List[Dict[str, Any]]) -> str:
+        """
+        Create the system prompt describing the task and the available tools.
+        
+        The prompt does not depend on the user input and lists the tools in
+        sorted order, so it stays byte-identical between calls with the same
+        tools and OpenAI can serve it from its prompt cache.
+        
+        Args:
+            available_tools: List of available tools with their schemas
+            
+        Returns:
+            The tool selection system prompt
+        """
+        catalog = tuple(sorted((tool["name"], tool["description"]) for tool in available_tools))
+        if self._system_prompt_cache is not None and self._system_prompt_cache[0] == catalog:
+            return self._system_prompt_cache[1]
+        
         tool_descriptions = "\n".join([
-            f"- {tool['name']}: {tool['description']}" 
-            for tool in available_tools
+            f"- {name}: {description}" 
+            for name, description in catalog
         ])
         
-        tool_parameters = {}
-        for tool in available_tools:
-            tool_parameters[tool['name']] = tool.get('parameters', {})
-        
-        prompt = f"""
+        system_prompt = f"""
 You are a tool selection assistant. Your job is to analyze a user message and determine if it should use a specific tool.
 
 Available tools:
 {tool_descriptions}
 
-User message: "{user_input}"
-
 First, decide if the user's message requires using one of the available tools. If not, respond with: {{"use_tool": false}}
 
 If a tool should be used, identify which one and what parameters to use. Respond with a JSON object in this format:
@@ -86,67 +462,147 @@ If a tool should be used, identify which one and what parameters to use. Respond
 Only include parameters that are relevant and can be determined from the user message. Be precise and accurate.
 Respond with valid JSON only, no additional text.
 """
+        self._system_prompt_cache = (catalog, system_prompt)
+        return system_prompt
+    
+    def _parse_selection(self, content: str, available_tools: List[Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse and validate the tool selection returned by the LLM.
         
-        # Call the OpenAI API
+        Args:
+            content: The response content from the LLM
+            available_tools: List of available tools with their schemas
+            
+        Returns:
+            Tuple of (tool_name, tool_args) if a tool is selected, None if no
+            tool is needed
+            
+        Raises:
+            ValueError: If the response is not valid JSON or selects an
+                unknown tool
+        """
         try:
-            response = self._call_openai_api(prompt)
-            
-            # Parse the response
-            try:
-                tool_selection = json.loads(response)
-                
-                # Check if a tool should be used
-                if tool_selection.get("use_tool", False):
-                    tool_name = tool_selection.get("tool_name")
-                    parameters = tool_selection.get("parameters", {})
-                    
-                    # Validate the tool name
-                    if tool_name not in [tool["name"] for tool in available_tools]:
-                        logger.warning(f"LLM selected invalid tool: {tool_name}")
-                        return None
-                    
-                    logger.info(f"LLM selected tool: {tool_name} with parameters: {parameters}")
-                    return tool_name, parameters
-                else:
-                    logger.info("LLM decided no tool is needed")
-                    return None
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse LLM response as JSON: {response}")
-                return None
-        except Exception as e:
-            logger.error(f"Error calling OpenAI API: {str(e)}")
+            tool_selection = orjson.loads(content) if orjson is not None else json.loads(content)
+        except ValueError:
+            raise ValueError(f"Failed to parse LLM response as JSON: {content}")
+        
+        if not isinstance(tool_selection, dict):
+            raise ValueError(f"Unexpected LLM response: {content}")
+        
+        # Check if a tool should be used
+        if not tool_selection.get("use_tool", False):
+            return None
+        
+        tool_name = tool_selection.get("tool_name")
+        parameters = tool_selection.get("parameters", {})
+        
+        # Validate the tool name
+        if tool_name not in [tool["name"] for tool in available_tools]:
+            raise ValueError(f"LLM selected invalid tool: {tool_name}")
+        
+        return tool_name, parameters
+    
+    def _select_from_response(
+        self,
+        user_input: str,
+        fingerprint: str,
+        content: str,
+        available_tools: List[Dict[str, Any]]
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Turn the LLM response for a user input into a tool selection and cache it.
+        
+        Args:
+            user_input: The user's input message
+            fingerprint: Fingerprint of the available tools
+            content: The response content from the LLM
+            available_tools: List of available tools with their schemas
+            
+        Returns:
+            Tuple of (tool_name, tool_args) if a valid tool is selected, None otherwise
+        """
+        try:
+            selection = self._parse_selection(content, available_tools)
+        except ValueError as e:
+            logger.warning("%s", e)
+            return None
+        
+        if selection is None:
+            logger.info("LLM decided no tool is needed")
+            self._cache_selection(user_input, fingerprint, None, {})
             return None
+        
+        tool_name, parameters = selection
+        logger.info(f"LLM selected tool: {tool_name} with parameters: {parameters}")
+        
+        # Only informational selections are safe to replay
+        if isinstance(parameters, dict) and self._is_informational(tool_name, available_tools):
+            self._cache_selection(user_input, fingerprint, tool_name, dict(parameters))
+        return selection
     
-    def _call_openai_api(self, prompt: str) -> str:
+    def _build_messages(self, user_input: str, available_tools: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Create the chat messages asking the LLM to select a tool.
+        
+        The static instructions come first and the user input last, keeping
+        the longest possible prefix identical between calls.
+        
+        Args:
+            user_input: The user's input message
+            available_tools: List of available tools with their schemas
+            
+        Returns:
+            List of message dictionaries
+        """
+        return [
+            {"role": "system", "content": self._build_system_prompt(available_tools)},
+            {"role": "user", "content": f'User message: "{user_input}"\n\nRespond with valid JSON only.'}
+        ]
+    
+    def _call_openai_api(self, messages: List[Dict[str, str]]) -> str:
         """
         Call the OpenAI API to get a response.
         
         Args:
-            prompt: The prompt to send to the API
+            messages: The messages to send to the API
             
         Returns:
             The response from the API
+            
+        Raises:
+            Exception: If the request fails after the provider's retries; the
+                underlying request error is chained as __cause__
+        """
+        response = self._get_provider().generate_completion(
+            messages,
+            temperature=SELECTION_TEMPERATURE,
+            max_tokens=SELECTION_MAX_TOKENS,
+            response_format=SELECTION_RESPONSE_FORMAT
+        )
+        return response["choices"][0]["message"]["content"]
+    
+    def _embed(self, text: str) -> List[float]:
+        """
+        Compute the embedding of a text with the OpenAI embeddings API.
+        
+        Args:
+            text: The text to embed
+            
+        Returns:
+            The embedding vector
         """
         payload = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": "You are a tool selection assistant that helps determine which tool to use for a given user input."},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.3,  # Lower temperature for more deterministic responses
-            "max_tokens": 500
+            "model": self.embedding_model,
+            "input": text
         }
         
         try:
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload
-            )
+            provider = self._get_provider()
+            response = provider.session.post(self.embeddings_url, json=payload, timeout=provider.timeout)
             response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
+            return response.json()["data"][0]["embedding"]
         except Exception as e:
-            raise Exception(f"Failed to call OpenAI API: {str(e)}")
+            raise Exception(f"Failed to call OpenAI embeddings API: {str(e)}") from e
     
     def format_tool_call(self, tool_name: str, tool_args: Dict[str, Any]) -> str:
         """
@@ -159,5 +615,7 @@ Respond with valid JSON only, no additional text.
         Returns:
             Formatted tool call string
         """
+        # Same format as the tool calls Assistant.ask looks for, whichever
+        # JSON library is installed
         args_str = json.dumps(tool_args)
         return f"<<TOOL:{tool_name} {args_str}>>"
@@ -0,0 +1,33 @@
+"""
+Logging configuration for the Syntient AI Assistant Platform.
+
+Library modules only create their loggers; the application entry points call
+configure_once to install the shared handler and format.
+"""
+
+import logging
+import threading
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_CONFIGURED = False
+_lock = threading.Lock()
+
+def configure_once(level: int = logging.INFO) -> None:
+    """
+    Configure the root logger the first time it is called.
+    
+    Later calls are no-ops, so every entry point can call it without caring
+    which one runs first.
+    
+    Args:
+        level: Logging level of the root logger
+    """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    
+    with _lock:
+        if not _CONFIGURED:
+            logging.basicConfig(level=level, format=LOG_FORMAT)
+            _CONFIGURED = True
@@ -0,0 +1,265 @@
+"""
+Prompt caching utilities for the Syntient AI Assistant Platform.
+
+This module provides helpers for caching LLM calls keyed on their prompts,
+including a Bloom filter used to skip expensive semantic-cache lookups for
+prompts that have never been seen before.
+"""
+
+import math
+import time
+import hashlib
+import operator
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Sequence, Tuple
+
+# Number of embeddings computed by missed lookups that are kept for the put
+# that usually follows, so a miss embeds the prompt only once
+_PENDING_EMBEDDINGS = 64
+
+def prompt_key(prompt: str) -> str:
+    """
+    Compute a stable cache key for a prompt.
+    
+    Args:
+        prompt: The prompt text
+    
+    Returns:
+        Hex-encoded SHA-256 digest of the prompt
+    """
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """
+    Space-efficient probabilistic set of previously seen keys.
+    
+    Membership checks never produce false negatives, so a key that is reported
+    as absent has definitely not been added. This makes the filter a cheap
+    pre-check in front of a semantic cache: prompts that were never seen skip
+    the embedding and similarity search entirely.
+    """
+    
+    def __init__(self, capacity: int = 10_000, error_rate: float = 0.001):
+        """
+        Initialize an empty Bloom filter.
+        
+        Args:
+            capacity: Expected number of keys to be added
+            error_rate: Target false-positive rate at full capacity
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1")
+        
+        self.capacity = capacity
+        self.error_rate = error_rate
+        
+        # Optimal bit count and number of hash functions for the target rate
+        self.num_bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key: str):
+        """
+        Compute the bit positions for a key using double hashing.
+        
+        Args:
+            key: The key to hash
+        
+        Yields:
+            Bit positions for the key
+        """
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def add(self, key: str) -> None:
+        """
+        Add a key to the filter.
+        
+        Args:
+            key: The key to add
+        """
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        """
+        Check whether a key may have been added to the filter.
+        
+        Args:
+            key: The key to check
+        
+        Returns:
+            False if the key was definitely never added, True otherwise
+        """
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def clear(self) -> None:
+        """Remove all keys from the filter."""
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
+
+
+class PromptCache:
+    """
+    Two-tier cache for LLM responses keyed on the prompt.
+    
+    The first tier is an exact match on the SHA-256 of the prompt. If an
+    embedding function is configured, a second tier returns the response of
+    the most similar cached prompt when the cosine similarity of their
+    embeddings reaches the similarity threshold. Entries expire after a TTL
+    and the least recently used entries are evicted beyond max_entries.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 7 * 24 * 3600,
+        similarity_threshold: float = 0.92,
+        embedding_function: Optional[Callable[[str], Sequence[float]]] = None,
+        bloom_precheck: bool = False
+    ):
+        """
+        Initialize the prompt cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Time-to-live of cached responses in seconds (default: 7 days)
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embedding_function: Optional function mapping a prompt to an embedding
+                vector; enables the semantic tier
+            bloom_precheck: Only run the semantic lookup for prompts that were
+                seen before, keeping first-time prompts off the embedding path
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.embedding_function = embedding_function
+        self.bloom_precheck = bloom_precheck
+        
+        # key -> (response, expires_at, normalized embedding or None)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float, Optional[Tuple[float, ...]]]]" = OrderedDict()
+        self._seen_prompts = BloomFilter()
+        self._lock = threading.Lock()
+        
+        # key -> embedding of recently missed prompts, see _PENDING_EMBEDDINGS
+        self._pending_embeddings: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def _embed(self, prompt: str) -> Tuple[float, ...]:
+        """
+        Compute the L2-normalized embedding of a prompt.
+        
+        Args:
+            prompt: The prompt text
+        
+        Returns:
+            Normalized embedding vector
+        """
+        vector = tuple(float(x) for x in self.embedding_function(prompt))
+        norm = math.sqrt(sum(x * x for x in vector))
+        if norm == 0:
+            return vector
+        return tuple(x / norm for x in vector)
+    
+    def get(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached response for a prompt.
+        
+        Args:
+            prompt: The prompt text
+        
+        Returns:
+            Copy of the cached response, or None on a cache miss
+        """
+        key = prompt_key(prompt)
+        now = time.time()
+        
+        with self._lock:
+            # Exact match
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[0])
+                del self._entries[key]
+            
+            if self.embedding_function is None or (self.bloom_precheck and key not in self._seen_prompts):
+                self.misses += 1
+                return None
+        
+        # Semantic match; the embedding is computed outside the lock
+        embedding = self._embed(prompt)
+        
+        with self._lock:
+            best_key, best_similarity = None, self.similarity_threshold
+            for cached_key, (_, expires_at, cached_embedding) in self._entries.items():
+                if cached_embedding is None or expires_at <= now:
+                    continue
+                similarity = sum(map(operator.mul, embedding, cached_embedding))
+                if similarity >= best_similarity:
+                    best_key, best_similarity = cached_key, similarity
+            
+            if best_key is None:
+                self.misses += 1
+                self._pending_embeddings[key] = embedding
+                while len(self._pending_embeddings) > _PENDING_EMBEDDINGS:
+                    self._pending_embeddings.popitem(last=False)
+                return None
+            
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return dict(self._entries[best_key][0])
+    
+    def put(self, prompt: str, response: Dict[str, Any]) -> None:
+        """
+        Cache the response for a prompt.
+        
+        Args:
+            prompt: The prompt text
+            response: The response to cache
+        """
+        key = prompt_key(prompt)
+        embedding = None
+        if self.embedding_function is not None:
+            # Reuse the embedding computed by the lookup that missed
+            with self._lock:
+                embedding = self._pending_embeddings.pop(key, None)
+            if embedding is None:
+                embedding = self._embed(prompt)
+        
+        with self._lock:
+            self._entries[key] = (dict(response), time.time() + self.ttl, embedding)
+            self._entries.move_to_end(key)
+            self._seen_prompts.add(key)
+            
+            # Evict the least recently used entries
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._seen_prompts.clear()
+            self._pending_embeddings.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
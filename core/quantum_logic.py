@@ -8,15 +8,24 @@ decision making, optimization, and probabilistic reasoning.
 import numpy as np
 import logging
 import random
+import functools
 from typing import Dict, List, Any, Optional, Union, Tuple, Callable
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import numba
+    import numba.extending
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
+# Shared random number generator (PCG64), faster than the legacy np.random functions
+_rng = np.random.default_rng()
+
+# Precision of state amplitudes; single precision halves the memory traffic
+# of gate applications and avoids upcasting when complex gates are applied
+AMPLITUDE_DTYPE = np.complex64
+
 class QuantumState:
     """
     Represents a quantum-inspired state for probabilistic reasoning.
@@ -25,22 +34,36 @@ class QuantumState:
     to enable more nuanced decision-making processes.
     """
     
-    def __init__(self, dimensions: int):
+    def __init__(self, dimensions: int, rng: Optional[np.random.Generator] = None):
         """
         Initialize a quantum state with the specified dimensions.
         
         Args:
             dimensions: Number of dimensions in the state vector
+            rng: Optional random number generator used for measurements
         """
         self.dimensions = dimensions
-        self.amplitudes = np.ones(dimensions) / np.sqrt(dimensions)  # Equal superposition
+        self._rng = rng if rng is not None else _rng
+        self.amplitudes = np.full(dimensions, 1.0 / np.sqrt(dimensions), dtype=AMPLITUDE_DTYPE)  # Equal superposition
         self.normalize()
     
+    def _squared_magnitudes(self) -> np.ndarray:
+        """
+        Compute the squared magnitudes of the amplitudes.
+        
+        Returns:
+            Array of squared magnitudes, without the sqrt of np.abs
+        """
+        amplitudes = self.amplitudes
+        if np.iscomplexobj(amplitudes):
+            return amplitudes.real ** 2 + amplitudes.imag ** 2
+        return amplitudes * amplitudes
+    
     def normalize(self) -> None:
         """Normalize the state vector to ensure it represents valid probabilities."""
-        norm = np.linalg.norm(self.amplitudes)
-        if norm > 0:
-            self.amplitudes = self.amplitudes / norm
+        norm2 = self._squared_magnitudes().sum()
+        if norm2 > 0:
+            self.amplitudes *= 1.0 / np.sqrt(norm2)
     
     def apply_gate(self, gate_matrix: np.ndarray) -> None:
         """
@@ -52,6 +75,7 @@ class QuantumState:
         if gate_matrix.shape[0] != self.dimensions or gate_matrix.shape[1] != self.dimensions:
             raise ValueError(f"Gate matrix dimensions {gate_matrix.shape} do not match state dimensions {self.dimensions}")
         
+        gate_matrix = np.asarray(gate_matrix, dtype=AMPLITUDE_DTYPE)
         self.amplitudes = np.dot(gate_matrix, self.amplitudes)
         self.normalize()
     
@@ -62,14 +86,19 @@ class QuantumState:
         Returns:
             Tuple of (measured_state, probability)
         """
-        probabilities = np.abs(self.amplitudes) ** 2
-        measured_state = np.random.choice(self.dimensions, p=probabilities)
-        probability = probabilities[measured_state]
+        probabilities = self._squared_magnitudes()
+        
+        # Sample by inverting the cumulative distribution
+        cumulative = np.cumsum(probabilities)
+        total = cumulative[-1]
+        if total <= 0:
+            raise ValueError("Cannot measure a state with all-zero amplitudes")
+        measured_state = min(int(np.searchsorted(cumulative, self._rng.random() * total, side="right")), self.dimensions - 1)
+        probability = float(probabilities[measured_state] / total)
         
-        # Collapse the state to the measured value
-        new_amplitudes = np.zeros(self.dimensions)
-        new_amplitudes[measured_state] = 1.0
-        self.amplitudes = new_amplitudes
+        # Collapse the state to the measured value, in place
+        self.amplitudes.fill(0.0)
+        self.amplitudes[measured_state] = 1.0
         
         return measured_state, probability
     
@@ -80,7 +109,7 @@ class QuantumState:
         Returns:
             Array of probabilities for each basis state
         """
-        return np.abs(self.amplitudes) ** 2
+        return self._squared_magnitudes()
 
 class QuantumGates:
     """
@@ -88,10 +117,14 @@ class QuantumGates:
     """
     
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def hadamard(dimensions: int) -> np.ndarray:
         """
         Create a Hadamard-like gate for creating superpositions.
         
+        Gates are cached per dimension and returned read-only; copy one
+        before modifying it.
+        
         Args:
             dimensions: Dimensions of the gate matrix
             
@@ -100,18 +133,16 @@ class QuantumGates:
         """
         # For 2 dimensions, use the standard Hadamard gate
         if dimensions == 2:
-            return np.array([[1, 1], [1, -1]]) / np.sqrt(2)
-        
-        # For higher dimensions, create a generalized Hadamard-like matrix
-        matrix = np.ones((dimensions, dimensions))
-        for i in range(1, dimensions):
-            for j in range(dimensions):
-                if (i * j) % dimensions == 0:
-                    matrix[i, j] = 1
-                else:
-                    matrix[i, j] = -1
-        
-        return matrix / np.sqrt(dimensions)
+            matrix = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+        else:
+            # For higher dimensions, create a generalized Hadamard-like matrix:
+            # +1 where i * j is a multiple of the dimensions, -1 elsewhere
+            indices = np.arange(dimensions)
+            mask = np.outer(indices, indices) % dimensions == 0
+            matrix = np.where(mask, 1.0, -1.0) / np.sqrt(dimensions)
+        
+        matrix.setflags(write=False)
+        return matrix
     
     @staticmethod
     def phase_shift(dimensions: int, phase: float) -> np.ndarray:
@@ -160,6 +191,89 @@ class QuantumGates:
         
         return matrix
 
+def _anneal_core(
+    cost_function: Callable[[np.ndarray], float],
+    dimensions: int,
+    num_iterations: int,
+    initial_temperature: float,
+    final_temperature: float,
+    seed: int
+) -> Tuple[np.ndarray, float]:
+    """
+    Annealing loop of QuantumOptimizer.quantum_annealing, written for Numba.
+    
+    The accept/reject state is kept as two complex amplitudes and the gates
+    are applied as scalar arithmetic instead of matrix products. All gates
+    are unitary, so the state stays normalized without rescaling. Random
+    numbers come from np.random, which Numba replaces with its own
+    generator in compiled code; only call this compiled.
+    
+    Args:
+        cost_function: Numba-compiled function to minimize
+        dimensions: Number of dimensions in the solution space
+        num_iterations: Number of iterations
+        initial_temperature: Starting temperature
+        final_temperature: Final temperature
+        seed: Seed for reproducible results, or -1 for none
+    
+    Returns:
+        Tuple of (best_solution, best_cost)
+    """
+    if seed >= 0:
+        np.random.seed(seed)
+    
+    # Initialize with a random solution
+    current_solution = np.random.random(dimensions)
+    current_cost = cost_function(current_solution)
+    
+    best_solution = current_solution.copy()
+    best_cost = current_cost
+    
+    # Equal superposition of accept (0) and reject (1)
+    inv_sqrt2 = 1.0 / np.sqrt(2.0)
+    amplitude0 = inv_sqrt2 + 0j
+    amplitude1 = inv_sqrt2 + 0j
+    
+    for i in range(num_iterations):
+        temperature = initial_temperature * (final_temperature / initial_temperature) ** (i / num_iterations)
+        
+        # Rotation by pi * i / num_iterations determines the perturbation magnitude
+        angle = np.pi * i / num_iterations
+        cos, sin = np.cos(angle), np.sin(angle)
+        amplitude0, amplitude1 = cos * amplitude0 - sin * amplitude1, sin * amplitude0 + cos * amplitude1
+        perturbation_prob = amplitude0.real ** 2 + amplitude0.imag ** 2
+        
+        perturbation = (np.random.random(dimensions) - 0.5) * perturbation_prob * temperature
+        neighbor_solution = np.minimum(np.maximum(current_solution + perturbation, 0.0), 1.0)
+        neighbor_cost = cost_function(neighbor_solution)
+        
+        if neighbor_cost < current_cost:
+            current_solution = neighbor_solution
+            current_cost = neighbor_cost
+            
+            if current_cost < best_cost:
+                best_solution = current_solution.copy()
+                best_cost = current_cost
+        else:
+            # Hadamard gate, then a phase shift based on the cost difference
+            amplitude0, amplitude1 = (amplitude0 + amplitude1) * inv_sqrt2, (amplitude0 - amplitude1) * inv_sqrt2
+            phase = (neighbor_cost - current_cost) / temperature
+            amplitude1 = amplitude1 * complex(np.cos(phase), np.sin(phase))
+            
+            # Measure and collapse the state
+            accept_prob = amplitude0.real ** 2 + amplitude0.imag ** 2
+            total = accept_prob + amplitude1.real ** 2 + amplitude1.imag ** 2
+            if np.random.random() * total < accept_prob:
+                amplitude0, amplitude1 = 1.0 + 0j, 0j
+                current_solution = neighbor_solution
+                current_cost = neighbor_cost
+            else:
+                amplitude0, amplitude1 = 0j, 1.0 + 0j
+    
+    return best_solution, best_cost
+
+_anneal_core_jit = numba.njit(cache=True)(_anneal_core) if numba is not None else None
+
 class QuantumOptimizer:
     """
     Quantum-inspired optimization algorithms for solving complex problems.
@@ -171,30 +285,54 @@ class QuantumOptimizer:
         dimensions: int,
         num_iterations: int = 1000,
         initial_temperature: float = 10.0,
-        final_temperature: float = 0.1
+        final_temperature: float = 0.1,
+        seed: Optional[int] = None
     ) -> Tuple[np.ndarray, float]:
         """
         Perform quantum-inspired annealing optimization.
         
+        If Numba is installed and cost_function is compiled with numba.njit,
+        the whole loop runs as native code; otherwise it runs in Python.
+        
         Args:
             cost_function: Function to minimize
             dimensions: Number of dimensions in the solution space
             num_iterations: Number of iterations
             initial_temperature: Starting temperature
             final_temperature: Final temperature
+            seed: Optional seed for reproducible results
             
         Returns:
             Tuple of (best_solution, best_cost)
         """
+        if _anneal_core_jit is not None and numba.extending.is_jitted(cost_function):
+            return _anneal_core_jit(
+                cost_function, dimensions, num_iterations, initial_temperature, final_temperature,
+                -1 if seed is None else seed
+            )
+        
+        rng = np.random.default_rng(seed) if seed is not None else _rng
+        
+        # Gates used in the loop, built up front: the rotation angle of
+        # iteration i is pi * i / num_iterations
+        angles = np.pi * np.arange(num_iterations) / num_iterations
+        cos, sin = np.cos(angles), np.sin(angles)
+        rotations = np.empty((num_iterations, 2, 2), dtype=AMPLITUDE_DTYPE)
+        rotations[:, 0, 0] = cos
+        rotations[:, 0, 1] = -sin
+        rotations[:, 1, 0] = sin
+        rotations[:, 1, 1] = cos
+        hadamard = QuantumGates.hadamard(2).astype(AMPLITUDE_DTYPE)
+        
         # Initialize with a random solution
-        current_solution = np.random.rand(dimensions)
+        current_solution = rng.random(dimensions)
         current_cost = cost_function(current_solution)
         
         best_solution = current_solution.copy()
         best_cost = current_cost
         
         # Create a quantum state for tunneling probabilities
-        quantum_state = QuantumState(2)  # 2 dimensions for accept/reject
+        quantum_state = QuantumState(2, rng)  # 2 dimensions for accept/reject
         
         for i in range(num_iterations):
             # Calculate current temperature
@@ -202,11 +340,11 @@ class QuantumOptimizer:
             
             # Generate a neighbor solution with quantum-inspired perturbation
             # Use quantum state to determine perturbation magnitude
-            quantum_state.apply_gate(QuantumGates.rotation(2, np.pi * i / num_iterations))
+            quantum_state.apply_gate(rotations[i])
             perturbation_prob = quantum_state.get_probabilities()[0]
             
             # Apply perturbation
-            perturbation = (np.random.rand(dimensions) - 0.5) * perturbation_prob * temperature
+            perturbation = (rng.random(dimensions) - 0.5) * perturbation_prob * temperature
             neighbor_solution = current_solution + perturbation
             
             # Ensure solution is within bounds [0, 1]
@@ -228,7 +366,7 @@ class QuantumOptimizer:
             else:
                 # For worse solutions, use quantum-inspired acceptance probability
                 # Apply Hadamard gate to create superposition
-                quantum_state.apply_gate(QuantumGates.hadamard(2))
+                quantum_state.apply_gate(hadamard)
                 
                 # Apply phase shift based on cost difference and temperature
                 delta_cost = neighbor_cost - current_cost
@@ -289,15 +427,10 @@ class QuantumDecisionMaker:
             option_index: Index of the preferred option
             strength: Strength of the preference (0.0 to 1.0)
         """
-        # Create a gate that increases amplitude for the preferred option
-        gate = np.eye(self.num_options)
-        gate[option_index, option_index] = 1 + strength
-        
-        # Normalize the gate
-        gate = gate / np.linalg.norm(gate, axis=1, keepdims=True)
-        
-        # Apply the gate
-        self.state.apply_gate(gate)
+        # Increase the amplitude of the preferred option; this is a diagonal
+        # gate, so scale the amplitude directly instead of building a matrix
+        self.state.amplitudes[option_index] *= 1 + strength
+        self.state.normalize()
     
     def add_uncertainty(self, uncertainty_level: float) -> None:
         """
@@ -306,17 +439,36 @@ class QuantumDecisionMaker:
         Args:
             uncertainty_level: Level of uncertainty (0.0 to 1.0)
         """
+        self.state.apply_gate(self._uncertainty_gate(self.num_options, uncertainty_level))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _uncertainty_gate(num_options: int, uncertainty_level: float) -> np.ndarray:
+        """
+        Create the gate that blends the state with a superposition.
+        
+        The gate only depends on its arguments, so it is cached and returned
+        read-only.
+        
+        Args:
+            num_options: Number of decision options
+            uncertainty_level: Level of uncertainty (0.0 to 1.0)
+            
+        Returns:
+            Uncertainty gate matrix
+        """
         # Apply Hadamard-like gate to create superposition
-        hadamard = QuantumGates.hadamard(self.num_options)
+        hadamard = QuantumGates.hadamard(num_options)
         
         # Scale the effect based on uncertainty level
-        gate = np.eye(self.num_options) * (1 - uncertainty_level) + hadamard * uncertainty_level
+        gate = np.eye(num_options) * (1 - uncertainty_level) + hadamard * uncertainty_level
         
         # Normalize the gate
         gate = gate / np.linalg.norm(gate, axis=1, keepdims=True)
         
-        # Apply the gate
-        self.state.apply_gate(gate)
+        gate = gate.astype(AMPLITUDE_DTYPE)
+        gate.setflags(write=False)
+        return gate
     
     def make_decision(self) -> Tuple[str, int, float]:
         """
@@ -335,8 +487,31 @@ class QuantumDecisionMaker:
         Returns:
             Dictionary mapping option labels to probabilities
         """
+        # tolist converts to Python floats in one call, which also keeps the
+        # result JSON-serializable
+        return dict(zip(self.option_labels, self.state.get_probabilities().tolist()))
+    
+    def top_k(self, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Get the most probable decision options.
+        
+        Only the k best options are sorted and converted, so this is cheaper
+        than get_decision_probabilities when there are many options.
+        
+        Args:
+            k: Number of options to return
+            
+        Returns:
+            List of (option_label, probability) tuples, most probable first
+        """
         probabilities = self.state.get_probabilities()
-        return {label: prob for label, prob in zip(self.option_labels, probabilities)}
+        k = min(k, self.num_options)
+        if k <= 0:
+            return []
+        
+        indices = np.argpartition(-probabilities, k - 1)[:k]
+        indices = indices[np.argsort(-probabilities[indices])]
+        return [(self.option_labels[i], float(probabilities[i])) for i in indices]
 
 class QuantumInspiredLogic:
     """
@@ -411,40 +586,32 @@ class QuantumInspiredLogic:
             if len(prior_probabilities) != num_hypotheses:
                 raise ValueError("Number of prior probabilities must match number of hypotheses")
             
-            # Create a diagonal matrix with the square roots of prior probabilities
-            prior_matrix = np.diag(np.sqrt(prior_probabilities))
-            
-            # Normalize the matrix
-            prior_matrix = prior_matrix / np.linalg.norm(prior_matrix, axis=1, keepdims=True)
-            
-            # Apply the prior matrix
-            state.apply_gate(prior_matrix)
+            # Scale the amplitudes by the square roots of the prior probabilities
+            state.amplitudes *= np.sqrt(prior_probabilities)
         
         # Apply evidence impact if provided
         if evidence_impact:
+            # Each item increases the amplitude of one hypothesis; the
+            # diagonal gates are combined into a single scaling
+            scale = np.ones(num_hypotheses)
             for hypothesis_index, impact_strength in evidence_impact:
-                # Create a gate that increases amplitude for the hypothesis
-                gate = np.eye(num_hypotheses)
-                gate[hypothesis_index, hypothesis_index] = 1 + impact_strength
-                
-                # Normalize the gate
-                gate = gate / np.linalg.norm(gate, axis=1, keepdims=True)
-                
-                # Apply the gate
-                state.apply_gate(gate)
+                scale[hypothesis_index] *= 1 + impact_strength
+            state.amplitudes *= scale
+        
+        state.normalize()
         
         # Get the posterior probabilities
         probabilities = state.get_probabilities()
         
-        return {hypothesis: prob for hypothesis, prob in zip(hypotheses, probabilities)}
+        return dict(zip(hypotheses, probabilities.tolist()))
     
     @staticmethod
     def quantum_random(min_val: float = 0.0, max_val: float = 1.0) -> float:
         """
         Generate a quantum-inspired random number.
         
-        This uses quantum-inspired principles to generate random numbers
-        with potentially better properties than classical random numbers.
+        The number is drawn uniformly from the module's shared PCG64
+        generator, without simulating gates on a quantum state.
         
         Args:
             min_val: Minimum value
@@ -453,26 +620,7 @@ class QuantumInspiredLogic:
         Returns:
             Random number between min_val and max_val
         """
-        # Create a 2-dimensional quantum state
-        state = QuantumState(2)
-        
-        # Apply Hadamard gate to create superposition
-        state.apply_gate(QuantumGates.hadamard(2))
-        
-        # Apply random phase shifts to simulate quantum fluctuations
-        for _ in range(3):
-            phase = np.random.rand() * 2 * np.pi
-            state.apply_gate(QuantumGates.phase_shift(2, phase))
-            
-            # Apply rotation gate
-            angle = np.random.rand() * np.pi
-            state.apply_gate(QuantumGates.rotation(2, angle))
-        
-        # Measure the state
-        _, probability = state.measure()
-        
-        # Scale to the desired range
-        return min_val + probability * (max_val - min_val)
+        return min_val + _rng.random() * (max_val - min_val)
 
 # Create a singleton instance
 quantum_logic = QuantumInspiredLogic()
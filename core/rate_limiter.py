@@ -0,0 +1,146 @@
+"""
+Client-side rate limiting for the Syntient AI Assistant Platform.
+
+This module provides token buckets used to keep LLM calls within provider
+quotas (requests and tokens per minute), so that requests wait locally
+instead of being rejected by the server and retried.
+"""
+
+import time
+import asyncio
+import threading
+from typing import Optional
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    The bucket holds up to burst tokens and refills continuously at
+    rate_per_sec. Acquiring blocks until enough tokens are available. The
+    same bucket can be shared by threads and asyncio tasks: the lock is only
+    held to update the token count, never while waiting.
+    """
+    
+    def __init__(self, rate_per_sec: float, burst: Optional[float] = None):
+        """
+        Initialize the token bucket, initially full.
+        
+        Args:
+            rate_per_sec: Number of tokens added per second
+            burst: Capacity of the bucket (default: one second's worth of
+                tokens, at least 1)
+        """
+        if rate_per_sec <= 0:
+            raise ValueError("Rate must be positive")
+        
+        self.rate = rate_per_sec
+        self.capacity = burst if burst is not None else max(1.0, rate_per_sec)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self, tokens: float) -> float:
+        """
+        Take tokens from the bucket if enough are available.
+        
+        Requests larger than the capacity are capped to it, so they wait for
+        a full bucket instead of forever.
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            0 if the tokens were taken, otherwise the seconds to wait before
+            trying again
+        """
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take tokens from the bucket without waiting.
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            True if the tokens were taken
+        """
+        return self._reserve(tokens) == 0.0
+    
+    def acquire(self, tokens: float = 1) -> None:
+        """
+        Take tokens from the bucket, sleeping until they are available.
+        
+        Args:
+            tokens: Number of tokens to take
+        """
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+    
+    async def aacquire(self, tokens: float = 1) -> None:
+        """
+        Take tokens from the bucket, awaiting until they are available.
+        
+        Args:
+            tokens: Number of tokens to take
+        """
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits of one quota.
+    
+    Each limit is a token bucket holding one minute's worth of capacity,
+    matching how providers define their quotas.
+    """
+    
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            requests_per_minute: Maximum requests per minute (None for no limit)
+            tokens_per_minute: Maximum tokens per minute (None for no limit)
+        """
+        self.requests = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+    
+    def acquire(self, tokens: float = 0) -> None:
+        """
+        Wait until a request using the given number of tokens is allowed.
+        
+        Args:
+            tokens: Estimated number of tokens used by the request
+        """
+        if self.requests is not None:
+            self.requests.acquire()
+        if self.tokens is not None and tokens:
+            self.tokens.acquire(tokens)
+    
+    async def aacquire(self, tokens: float = 0) -> None:
+        """
+        Await until a request using the given number of tokens is allowed.
+        
+        Args:
+            tokens: Estimated number of tokens used by the request
+        """
+        if self.requests is not None:
+            await self.requests.aacquire()
+        if self.tokens is not None and tokens:
+            await self.tokens.aacquire(tokens)
@@ -7,16 +7,14 @@ and convert them into appropriate tool calls.
 
 import re
 import logging
+import functools
 from typing import Dict, Any, Optional, Tuple
-from urllib.parse import urlparse
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Number of URL validation results kept by TaskDetector
+URL_CACHE_SIZE = 1024
+
 class TaskDetector:
     """
     Detects tasks that can be handled by tools and converts them to tool calls.
@@ -27,21 +25,37 @@ class TaskDetector:
     
     def __init__(self):
         """Initialize the task detector with pattern recognition rules."""
-        # Define patterns for different types of tasks
-        self.patterns = {
+        # Define patterns for different types of tasks; each captures exactly
+        # one group holding the tool argument
+        raw_patterns = {
             "url_summary": [
-                r"(?i)summarize\s+(https?://\S+)",
-                r"(?i)summarize\s+the\s+content\s+(?:at|on|of|from)\s+(https?://\S+)",
-                r"(?i)give\s+(?:me\s+)?a\s+summary\s+of\s+(https?://\S+)",
-                r"(?i)what(?:'s|\s+is)\s+(?:on|at)\s+(https?://\S+)",
-                r"(?i)extract\s+(?:the\s+)?(?:content|information|text)\s+from\s+(https?://\S+)"
+                r"summarize\s+(https?://\S+)",
+                r"summarize\s+the\s+content\s+(?:at|on|of|from)\s+(https?://\S+)",
+                r"give\s+(?:me\s+)?a\s+summary\s+of\s+(https?://\S+)",
+                r"what(?:'s|\s+is)\s+(?:on|at)\s+(https?://\S+)",
+                r"extract\s+(?:the\s+)?(?:content|information|text)\s+from\s+(https?://\S+)"
             ],
             "code_execution": [
-                r"(?i)execute\s+(?:this|the\s+following)\s+(?:python\s+)?code[:\n]+(.*?)(?:\n\s*$|\Z)",
-                r"(?i)run\s+(?:this|the\s+following)\s+(?:python\s+)?code[:\n]+(.*?)(?:\n\s*$|\Z)",
-                r"(?i)evaluate\s+(?:this|the\s+following)\s+(?:python\s+)?code[:\n]+(.*?)(?:\n\s*$|\Z)"
+                r"execute\s+(?:this|the\s+following)\s+(?:python\s+)?code[:\n]+(.*?)(?:\n\s*$|\Z)",
+                r"run\s+(?:this|the\s+following)\s+(?:python\s+)?code[:\n]+(.*?)(?:\n\s*$|\Z)",
+                r"evaluate\s+(?:this|the\s+following)\s+(?:python\s+)?code[:\n]+(.*?)(?:\n\s*$|\Z)"
             ]
         }
+        
+        # Compile the alternatives of each task type into a single regex, so a
+        # message is scanned once per task type instead of once per pattern
+        self.patterns = {
+            task_type: re.compile(
+                "|".join(f"(?:{pattern})" for pattern in patterns),
+                re.IGNORECASE | re.DOTALL
+            )
+            for task_type, patterns in raw_patterns.items()
+        }
+        
+        # Literal words every pattern of a task type requires, checked before
+        # running its regexes so plain chat messages skip them entirely
+        self._url_keyword = "http"
+        self._code_keywords = ("execute", "run", "evaluate")
     
     def detect_task(self, user_input: str) -> Optional[Tuple[str, Dict[str, Any]]]:
         """
@@ -53,21 +67,22 @@ class TaskDetector:
         Returns:
             Tuple of (tool_name, tool_args) if a task is detected, None otherwise
         """
+        lowered = user_input.lower()
+        
         # Check for URL summary tasks
-        for pattern in self.patterns["url_summary"]:
-            match = re.search(pattern, user_input, re.DOTALL)
-            if match:
-                url = match.group(1).strip()
+        if self._url_keyword in lowered:
+            for match in self.patterns["url_summary"].finditer(user_input):
+                # The matched alternative's group is the only one set
+                url = match.group(match.lastindex).strip()
                 # Validate URL
                 if self._is_valid_url(url):
                     logger.info(f"Detected URL summary task for: {url}")
                     return "browser_use", {"url": url}
         
         # Check for code execution tasks
-        for pattern in self.patterns["code_execution"]:
-            match = re.search(pattern, user_input, re.DOTALL)
-            if match:
-                code = match.group(1).strip()
+        if any(keyword in lowered for keyword in self._code_keywords):
+            for match in self.patterns["code_execution"].finditer(user_input):
+                code = match.group(match.lastindex).strip()
                 if code:
                     logger.info("Detected code execution task")
                     return "code_executor", {"code": code}
@@ -75,21 +90,34 @@ class TaskDetector:
         # No task detected
         return None
     
-    def _is_valid_url(self, url: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=URL_CACHE_SIZE)
+    def _is_valid_url(url: str) -> bool:
         """
         Check if a URL is valid.
         
+        A URL is valid if it has a scheme and a non-empty host. The patterns
+        already guarantee an http(s) scheme, so this only looks for the host
+        between "://" and the first "/", "?" or "#", without running a full
+        urlparse.
+        
         Args:
             url: The URL to check
             
         Returns:
             True if the URL is valid, False otherwise
         """
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except Exception:
+        start = url.find("://")
+        if start <= 0:
             return False
+        
+        start += 3
+        end = len(url)
+        for delimiter in ("/", "?", "#"):
+            position = url.find(delimiter, start, end)
+            if position >= 0:
+                end = position
+        return end > start
     
     def format_tool_call(self, tool_name: str, tool_args: Dict[str, Any]) -> str:
         """
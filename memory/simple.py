@@ -4,11 +4,18 @@ Simple memory implementation for the Syntient AI Assistant Platform.
 This module provides a basic in-memory storage implementation of the Memory interface.
 """
 
+import re
 import time
 import uuid
-from typing import Dict, Any, List, Optional, Union
+from collections import defaultdict
+from copy import deepcopy
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Set, Union
 from .base import Memory
 
+# Tokens of the search index
+_TOKEN_RE = re.compile(r"\w+")
+
 
 class SimpleMemory(Memory):
     """
@@ -29,6 +36,95 @@ class SimpleMemory(Memory):
         super().__init__(memory_id)
         self.data = {}  # Dictionary to store memory items
         self.metadata = {}  # Dictionary to store metadata for each item
+        
+        # Inverted index of the lowercased tokens of each item, used to narrow
+        # searches down to the items that can contain the query
+        self._index: Dict[str, Set[str]] = defaultdict(set)
+        self._tokens: Dict[str, Set[str]] = {}
+        
+        # String forms of the items searched by substring: lowercased for
+        # case-insensitive searches, and as-is only once a case-sensitive
+        # search needs them
+        self._search_blob: Dict[str, str] = {}
+        self._search_blob_cs: Dict[str, str] = {}
+    
+    def _index_item(self, reference_id: str) -> None:
+        """
+        Add an item to the search index, replacing any previous entry.
+        
+        Args:
+            reference_id: Reference ID of the item to index
+        """
+        self._unindex_item(reference_id)
+        blob = str(self.data[reference_id]).lower()
+        self._search_blob[reference_id] = blob
+        tokens = set(_TOKEN_RE.findall(blob))
+        for token in tokens:
+            self._index[token].add(reference_id)
+        self._tokens[reference_id] = tokens
+    
+    def _unindex_item(self, reference_id: str) -> None:
+        """
+        Remove an item from the search index.
+        
+        Args:
+            reference_id: Reference ID of the item to remove
+        """
+        self._search_blob.pop(reference_id, None)
+        self._search_blob_cs.pop(reference_id, None)
+        for token in self._tokens.pop(reference_id, ()):
+            postings = self._index[token]
+            postings.discard(reference_id)
+            if not postings:
+                del self._index[token]
+    
+    def _search_candidates(self, query: str) -> Optional[Set[str]]:
+        """
+        Find the items that can contain a lowercased query as a substring.
+        
+        A token in the middle of the query must be a whole token of the item.
+        The first token may be the end of a longer token and the last one the
+        start of a longer token, so those are matched against the vocabulary.
+        
+        Args:
+            query: Lowercased search query
+            
+        Returns:
+            Set of candidate reference IDs, or None if the query has no tokens
+            and every item has to be scanned
+        """
+        matches = list(_TOKEN_RE.finditer(query))
+        if not matches:
+            return None
+        
+        # Match the whole tokens first, since they are the cheapest lookups
+        matches.sort(key=lambda match: match.start() == 0 or match.end() == len(query))
+        
+        candidates = None
+        for match in matches:
+            token = match.group()
+            open_start = match.start() == 0
+            open_end = match.end() == len(query)
+            
+            if not open_start and not open_end:
+                postings = self._index.get(token, set())
+            else:
+                postings = set()
+                for indexed, ids in self._index.items():
+                    if open_start and open_end:
+                        matched = token in indexed
+                    elif open_start:
+                        matched = indexed.endswith(token)
+                    else:
+                        matched = indexed.startswith(token)
+                    if matched:
+                        postings |= ids
+            
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        
+        return candidates
     
     def add(self, data: Dict[str, Any], **kwargs) -> str:
         """
@@ -46,25 +142,32 @@ class SimpleMemory(Memory):
         # Use provided reference_id or generate a new UUID
         reference_id = kwargs.get('reference_id', str(uuid.uuid4()))
         
-        # Store the data
-        self.data[reference_id] = data.copy()  # Store a copy to prevent modification
+        # Store a deep copy, so the caller cannot change the data (and leave
+        # the search index stale) through nested values
+        self.data[reference_id] = deepcopy(data)
+        self._index_item(reference_id)
         
         # Store metadata
+        now = time.time()
         self.metadata[reference_id] = {
-            'timestamp': time.time(),
-            'last_accessed': time.time(),
+            'timestamp': now,
+            'last_accessed': now,
             'access_count': 0,
             'custom': kwargs.get('metadata', {})
         }
         
         return reference_id
     
-    def get(self, reference_id: str) -> Optional[Dict[str, Any]]:
+    def get(self, reference_id: str, copy: bool = True) -> Optional[Mapping[str, Any]]:
         """
         Retrieve data from memory by reference ID.
         
         Args:
             reference_id: Reference ID of the data to retrieve
+            copy: Return a deep copy of the data; if False, return a view of
+                the stored data instead. Only the top level of the view is
+                read-only: nested values are the stored ones and must not be
+                modified, or searches go stale
             
         Returns:
             Retrieved data, or None if not found
@@ -73,11 +176,14 @@ class SimpleMemory(Memory):
             return None
         
         # Update metadata
-        self.metadata[reference_id]['last_accessed'] = time.time()
-        self.metadata[reference_id]['access_count'] += 1
-        
-        # Return a copy of the data to prevent modification
-        return self.data[reference_id].copy()
+        meta = self.metadata[reference_id]
+        meta['last_accessed'] = time.time()
+        meta['access_count'] += 1
+        
+        # Return a deep copy or a (top-level) read-only view of the data
+        if not copy:
+            return MappingProxyType(self.data[reference_id])
+        return deepcopy(self.data[reference_id])
     
     def search(self, query: str, **kwargs) -> List[Dict[str, Any]]:
         """
@@ -91,38 +197,61 @@ class SimpleMemory(Memory):
             **kwargs: Additional search parameters:
                 - max_results: Maximum number of results to return
                 - case_sensitive: Whether to perform case-sensitive search
+                - copy: Whether to return copies of the data and metadata
+                  (default); if False, views are returned instead, which are
+                  read-only at the top level only (see get)
             
         Returns:
             List of matching data items with their reference IDs
         """
         max_results = kwargs.get('max_results', 10)
         case_sensitive = kwargs.get('case_sensitive', False)
+        copy = kwargs.get('copy', True)
+        wrap_data = deepcopy if copy else MappingProxyType
+        wrap_meta = dict.copy if copy else MappingProxyType
         
         results = []
         
+        # The index is case-insensitive, so it also narrows down
+        # case-sensitive searches; the candidates are then checked as before
+        candidates = self._search_candidates(query.lower())
+        if candidates is not None and not candidates:
+            return results
+        
         # Convert query to lowercase if case-insensitive
         if not case_sensitive:
             query = query.lower()
         
+        # All hits share the access time of this search
+        now = time.time()
+        
         for ref_id, item in self.data.items():
-            # Convert item to string for searching
-            item_str = str(item)
+            if candidates is not None and ref_id not in candidates:
+                continue
             
-            # Convert to lowercase if case-insensitive
-            if not case_sensitive:
-                item_str = item_str.lower()
+            # Use the cached string form of the item for searching; an empty
+            # query matches every item, so it does not need one
+            if not query:
+                item_str = query
+            elif case_sensitive:
+                item_str = self._search_blob_cs.get(ref_id)
+                if item_str is None:
+                    item_str = self._search_blob_cs[ref_id] = str(item)
+            else:
+                item_str = self._search_blob[ref_id]
             
             # Check if query is in the item string
             if query in item_str:
+                meta = self.metadata[ref_id]
                 results.append({
                     'reference_id': ref_id,
-                    'data': item.copy(),  # Return a copy
-                    'metadata': self.metadata[ref_id].copy()  # Return a copy
+                    'data': wrap_data(item),  # Return a copy or read-only view
+                    'metadata': wrap_meta(meta)
                 })
                 
                 # Update metadata
-                self.metadata[ref_id]['last_accessed'] = time.time()
-                self.metadata[ref_id]['access_count'] += 1
+                meta['last_accessed'] = now
+                meta['access_count'] += 1
                 
                 # Limit results
                 if len(results) >= max_results:
@@ -144,8 +273,9 @@ class SimpleMemory(Memory):
         if reference_id not in self.data:
             return False
         
-        # Update the data
-        self.data[reference_id] = data.copy()  # Store a copy
+        # Update the data, storing a deep copy as in add()
+        self.data[reference_id] = deepcopy(data)
+        self._index_item(reference_id)
         
         # Update metadata
         self.metadata[reference_id]['timestamp'] = time.time()
@@ -168,6 +298,7 @@ class SimpleMemory(Memory):
         # Remove the data and metadata
         del self.data[reference_id]
         del self.metadata[reference_id]
+        self._unindex_item(reference_id)
         
         return True
     
@@ -180,6 +311,10 @@ class SimpleMemory(Memory):
         """
         self.data = {}
         self.metadata = {}
+        self._index = defaultdict(set)
+        self._tokens = {}
+        self._search_blob = {}
+        self._search_blob_cs = {}
         return True
     
     def get_stats(self) -> Dict[str, Any]:
@@ -189,12 +324,24 @@ class SimpleMemory(Memory):
         Returns:
             Dictionary with memory statistics
         """
+        # Collect all aggregates in a single pass over the metadata
+        oldest = newest = None
+        most_accessed, most_access_count = None, -1
+        for ref_id, meta in self.metadata.items():
+            timestamp = meta['timestamp']
+            if oldest is None or timestamp < oldest:
+                oldest = timestamp
+            if newest is None or timestamp > newest:
+                newest = timestamp
+            if meta['access_count'] > most_access_count:
+                most_accessed, most_access_count = ref_id, meta['access_count']
+        
         return {
             'memory_id': self.memory_id,
             'item_count': len(self.data),
-            'oldest_timestamp': min([meta['timestamp'] for meta in self.metadata.values()]) if self.metadata else None,
-            'newest_timestamp': max([meta['timestamp'] for meta in self.metadata.values()]) if self.metadata else None,
-            'most_accessed': max(self.metadata.items(), key=lambda x: x[1]['access_count'])[0] if self.metadata else None
+            'oldest_timestamp': oldest,
+            'newest_timestamp': newest,
+            'most_accessed': most_accessed
         }
 
 
@@ -16,12 +16,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.assistant import Assistant
 from core.continuous_loop import ContinuousExecutionLoop
+from core.logging_config import configure_once
+from config import get_config
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_once()
 logger = logging.getLogger(__name__)
 
 def status_callback(status):
@@ -64,7 +63,8 @@ def main():
         assistant=assistant,
         max_iterations=20,  # Limit to 20 iterations for this example
         iteration_delay=2.0,  # 2 second delay between iterations
-        status_callback=status_callback
+        status_callback=status_callback,
+        history_db_path=get_config()["continuous_execution"]["history_db_path"]
     )
     
     # Define a task
@@ -16,12 +16,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.assistant import Assistant
 from core.enhanced_planning import EnhancedPlanner
+from core.logging_config import configure_once
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_once()
 logger = logging.getLogger(__name__)
 
 def print_plan_summary(plan_summary):
@@ -24,12 +24,10 @@ from tools.browser_use import BrowserUseTool
 from tools.file_parser import FileParserTool
 from tools.code_executor import CodeExecutorTool
 from tools.web_search import WebSearchTool
+from core.logging_config import configure_once
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_once()
 logger = logging.getLogger(__name__)
 
 class SyntientEnhancementsTest(unittest.TestCase):
@@ -0,0 +1,138 @@
+"""
+Test script for the SQLite-backed execution history.
+
+These tests run offline against in-memory and temporary database files.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.execution_history import (
+    COMPRESSION_THRESHOLD,
+    PREVIEW_LENGTH,
+    CompressedContent,
+    ExecutionHistory,
+    HistoryEntry,
+    compact_content,
+    ENTRY_ERROR,
+    ENTRY_EXECUTION,
+    ENTRY_PLAN,
+)
+
+
+def stored_count(history: ExecutionHistory) -> int:
+    """Count the entries written to the database, excluding pending ones."""
+    return history._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+
+class ExecutionHistoryTest(unittest.TestCase):
+    """Test case for ExecutionHistory."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.history = ExecutionHistory(batch_size=3)
+    
+    def tearDown(self):
+        """Close the history database."""
+        self.history.close()
+    
+    def test_entries_are_buffered_until_batch_size(self):
+        """Test that entries are written in batches and flush writes the rest."""
+        for index in range(2):
+            self.history.append(HistoryEntry(ENTRY_EXECUTION, f"step {index}"))
+        self.assertEqual(stored_count(self.history), 0)
+        self.assertEqual(len(self.history), 2)
+        
+        self.history.append(HistoryEntry(ENTRY_EXECUTION, "step 2"))
+        self.assertEqual(stored_count(self.history), 3)
+        
+        self.history.append(HistoryEntry(ENTRY_EXECUTION, "step 3"))
+        self.assertEqual(stored_count(self.history), 3)
+        self.history.flush()
+        self.assertEqual(stored_count(self.history), 4)
+        self.assertEqual([entry.content for entry in self.history], [f"step {index}" for index in range(4)])
+    
+    def test_recent_merges_stored_and_pending_entries(self):
+        """Test that recent returns the latest entries oldest first."""
+        for index in range(5):
+            self.history.append(HistoryEntry(ENTRY_EXECUTION, index))
+        
+        self.assertEqual([entry.content for entry in self.history.recent(4)], [1, 2, 3, 4])
+        self.assertEqual([entry.content for entry in self.history.recent(1)], [4])
+        self.assertEqual([entry.content for entry in self.history.recent(10)], [0, 1, 2, 3, 4])
+    
+    def test_last_of_type(self):
+        """Test that last_of_type finds the latest entry in the database or the buffer."""
+        self.assertIsNone(self.history.last_of_type(ENTRY_ERROR))
+        
+        self.history.append(HistoryEntry(ENTRY_ERROR, "first error"))
+        self.history.append(HistoryEntry(ENTRY_PLAN, ["step"]))
+        self.history.append(HistoryEntry(ENTRY_EXECUTION, "done"))
+        self.assertEqual(self.history.last_of_type(ENTRY_ERROR).content, "first error")
+        
+        self.history.append(HistoryEntry(ENTRY_ERROR, "second error"))
+        self.assertEqual(self.history.last_of_type(ENTRY_ERROR).content, "second error")
+        self.assertEqual(self.history.last_of_type(ENTRY_PLAN).content, ["step"])
+    
+    def test_compressed_content_round_trip(self):
+        """Test that compressed content survives being stored and read back."""
+        text = "traceback line\n" * (COMPRESSION_THRESHOLD // 10)
+        content = compact_content(text)
+        self.assertIsInstance(content, CompressedContent)
+        self.assertEqual(content[:PREVIEW_LENGTH], text[:PREVIEW_LENGTH])
+        
+        self.history.append(HistoryEntry(ENTRY_ERROR, content, timestamp=123.0))
+        self.history.flush()
+        
+        entry = self.history.last_of_type(ENTRY_ERROR)
+        self.assertIsInstance(entry.content, CompressedContent)
+        self.assertEqual(str(entry.content), text)
+        self.assertEqual(entry.to_dict(), {"type": ENTRY_ERROR, "content": text, "timestamp": 123.0})
+    
+    def test_short_content_is_not_compressed(self):
+        """Test that short text and other content are stored as they are."""
+        self.assertEqual(compact_content("short"), "short")
+        self.assertEqual(compact_content({"key": "value"}), {"key": "value"})
+    
+    def test_unserializable_content_fails_on_append(self):
+        """Test that content that cannot be stored is rejected without breaking later flushes."""
+        with self.assertRaises(TypeError):
+            self.history.append(HistoryEntry(ENTRY_EXECUTION, object()))
+        
+        self.history.append(HistoryEntry(ENTRY_EXECUTION, "ok"))
+        self.history.flush()
+        self.assertEqual([entry.content for entry in self.history], ["ok"])
+    
+    def test_clear(self):
+        """Test that clear removes stored and pending entries."""
+        for index in range(4):
+            self.history.append(HistoryEntry(ENTRY_EXECUTION, index))
+        self.history.clear()
+        self.assertEqual(len(self.history), 0)
+        self.assertEqual(self.history.recent(5), [])
+    
+    def test_file_database_survives_reopening(self):
+        """Test that entries written to a database file can be read after reopening it."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.db")
+            history = ExecutionHistory(path, batch_size=10)
+            history.append(HistoryEntry(ENTRY_PLAN, ["a", "b"]))
+            history.append(HistoryEntry(ENTRY_ERROR, compact_content("x" * (COMPRESSION_THRESHOLD + 1))))
+            history.close()
+            
+            reopened = ExecutionHistory(path)
+            try:
+                journal_mode = reopened._conn.execute("PRAGMA journal_mode").fetchone()[0]
+                self.assertEqual(journal_mode, "wal")
+                self.assertEqual([entry.type for entry in reopened], [ENTRY_PLAN, ENTRY_ERROR])
+                self.assertEqual(str(reopened.last_of_type(ENTRY_ERROR).content), "x" * (COMPRESSION_THRESHOLD + 1))
+            finally:
+                reopened.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+"""
+Test script for the prompt cache and its Bloom filter.
+
+These tests run offline; embeddings come from a small deterministic
+function and time is mocked where TTLs are involved.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import prompt_cache
+from core.prompt_cache import BloomFilter, PromptCache, prompt_key
+
+# Embeddings of the test prompts: "alpha" and "alpha!" are nearly identical,
+# "beta" is orthogonal to both
+EMBEDDINGS = {
+    "alpha": (1.0, 0.0, 0.0),
+    "alpha!": (0.99, 0.1, 0.0),
+    "alpha?": (0.8, 0.6, 0.0),
+    "beta": (0.0, 1.0, 0.0),
+}
+
+
+class CountingEmbedding:
+    """Embedding function that records the prompts it embeds."""
+    
+    def __init__(self):
+        """Initialize the call log."""
+        self.calls = []
+    
+    def __call__(self, prompt: str):
+        """Return the test embedding of a prompt."""
+        self.calls.append(prompt)
+        return EMBEDDINGS.get(prompt, (0.0, 0.0, 1.0))
+
+
+class BloomFilterTest(unittest.TestCase):
+    """Test case for BloomFilter."""
+    
+    def test_no_false_negatives(self):
+        """Test that every added key is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [prompt_key(f"prompt {index}") for index in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        
+        self.assertEqual(len(bloom), 1000)
+        for key in keys:
+            self.assertIn(key, bloom)
+    
+    def test_false_positive_rate(self):
+        """Test that the false-positive rate at capacity stays near the target."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for index in range(1000):
+            bloom.add(f"added {index}")
+        
+        false_positives = sum(f"absent {index}" in bloom for index in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+    
+    def test_clear(self):
+        """Test that clear removes every key."""
+        bloom = BloomFilter(capacity=10)
+        bloom.add("key")
+        bloom.clear()
+        self.assertNotIn("key", bloom)
+        self.assertEqual(len(bloom), 0)
+    
+    def test_invalid_parameters(self):
+        """Test that invalid sizes and error rates are rejected."""
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=0)
+        with self.assertRaises(ValueError):
+            BloomFilter(error_rate=1.0)
+
+
+class PromptCacheTest(unittest.TestCase):
+    """Test case for PromptCache."""
+    
+    def test_exact_hit_returns_copy(self):
+        """Test exact hits, misses and that cached responses cannot be modified by callers."""
+        cache = PromptCache()
+        self.assertIsNone(cache.get("alpha"))
+        
+        response = {"response": "A"}
+        cache.put("alpha", response)
+        response["response"] = "changed"
+        
+        hit = cache.get("alpha")
+        self.assertEqual(hit, {"response": "A"})
+        hit["response"] = "changed"
+        self.assertEqual(cache.get("alpha"), {"response": "A"})
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        with mock.patch.object(prompt_cache, "time") as fake_time:
+            fake_time.time.return_value = 1000.0
+            cache = PromptCache(ttl=10)
+            cache.put("alpha", {"response": "A"})
+            
+            fake_time.time.return_value = 1009.0
+            self.assertEqual(cache.get("alpha"), {"response": "A"})
+            
+            fake_time.time.return_value = 1010.0
+            self.assertIsNone(cache.get("alpha"))
+            self.assertEqual(len(cache), 0)
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted beyond max_entries."""
+        cache = PromptCache(max_entries=2)
+        cache.put("one", {"response": "1"})
+        cache.put("two", {"response": "2"})
+        cache.get("one")
+        cache.put("three", {"response": "3"})
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("two"))
+        self.assertEqual(cache.get("one"), {"response": "1"})
+        self.assertEqual(cache.get("three"), {"response": "3"})
+    
+    def test_semantic_hit_threshold(self):
+        """Test that similar prompts hit only at or above the similarity threshold."""
+        cache = PromptCache(similarity_threshold=0.95, embedding_function=CountingEmbedding())
+        cache.put("alpha", {"response": "A"})
+        
+        self.assertEqual(cache.get("alpha!"), {"response": "A"})
+        self.assertIsNone(cache.get("alpha?"))
+        self.assertIsNone(cache.get("beta"))
+    
+    def test_semantic_hit_ignores_expired_entries(self):
+        """Test that expired entries are not returned as semantic hits."""
+        with mock.patch.object(prompt_cache, "time") as fake_time:
+            fake_time.time.return_value = 1000.0
+            cache = PromptCache(ttl=10, embedding_function=CountingEmbedding())
+            cache.put("alpha", {"response": "A"})
+            
+            fake_time.time.return_value = 1010.0
+            self.assertIsNone(cache.get("alpha!"))
+    
+    def test_miss_embedding_is_reused_by_put(self):
+        """Test that a semantic miss followed by a put embeds the prompt once."""
+        embedding = CountingEmbedding()
+        cache = PromptCache(embedding_function=embedding)
+        
+        self.assertIsNone(cache.get("beta"))
+        cache.put("beta", {"response": "B"})
+        self.assertEqual(embedding.calls, ["beta"])
+        
+        # Without a preceding miss, put computes the embedding itself
+        cache.put("alpha", {"response": "A"})
+        self.assertEqual(embedding.calls, ["beta", "alpha"])
+    
+    def test_pending_embeddings_are_bounded(self):
+        """Test that embeddings of misses without a put do not accumulate."""
+        cache = PromptCache(embedding_function=CountingEmbedding())
+        for index in range(prompt_cache._PENDING_EMBEDDINGS + 10):
+            cache.get(f"prompt {index}")
+        self.assertEqual(len(cache._pending_embeddings), prompt_cache._PENDING_EMBEDDINGS)
+        
+        cache.clear()
+        self.assertEqual(len(cache._pending_embeddings), 0)
+    
+    def test_bloom_precheck_skips_first_time_prompts(self):
+        """Test that the Bloom pre-check keeps unseen prompts off the embedding path."""
+        embedding = CountingEmbedding()
+        cache = PromptCache(embedding_function=embedding, bloom_precheck=True)
+        cache.put("alpha", {"response": "A"})
+        embedding.calls.clear()
+        
+        self.assertIsNone(cache.get("alpha!"))
+        self.assertEqual(embedding.calls, [])
+    
+    def test_clear(self):
+        """Test that clear removes entries and resets the statistics."""
+        cache = PromptCache()
+        cache.put("alpha", {"response": "A"})
+        cache.get("alpha")
+        cache.clear()
+        
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        self.assertIsNone(cache.get("alpha"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Test script for the SimpleMemory search index.
+
+These tests run offline: SimpleMemory.search is checked against a
+brute-force substring scan over the stored items.
+"""
+
+import os
+import sys
+import random
+import unittest
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.simple import SimpleMemory
+
+# Words the random items and queries are built from
+WORDS = ["alpha", "beta", "gamma", "delta", "Zebra", "hi", "a", "b-c", "x_y", "42", "Hello world"]
+
+
+def brute_force_search(memory: SimpleMemory, query: str, case_sensitive: bool = False):
+    """
+    Find the reference IDs of the items containing a query by scanning them all.
+    
+    Args:
+        memory: Memory to scan
+        query: Search query
+        case_sensitive: Whether to perform case-sensitive search
+    
+    Returns:
+        Set of matching reference IDs
+    """
+    if case_sensitive:
+        return {ref_id for ref_id, item in memory.data.items() if query in str(item)}
+    return {ref_id for ref_id, item in memory.data.items() if query.lower() in str(item).lower()}
+
+
+class SimpleMemorySearchTest(unittest.TestCase):
+    """Test case for SimpleMemory searches."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.memory = SimpleMemory("test")
+        self.random = random.Random(0)
+    
+    def search_ids(self, query: str, case_sensitive: bool = False):
+        """Search the memory and return the set of matching reference IDs."""
+        results = self.memory.search(query, max_results=len(self.memory.data) + 1, case_sensitive=case_sensitive)
+        return {result["reference_id"] for result in results}
+    
+    def random_item(self):
+        """Build a random item with nested values."""
+        words = self.random.sample(WORDS, 3)
+        return {
+            "text": " ".join(words),
+            "tags": self.random.sample(WORDS, 2),
+            "nested": {"value": self.random.choice(WORDS), "count": self.random.randint(0, 100)}
+        }
+    
+    def test_search_matches_brute_force(self):
+        """Test that indexed searches find the same items as a full scan."""
+        for _ in range(50):
+            self.memory.add(self.random_item())
+        
+        queries = WORDS + ["", " ", "lph", "ta gam", "'tags'", "world'", "ZEB", "hello WORLD", "4", "nomatch", "-c", "{"]
+        for query in queries:
+            for case_sensitive in (False, True):
+                with self.subTest(query=query, case_sensitive=case_sensitive):
+                    self.assertEqual(
+                        self.search_ids(query, case_sensitive),
+                        brute_force_search(self.memory, query, case_sensitive)
+                    )
+    
+    def test_search_after_update_and_delete(self):
+        """Test that updated and deleted items are reindexed."""
+        ref_ids = [self.memory.add(self.random_item()) for _ in range(20)]
+        for ref_id in ref_ids[:5]:
+            self.memory.update(ref_id, {"text": "updated zebra"})
+        for ref_id in ref_ids[5:10]:
+            self.memory.delete(ref_id)
+        
+        for query in WORDS + ["updated", "updated zeb"]:
+            with self.subTest(query=query):
+                self.assertEqual(self.search_ids(query), brute_force_search(self.memory, query))
+    
+    def test_caller_mutations_do_not_affect_search(self):
+        """Test that mutating added or returned data leaves the stored items unchanged."""
+        data = {"msgs": ["hi"]}
+        ref_id = self.memory.add(data)
+        data["msgs"].append("zebra")
+        self.memory.get(ref_id)["msgs"].append("zebra")
+        self.memory.search("hi")[0]["data"]["msgs"].append("zebra")
+        
+        self.assertEqual(self.memory.get(ref_id), {"msgs": ["hi"]})
+        self.assertEqual(self.search_ids("zebra"), set())
+        self.assertEqual(self.search_ids("zebra"), brute_force_search(self.memory, "zebra"))
+        
+        updated = {"msgs": ["hello"]}
+        self.memory.update(ref_id, updated)
+        updated["msgs"].append("zebra")
+        self.assertEqual(self.search_ids("zebra"), set())
+        self.assertEqual(self.search_ids("hello"), {ref_id})
+    
+    def test_read_only_views(self):
+        """Test that views returned without copying cannot be modified at the top level."""
+        ref_id = self.memory.add({"text": "alpha"})
+        view = self.memory.get(ref_id, copy=False)
+        with self.assertRaises(TypeError):
+            view["text"] = "beta"
+        
+        result = self.memory.search("alpha", copy=False)[0]
+        with self.assertRaises(TypeError):
+            result["data"]["text"] = "beta"
+    
+    def test_max_results(self):
+        """Test that searches stop at max_results."""
+        for _ in range(10):
+            self.memory.add({"text": "alpha"})
+        self.assertEqual(len(self.memory.search("alpha", max_results=3)), 3)
+
+if __name__ == "__main__":
+    unittest.main()
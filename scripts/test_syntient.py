@@ -21,12 +21,10 @@ from core.assistant import Assistant
 from core.continuous_loop import ContinuousExecutionLoop
 from core.enhanced_planning import EnhancedPlanner
 from config import get_config
+from core.logging_config import configure_once
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_once()
 logger = logging.getLogger(__name__)
 
 class SyntientTestCase(unittest.TestCase):
@@ -12,5 +12,5 @@ setup(
         "flask",
         "requests",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.9",
 )
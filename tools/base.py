@@ -11,11 +11,6 @@ import inspect
 import json
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class Tool(ABC):
@@ -25,16 +20,23 @@ class Tool(ABC):
     All tools must inherit from this class and implement the required methods.
     """
     
-    def __init__(self, name: str, description: str):
+    def __init__(self, name: str, description: str, request_type: str = "command"):
         """
         Initialize a tool with a name and description.
         
         Args:
             name: Unique identifier for the tool
             description: Human-readable description of what the tool does
+            request_type: "informational" for tools that only retrieve
+                information, or "command" for tools with side effects (default).
+                Only selections of informational tools are cached.
         """
+        if request_type not in ("informational", "command"):
+            raise ValueError(f"Invalid request type: {request_type}")
+        
         self.name = name
         self.description = description
+        self.request_type = request_type
     
     @abstractmethod
     def run(self, **kwargs) -> Dict[str, Any]:
@@ -59,7 +61,8 @@ class Tool(ABC):
         return {
             "name": self.name,
             "description": self.description,
-            "parameters": self._get_parameters_schema()
+            "parameters": self._get_parameters_schema(),
+            "request_type": self.request_type
         }
     
     def _get_parameters_schema(self) -> Dict[str, Any]:
@@ -13,11 +13,6 @@ import re
 
 from .base import Tool
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class BrowserUseTool(Tool):
@@ -31,7 +26,8 @@ class BrowserUseTool(Tool):
         """Initialize the browser use tool."""
         super().__init__(
             name="browser_use",
-            description="Browse websites and extract information"
+            description="Browse websites and extract information",
+            request_type="informational"
         )
         # Common headers to mimic a real browser
         self.headers = {
@@ -7,6 +7,7 @@ This module provides a functional tool for executing Python code safely.
 import logging
 import sys
 import io
+import threading
 import traceback
 from typing import Dict, Any, Optional
 import ast
@@ -15,13 +16,12 @@ import contextlib
 
 from .base import Tool
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# redirect_stdout/redirect_stderr swap the process-wide sys.stdout and
+# sys.stderr, so only one execution may capture its output at a time
+_OUTPUT_CAPTURE_LOCK = threading.Lock()
+
 class CodeExecutorTool(Tool):
     """
     Tool for executing Python code safely.
@@ -173,7 +173,7 @@ class CodeExecutorTool(Tool):
         
         try:
             # Execute the code with restricted globals and timeout
-            with contextlib.redirect_stdout(stdout_capture), contextlib.redirect_stderr(stderr_capture):
+            with _OUTPUT_CAPTURE_LOCK, contextlib.redirect_stdout(stdout_capture), contextlib.redirect_stderr(stderr_capture):
                 # Add a result variable that can be set in the executed code
                 exec(code, restricted_globals, locals_dict)
             
@@ -9,11 +9,6 @@ from typing import Dict, Any, Optional
 
 from .base import Tool
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class FileParserTool(Tool):
@@ -28,7 +23,8 @@ class FileParserTool(Tool):
         """Initialize the file parser tool."""
         super().__init__(
             name="file_parser",
-            description="Parse and extract information from files"
+            description="Parse and extract information from files",
+            request_type="informational"
         )
     
     def run(self, file_path: str, format: Optional[str] = None, query: Optional[str] = None) -> Dict[str, Any]:
@@ -23,7 +23,8 @@ class FileParserTool(Tool):
         """Initialize the File Parser tool."""
         super().__init__(
             name="file_parser",
-            description="Parse and extract information from various file formats"
+            description="Parse and extract information from various file formats",
+            request_type="informational"
         )
         self.supported_formats = ["csv", "json", "txt", "md"]
     
@@ -14,11 +14,6 @@ from typing import Dict, Any, List, Optional, Type
 
 from .base import Tool
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class ToolRegistry:
@@ -9,11 +9,6 @@ from typing import Dict, Any, Optional, List
 
 from .base import Tool
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class WebSearchTool(Tool):
@@ -28,7 +23,8 @@ class WebSearchTool(Tool):
         """Initialize the web search tool."""
         super().__init__(
             name="web_search",
-            description="Search the web for information on a given query"
+            description="Search the web for information on a given query",
+            request_type="informational"
         )
     
     def run(self, query: str, num_results: int = 5, search_type: str = "general") -> Dict[str, Any]: